@@ -2,6 +2,9 @@
 
 import asyncio
 import json
+import sys
+import tempfile
+import traceback
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -9,15 +12,27 @@ from dotenv import load_dotenv
 from traceai.agents import TraceAI
 
 
-async def test_conversation_memory():
+class TestBuffer:
+    """Collects a test's output so concurrent tests don't interleave on stdout."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def p(self, *args):
+        """Buffer one line of output (drop-in for ``print``)."""
+        self.lines.append(" ".join(map(str, args)))
+
+
+async def test_conversation_memory(buf: TestBuffer, persist_dir: Path):
     """Test ConversationMemoryMiddleware with persistent storage."""
-    print("\n" + "=" * 80)
-    print("TEST 1: Conversation Memory Middleware")
-    print("=" * 80)
+    buf.p("\n" + "=" * 80)
+    buf.p("TEST 1: Conversation Memory Middleware")
+    buf.p("=" * 80)
     
     load_dotenv(Path.cwd() / ".env")
     
     agent = TraceAI(
+        persist_dir=persist_dir,
         model_provider="openai",
         enable_memory=True,  # ConversationMemoryMiddleware
         enable_audit=False,
@@ -29,7 +44,7 @@ async def test_conversation_memory():
     ssis_dir = Path(__file__).parent.parent / "inputs/ssis"
     await agent.load_documents(ssis_dir, pattern="*.dtsx")
     
-    print("\n📝 Sending multiple messages to test memory...")
+    buf.p("\n📝 Sending multiple messages to test memory...")
     
     # Send several messages
     questions = [
@@ -40,33 +55,34 @@ async def test_conversation_memory():
     ]
     
     for i, q in enumerate(questions, 1):
-        print(f"\n[{i}] Question: {q}")
+        buf.p(f"\n[{i}] Question: {q}")
         response = await agent.query(q)
-        print(f"    Response: {response[:100]}...")
+        buf.p(f"    Response: {response[:100]}...")
     
     # Search conversation history
-    print("\n🔍 Searching conversation history for 'CustomerETL'...")
+    buf.p("\n🔍 Searching conversation history for 'CustomerETL'...")
     if hasattr(agent, '_middlewares') and agent._middlewares:
         for mw in agent._middlewares:
             if hasattr(mw, 'search_history'):
                 results = mw.search_history("CustomerETL", limit=3)
-                print(f"   Found {len(results)} matching messages")
+                buf.p(f"   Found {len(results)} matching messages")
                 for r in results[:2]:
-                    print(f"   - {r.get('role')}: {r.get('content', '')[:50]}...")
+                    buf.p(f"   - {r.get('role')}: {r.get('content', '')[:50]}...")
                 break
     
-    print("\n✅ Conversation memory test complete!")
+    buf.p("\n✅ Conversation memory test complete!")
 
 
-async def test_long_term_memory():
+async def test_long_term_memory(buf: TestBuffer, persist_dir: Path):
     """Test LongTermMemoryMiddleware with vector storage."""
-    print("\n" + "=" * 80)
-    print("TEST 2: Long-Term Memory Middleware")
-    print("=" * 80)
+    buf.p("\n" + "=" * 80)
+    buf.p("TEST 2: Long-Term Memory Middleware")
+    buf.p("=" * 80)
     
     load_dotenv(Path.cwd() / ".env")
     
     agent = TraceAI(
+        persist_dir=persist_dir,
         model_provider="openai",
         enable_memory=False,
         enable_audit=False,
@@ -78,11 +94,11 @@ async def test_long_term_memory():
     
     ltm = LongTermMemoryMiddleware(
         backend="chroma",
-        persist_dir="./data/test_ltm",
+        persist_dir=persist_dir / "ltm",
         ephemeral=True  # In-memory for testing
     )
     
-    print("\n💾 Adding important facts to long-term memory...")
+    buf.p("\n💾 Adding important facts to long-term memory...")
     
     # Simulate adding facts
     facts = [
@@ -96,26 +112,27 @@ async def test_long_term_memory():
             texts=[fact],
             metadatas=[{"type": "important_fact"}]
         )
-        print(f"   ✓ Added: {fact[:60]}...")
+        buf.p(f"   ✓ Added: {fact[:60]}...")
     
-    print("\n🔎 Searching long-term memory...")
+    buf.p("\n🔎 Searching long-term memory...")
     results = ltm.search_memory("customer database", n_results=2)
-    print(f"   Found {len(results)} relevant memories:")
+    buf.p(f"   Found {len(results)} relevant memories:")
     for r in results:
-        print(f"   - {r.get('text', '')[:70]}...")
+        buf.p(f"   - {r.get('text', '')[:70]}...")
     
-    print("\n✅ Long-term memory test complete!")
+    buf.p("\n✅ Long-term memory test complete!")
 
 
-async def test_audit_middleware():
+async def test_audit_middleware(buf: TestBuffer, persist_dir: Path):
     """Test AuditMiddleware logging capabilities."""
-    print("\n" + "=" * 80)
-    print("TEST 3: Audit Middleware")
-    print("=" * 80)
+    buf.p("\n" + "=" * 80)
+    buf.p("TEST 3: Audit Middleware")
+    buf.p("=" * 80)
     
     load_dotenv(Path.cwd() / ".env")
     
     agent = TraceAI(
+        persist_dir=persist_dir,
         model_provider="openai",
         enable_memory=False,
         enable_audit=True,  # AuditMiddleware
@@ -126,32 +143,33 @@ async def test_audit_middleware():
     ssis_dir = Path(__file__).parent.parent / "inputs/ssis"
     await agent.load_documents(ssis_dir, pattern="*.dtsx")
     
-    print("\n🔍 Running query to trigger tool calls...")
-    print("   (Watch for [AUDIT] logs showing tool calls)")
+    buf.p("\n🔍 Running query to trigger tool calls...")
+    buf.p("   (Watch for [AUDIT] logs showing tool calls)")
     
     response = await agent.query("List all packages")
     
-    print("\n📊 Checking audit logs...")
+    buf.p("\n📊 Checking audit logs...")
     if hasattr(agent, '_middlewares') and agent._middlewares:
         for mw in agent._middlewares:
             if hasattr(mw, 'tool_calls'):
-                print(f"   Total model calls: {mw.model_calls}")
-                print(f"   Total tool calls: {len(mw.tool_calls)}")
-                print(f"   Tools used: {list(set(mw.tool_calls))}")
+                buf.p(f"   Total model calls: {mw.model_calls}")
+                buf.p(f"   Total tool calls: {len(mw.tool_calls)}")
+                buf.p(f"   Tools used: {list(set(mw.tool_calls))}")
                 break
     
-    print("\n✅ Audit middleware test complete!")
+    buf.p("\n✅ Audit middleware test complete!")
 
 
-async def test_progress_tracking():
+async def test_progress_tracking(buf: TestBuffer, persist_dir: Path):
     """Test ProgressTrackingMiddleware."""
-    print("\n" + "=" * 80)
-    print("TEST 4: Progress Tracking Middleware")
-    print("=" * 80)
+    buf.p("\n" + "=" * 80)
+    buf.p("TEST 4: Progress Tracking Middleware")
+    buf.p("=" * 80)
     
     load_dotenv(Path.cwd() / ".env")
     
     agent = TraceAI(
+        persist_dir=persist_dir,
         model_provider="openai",
         enable_memory=False,
         enable_audit=False,
@@ -162,34 +180,35 @@ async def test_progress_tracking():
     ssis_dir = Path(__file__).parent.parent / "inputs/ssis"
     await agent.load_documents(ssis_dir, pattern="*.dtsx")
     
-    print("\n📈 Running query to track progress...")
-    print("   (Watch for [PROGRESS] logs)")
+    buf.p("\n📈 Running query to track progress...")
+    buf.p("   (Watch for [PROGRESS] logs)")
     
     response = await agent.query("Describe the CustomerETL package structure")
     
-    print("\n📊 Checking progress metadata...")
+    buf.p("\n📊 Checking progress metadata...")
     if hasattr(agent, '_middlewares') and agent._middlewares:
         for mw in agent._middlewares:
             if hasattr(mw, 'current_step'):
-                print(f"   Current step: {mw.current_step}")
-                print(f"   Total steps: {mw.total_steps}")
+                buf.p(f"   Current step: {mw.current_step}")
+                buf.p(f"   Total steps: {mw.total_steps}")
                 if mw.total_steps > 0:
                     pct = (mw.current_step / mw.total_steps) * 100
-                    print(f"   Progress: {pct:.0f}%")
+                    buf.p(f"   Progress: {pct:.0f}%")
                 break
     
-    print("\n✅ Progress tracking test complete!")
+    buf.p("\n✅ Progress tracking test complete!")
 
 
-async def test_all_middlewares():
+async def test_all_middlewares(buf: TestBuffer, persist_dir: Path):
     """Test all middlewares working together."""
-    print("\n" + "=" * 80)
-    print("TEST 5: All Middlewares Combined")
-    print("=" * 80)
+    buf.p("\n" + "=" * 80)
+    buf.p("TEST 5: All Middlewares Combined")
+    buf.p("=" * 80)
     
     load_dotenv(Path.cwd() / ".env")
     
     agent = TraceAI(
+        persist_dir=persist_dir,
         model_provider="openai",
         enable_memory=True,      # Conversation memory
         enable_audit=True,        # Audit logging
@@ -201,7 +220,7 @@ async def test_all_middlewares():
     cobol_dir = Path(__file__).parent.parent / "inputs/cobol"
     await agent.load_documents(cobol_dir, pattern="*.cbl")
     
-    print("\n🚀 Running comprehensive test with all middlewares active...")
+    buf.p("\n🚀 Running comprehensive test with all middlewares active...")
     
     questions = [
         "How many COBOL programs are loaded?",
@@ -209,32 +228,32 @@ async def test_all_middlewares():
     ]
     
     for i, q in enumerate(questions, 1):
-        print(f"\n[Query {i}] {q}")
+        buf.p(f"\n[Query {i}] {q}")
         response = await agent.query(q)
-        print(f"Response: {response[:150]}...")
+        buf.p(f"Response: {response[:150]}...")
     
-    print("\n📊 Final Middleware Summary:")
-    print("-" * 80)
+    buf.p("\n📊 Final Middleware Summary:")
+    buf.p("-" * 80)
     
     if hasattr(agent, '_middlewares') and agent._middlewares:
         for mw in agent._middlewares:
             mw_name = mw.__class__.__name__
-            print(f"\n{mw_name}:")
+            buf.p(f"\n{mw_name}:")
             
             if hasattr(mw, 'total_messages_processed'):
-                print(f"  - Messages processed: {mw.total_messages_processed}")
+                buf.p(f"  - Messages processed: {mw.total_messages_processed}")
             
             if hasattr(mw, 'tool_calls'):
-                print(f"  - Tool calls: {len(mw.tool_calls)}")
-                print(f"  - Model calls: {mw.model_calls}")
+                buf.p(f"  - Tool calls: {len(mw.tool_calls)}")
+                buf.p(f"  - Model calls: {mw.model_calls}")
             
             if hasattr(mw, 'current_step'):
-                print(f"  - Steps completed: {mw.current_step}/{mw.total_steps}")
+                buf.p(f"  - Steps completed: {mw.current_step}/{mw.total_steps}")
             
             if hasattr(mw, 'facts_added'):
-                print(f"  - Facts stored: {mw.facts_added}")
+                buf.p(f"  - Facts stored: {mw.facts_added}")
     
-    print("\n✅ All middlewares test complete!")
+    buf.p("\n✅ All middlewares test complete!")
 
 
 async def main():
@@ -250,14 +269,25 @@ async def main():
         ("Progress Tracking", test_progress_tracking),
         ("All Combined", test_all_middlewares),
     ]
+    buffers = [TestBuffer() for _ in tests]
+
+    # Run concurrently; each test writes only to its own buffer and its own
+    # persist_dir, so no two tests share a vector store or SQLite cache
+    with tempfile.TemporaryDirectory(prefix="traceai_middleware_demo_") as tmp:
+        results = await asyncio.gather(
+            *(
+                test_func(buf, Path(tmp) / f"test_{i}")
+                for i, ((_, test_func), buf) in enumerate(zip(tests, buffers, strict=True), 1)
+            ),
+            return_exceptions=True,
+        )
     
-    for name, test_func in tests:
-        try:
-            await test_func()
-        except Exception as e:
-            print(f"\n❌ Test '{name}' failed: {e}")
-            import traceback
-            traceback.print_exc()
+    # Emit buffered output in original test order
+    for (name, _), buf, result in zip(tests, buffers, results, strict=True):
+        if isinstance(result, BaseException):
+            buf.p(f"\n❌ Test '{name}' failed: {result}")
+            buf.p("".join(traceback.format_exception(result)).rstrip())
+        sys.stdout.write("\n".join(buf.lines) + "\n")
     
     print("\n" + "=" * 80)
     print("🎉 All Middleware Tests Complete!")
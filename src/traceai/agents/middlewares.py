@@ -1,5 +1,6 @@
 """Custom middleware for TraceAI agent capabilities with persistent storage."""
 
+import json
 from pathlib import Path
 from typing import Any
 
@@ -68,16 +69,18 @@ class ConversationMemoryMiddleware(AgentMiddleware):
         messages = state.get("messages", [])
         self.total_messages_processed = len(messages)
 
-        # Persist only NEW messages to storage
+        # Persist only NEW messages to storage, in one batch
+        new_messages = []
         for msg in messages:
             msg_id = id(msg)  # Use Python object ID to track uniqueness
             if msg_id not in self._seen_ids:
                 if hasattr(msg, "type") and hasattr(msg, "content"):
                     role = msg.type  # 'human', 'ai', 'system', 'tool'
                     content = msg.content if msg.content else ""
-                    metadata = {"message_type": msg.type}
-                    self.storage.add_message(role=role, content=content, metadata=metadata)
+                    new_messages.append((role, content, {"message_type": msg.type}))
                     self._seen_ids.add(msg_id)
+        if new_messages:
+            self.storage.add_messages(new_messages)
 
         # If within limits, no action needed
         if len(messages) <= self.max_messages:
@@ -292,6 +295,7 @@ class AuditMiddleware(AgentMiddleware):
         """
         self.log_level = log_level
         self.tool_calls = []
+        self._tools_used: dict[str, None] = {}  # Distinct tool names, in first-use order
         self.model_calls = 0
 
     def before_model(self, state: dict) -> dict | None:
@@ -335,16 +339,18 @@ class AuditMiddleware(AgentMiddleware):
                     tool_name = tc.get("name", "unknown")
                     tool_args = tc.get("args", {})
                     self.tool_calls.append(tool_name)
+                    self._tools_used[tool_name] = None
                     
                     # Log tool name and arguments
                     if tool_args:
-                        # Format arguments for logging
-                        args_str = ", ".join([f"{k}={v}" for k, v in tool_args.items()])
+                        # Format each argument once; values can be large (SQL, todo lists)
+                        formatted_args = [(k, str(v)) for k, v in tool_args.items()]
+                        args_str = ", ".join(f"{k}={v}" for k, v in formatted_args)
                         logger.info(f"[AUDIT] Tool call: {tool_name}({args_str})")
                         
                         # Also log in a more readable format
                         logger.info(f"🔧 TOOL: {tool_name}")
-                        for arg_key, arg_value in tool_args.items():
+                        for arg_key, arg_value in formatted_args:
                             logger.info(f"   📝 {arg_key}: {arg_value}")
                     else:
                         logger.info(f"[AUDIT] Tool call: {tool_name}")
@@ -354,11 +360,20 @@ class AuditMiddleware(AgentMiddleware):
             "audit_metadata": {
                 "total_model_calls": self.model_calls,
                 "total_tool_calls": len(self.tool_calls),
-                "tools_used": list(set(self.tool_calls)),
+                "tools_used": list(self._tools_used),
             }
         }
 
 
+# Todo statuses that count as finished ('done' is accepted alongside 'completed')
+_DONE_STATUSES = frozenset({"completed", "done"})
+
+
+def _todo_title(todo: dict) -> str:
+    """Get a todo's title from either 'title' or 'content' (DeepAgents uses 'content')."""
+    return todo.get("title") or todo.get("content") or "Untitled"
+
+
 class ProgressTrackingMiddleware(AgentMiddleware):
     """
     Middleware to track and display progress during multi-step operations.
@@ -416,8 +431,6 @@ class ProgressTrackingMiddleware(AgentMiddleware):
                 }
             }
 
-        import json
-
         try:
             todos_content = files["todos.json"]
             todos = json.loads(todos_content) if isinstance(todos_content, str) else todos_content
@@ -426,21 +439,23 @@ class ProgressTrackingMiddleware(AgentMiddleware):
                 return None
 
             total = len(todos)
-            # Support both 'completed' and 'done' status
-            completed = sum(1 for todo in todos if todo.get("status") in ["completed", "done"])
-            in_progress_todos = [todo for todo in todos if todo.get("status") == "in-progress"]
-            
-            # Get title from either 'title' or 'content' field (DeepAgents uses 'content')
-            def get_todo_title(todo: dict) -> str:
-                return todo.get('title') or todo.get('content') or 'Untitled'
+            # Single pass: count finished steps and find the first in-progress one
+            completed = 0
+            current = None
+            for todo in todos:
+                status = todo.get("status")
+                if status in _DONE_STATUSES:
+                    completed += 1
+                elif current is None and status == "in-progress":
+                    current = todo
             
             # Announce plan creation (once)
             if not self._plan_announced and total > 0 and self.show_progress:
                 logger.info(f"[PROGRESS] 📋 Plan created with {total} steps")
                 for i, todo in enumerate(todos, 1):
                     status = todo.get("status", "not-started")
-                    status_emoji = "✅" if status in ["completed", "done"] else "⏳" if status == "in-progress" else "⭕"
-                    logger.info(f"[PROGRESS]   {i}. {status_emoji} {get_todo_title(todo)}")
+                    status_emoji = "✅" if status in _DONE_STATUSES else "⏳" if status == "in-progress" else "⭕"
+                    logger.info(f"[PROGRESS]   {i}. {status_emoji} {_todo_title(todo)}")
                 self._plan_announced = True
 
             # Show progress updates when status changes
@@ -451,9 +466,8 @@ class ProgressTrackingMiddleware(AgentMiddleware):
                     logger.info(f"[PROGRESS] ✅ {completed}/{total} steps complete ({progress_pct:.0f}%)")
                 
                 # Show current step
-                if in_progress_todos:
-                    current = in_progress_todos[0]
-                    logger.info(f"[PROGRESS] 🔄 Current: {get_todo_title(current)}")
+                if current is not None:
+                    logger.info(f"[PROGRESS] 🔄 Current: {_todo_title(current)}")
                 elif completed == total and total > 0:
                     logger.info(f"[PROGRESS] 🎉 All steps completed!")
 
@@ -466,7 +480,7 @@ class ProgressTrackingMiddleware(AgentMiddleware):
                     "completed": completed,
                     "total": total,
                     "progress_percentage": (completed / total * 100) if total > 0 else 0,
-                    "in_progress": get_todo_title(in_progress_todos[0]) if in_progress_todos else None,
+                    "in_progress": _todo_title(current) if current is not None else None,
                     "all_completed": completed == total and total > 0,
                 }
             }
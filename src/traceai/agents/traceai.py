@@ -9,15 +9,19 @@ This module provides the main TraceAI agent with:
 """
 
 import asyncio
+import dataclasses
+import functools
+import hashlib
+import importlib.util
 import os
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, AsyncIterator
 
 import networkx as nx
-from deepagents import create_deep_agent
 from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
 
 # Load environment variables
 load_dotenv()
@@ -25,27 +29,206 @@ load_dotenv()
 # Fix HuggingFace tokenizer parallelism warning
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
-# Import existing modular components
-from traceai.graph.builder import build_graph_from_documents
+# Import existing modular components. LLM providers, deepagents, tools and
+# middleware are imported where used so graph-only mode skips their import cost.
+from traceai.graph.builder import KnowledgeGraphBuilder, build_graph_from_documents
 from traceai.graph.queries import GraphQueries
 from traceai.graph.schema import EdgeType, NodeType
 from traceai.logger import logger
+from traceai.memory.query_cache import QueryCache
+from traceai.memory.response_cache import ResponseCache
+from traceai.memory.source_store import SourceStore
 from traceai.parsers import parser_registry
-from traceai.parsers.async_base import parse_files_concurrently
-from traceai.tools import create_graph_tools, create_graph_visualization_tool
-from traceai.agents.middlewares import (
-    ConversationMemoryMiddleware,
-    AuditMiddleware,
-    ProgressTrackingMiddleware,
-)
-
-# LangChain vector store and embeddings
-try:
-    from langchain_chroma import Chroma
-    from langchain_huggingface import HuggingFaceEmbeddings
-except ImportError:
-    from langchain_community.vectorstores import Chroma
-    from langchain_community.embeddings import HuggingFaceEmbeddings
+from traceai.parsers.async_base import iter_parsed_files
+from traceai.parsers.parse_cache import ParseCache
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Texts embedded per vector store insert while streaming documents in
+INGEST_BATCH_SIZE = 512
+
+# Source characters indexed per component (~350 tokens; MiniLM truncates at 256
+# anyway). The full source is kept in the SourceStore.
+VECTOR_TEXT_SOURCE_CHARS = 1500
+
+
+@functools.lru_cache(maxsize=1)
+def _default_embedding_device() -> str:
+    """Pick the fastest available device for embeddings: CUDA, then Apple MPS, then CPU.
+
+    torch is only imported when installed; without it the CPU (fastembed) path is used.
+    """
+    if importlib.util.find_spec("torch") is None:
+        return "cpu"
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@functools.lru_cache(maxsize=4)
+def _get_embeddings(model_name: str, device: str, batch_size: int | None = None) -> Any:
+    """Load an embedding model once per process and share it across agents.
+
+    On CPU the ONNX Runtime backend (fastembed) is used when installed; it yields
+    the same vectors as sentence-transformers at several times the throughput.
+
+    Args:
+        model_name: Embedding model name
+        device: "cpu", "cuda" or "mps"
+        batch_size: Texts per forward pass (default: the backend's own default)
+    """
+    if device == "cpu":
+        try:
+            from traceai.memory.embeddings import FastEmbedEmbeddings
+
+            if batch_size:
+                return FastEmbedEmbeddings(model_name=model_name, batch_size=batch_size)
+            return FastEmbedEmbeddings(model_name=model_name)
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning(f"fastembed unavailable for {model_name}, using PyTorch: {e}")
+
+    try:
+        from langchain_huggingface import HuggingFaceEmbeddings
+    except ImportError:
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device},
+        encode_kwargs={"batch_size": batch_size or 64, "normalize_embeddings": True},
+    )
+
+
+# Open Chroma stores by (persist dir, collection, embeddings); reopening one
+# reloads sqlite and the HNSW index from disk
+_VECTOR_STORES: dict[tuple[str, str, int], Any] = {}
+# One write lock per on-disk collection, shared by every agent indexing into it
+_VECTOR_STORE_WRITE_LOCKS: dict[tuple[str, str], threading.Lock] = {}
+_VECTOR_STORES_LOCK = threading.Lock()
+
+# HNSW settings for new document collections, matching ChromaVectorStore's
+# defaults. Embeddings are normalized, so cosine ranks like the default l2;
+# the larger candidate lists trade a little insert/query time for recall.
+# Existing collections keep the parameters they were built with.
+VECTOR_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
+
+def _get_vector_store(
+    persist_directory: Path, collection_name: str, embeddings: Any
+) -> tuple[Any, threading.Lock]:
+    """Return the process-wide Chroma store for a directory, opening it on first use.
+
+    Returns:
+        Tuple of (store, write lock shared by all stores on the same collection)
+    """
+    # The store keeps a reference to embeddings, so its id() stays unique while cached
+    collection_key = (os.fspath(persist_directory.resolve()), collection_name)
+    key = (*collection_key, id(embeddings))
+    with _VECTOR_STORES_LOCK:
+        write_lock = _VECTOR_STORE_WRITE_LOCKS.setdefault(collection_key, threading.Lock())
+        store = _VECTOR_STORES.get(key)
+        if store is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            try:
+                from langchain_chroma import Chroma
+            except ImportError:
+                from langchain_community.vectorstores import Chroma
+
+            client = chromadb.PersistentClient(
+                path=str(persist_directory), settings=Settings(anonymized_telemetry=False)
+            )
+            store = Chroma(
+                client=client,
+                embedding_function=embeddings,
+                collection_name=collection_name,
+                collection_metadata=VECTOR_COLLECTION_METADATA,
+            )
+            _VECTOR_STORES[key] = store
+        return store, write_lock
+
+
+# Matches recursive extension globs such as "**/*.dtsx"
+_RECURSIVE_SUFFIX_GLOB = re.compile(r"^\*\*/\*(\.[^*?\[\]/.]+)$")
+
+
+def _collect_files(directory: Path, patterns: list[str]) -> list[Path]:
+    """Collect files matching any of the glob patterns, deduplicated and sorted.
+
+    Paths are deduplicated on their string form, which is cheaper to hash than
+    Path objects, and sorted so load order is reproducible.
+    """
+    suffix_matches = [_RECURSIVE_SUFFIX_GLOB.match(pat) for pat in patterns]
+    if len(patterns) > 1 and all(suffix_matches):
+        # One directory walk filtered by suffix instead of one walk per pattern
+        suffixes = {match.group(1) for match in suffix_matches}
+        unique = {os.fspath(path) for path in directory.rglob("*") if path.suffix in suffixes}
+    else:
+        unique = {os.fspath(path) for pat in patterns for path in directory.glob(pat)}
+    return [Path(p) for p in sorted(unique)]
+
+
+def _message_content(msg: Any) -> Any:
+    """Get the content of a LangChain message object or a plain message dict."""
+    content = getattr(msg, "content", None)
+    if content is None and isinstance(msg, dict):
+        content = msg.get("content")
+    return content
+
+
+def _last_content(messages: Any) -> Any:
+    """Return the content of the latest message that has any, or None."""
+    for msg in reversed(messages):
+        content = _message_content(msg)
+        if content:
+            return content
+    return None
+
+
+def _text_content(content: Any) -> str:
+    """Get the text of message content that is a string or a list of content blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in content
+            if isinstance(block, str) or block.get("type") == "text"
+        )
+    return ""
+
+
+def _anthropic_prompt_caching_middleware() -> Any | None:
+    """Build Anthropic prompt-caching middleware, or None if not needed/available."""
+    try:
+        import deepagents.graph
+    except ImportError:
+        return None
+    if hasattr(deepagents.graph, "AnthropicPromptCachingMiddleware"):
+        # deepagents already caches the prompt prefix by default
+        return None
+
+    try:
+        from langchain.agents.middleware import AnthropicPromptCachingMiddleware
+    except ImportError:
+        try:
+            from langchain_anthropic.middleware import AnthropicPromptCachingMiddleware
+        except ImportError:
+            return None
+
+    return AnthropicPromptCachingMiddleware(ttl="5m", unsupported_model_behavior="ignore")
 
 
 class TraceAI:
@@ -74,7 +257,16 @@ class TraceAI:
         enable_subagents: bool = False,
         max_conversation_messages: int = 30,
         max_concurrent_parsers: int = 10,
+        process_pool_threshold: int | None = 64,
         recursion_limit: int = 35,
+        tool_concurrency_limit: int | None = None,
+        enable_response_cache: bool = True,
+        response_cache_ttl: float = 3600.0,
+        keep_full_docs: bool = False,
+        enable_parse_cache: bool = True,
+        embedding_device: str | None = None,
+        embedding_batch_size: int | None = None,
+        parser_executor: Executor | None = None,
     ):
         """
     Initialize the async TraceAI agent.
@@ -89,7 +281,22 @@ class TraceAI:
             enable_filesystem: Enable DeepAgents filesystem tools (ls, read_file, write_file, edit_file)
             max_conversation_messages: Max messages to keep in memory
             max_concurrent_parsers: Max concurrent file parsing operations
+            process_pool_threshold: Parse in worker processes when loading at least this
+                many files (None always parses in threads)
             recursion_limit: Maximum LangGraph recursion depth (default 35 to prevent infinite loops)
+            tool_concurrency_limit: Max tool calls run in parallel per agent step (defaults to
+                the TOOL_CONCURRENCY_LIMIT env var; unbounded if neither is set)
+            enable_response_cache: Reuse answers for repeated or near-identical questions
+            response_cache_ttl: Seconds before a cached answer expires
+            keep_full_docs: Keep component source code on parsed_documents after indexing
+                (the graph and source_store keep their own copies)
+            enable_parse_cache: Reuse parses of unchanged files (keyed by path, mtime, size)
+            embedding_device: Device for the default embedding model: "cpu", "cuda" or "mps"
+                (defaults to the TRACEAI_EMBEDDING_DEVICE env var, else the fastest available)
+            embedding_batch_size: Texts per embedding forward pass for the default model
+            parser_executor: Executor for every load's parsing, e.g. a ProcessPoolExecutor
+                kept alive across loads so workers start once; the caller shuts it down
+                (overrides process_pool_threshold)
         """
         self.persist_dir = Path(persist_dir)
         self.persist_dir.mkdir(parents=True, exist_ok=True)
@@ -102,22 +309,51 @@ class TraceAI:
         self.enable_subagents = enable_subagents
         self.max_conversation_messages = max_conversation_messages
         self.max_concurrent_parsers = max_concurrent_parsers
+        self.process_pool_threshold = process_pool_threshold
+        self.parser_executor = parser_executor
         self.recursion_limit = recursion_limit
+        if tool_concurrency_limit is None and os.getenv("TOOL_CONCURRENCY_LIMIT"):
+            tool_concurrency_limit = int(os.environ["TOOL_CONCURRENCY_LIMIT"])
+        self.tool_concurrency_limit = tool_concurrency_limit
+        self.keep_full_docs = keep_full_docs
 
         # Initialize components (using existing modular architecture)
         self.graph: nx.DiGraph | None = None
         self.parsed_documents: list[Any] = []
+        self._graph_builder = KnowledgeGraphBuilder()
+        self._graph_lock = threading.Lock()
+        self._graph_stats_cache: dict[str, Any] | None = None
+        # content_hash of every indexed document, fingerprinting what answers are based on
+        self._indexed_content: dict[str, str] = {}
+        self._response_cache_scope_cache: str | None = None
+        # Formatted semantic_search results; cleared whenever documents are indexed
+        self._search_cache = QueryCache(max_entries=512)
+        self.parse_cache = (
+            ParseCache(self.persist_dir / "parse_cache.db") if enable_parse_cache else None
+        )
         
         # Initialize embeddings and vector store
-        self.embeddings = embeddings or HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={"device": "cpu"},
-        )
-        self.vector_store = Chroma(
-            persist_directory=str(self.persist_dir / "chroma"),
-            embedding_function=self.embeddings,
-            collection_name="traceai_documents",
+        if embeddings is None:
+            device = (
+                embedding_device
+                or os.getenv("TRACEAI_EMBEDDING_DEVICE")
+                or _default_embedding_device()
+            )
+            embeddings = _get_embeddings(DEFAULT_EMBEDDING_MODEL, device, embedding_batch_size)
+        self.embeddings = embeddings
+        self.vector_store, self._index_lock = _get_vector_store(
+            self.persist_dir / "chroma", "traceai_documents", self.embeddings
         )
+        self.source_store = SourceStore(self.persist_dir / "sources.sqlite")
+
+        # Exact + semantic cache of agent answers
+        self.response_cache: ResponseCache | None = None
+        if enable_response_cache:
+            self.response_cache = ResponseCache(
+                path=self.persist_dir / "response_cache.db",
+                embed_fn=self.embeddings.embed_query,
+                ttl_seconds=response_cache_ttl,
+            )
 
         # Initialize LLM
         self.model_provider = model_provider
@@ -139,6 +375,8 @@ class TraceAI:
                 api_key = os.getenv("ANTHROPIC_API_KEY")
                 default_model = normalized_name or "claude-3-5-sonnet-20241022"
                 if api_key:
+                    from langchain_anthropic import ChatAnthropic
+
                     self.llm = ChatAnthropic(model=default_model, temperature=0, anthropic_api_key=api_key)
                 self.model_name = default_model
                 self.model_provider = provider
@@ -146,6 +384,8 @@ class TraceAI:
                 api_key = os.getenv("OPENAI_API_KEY")
                 default_model = normalized_name or "gpt-4o-mini"
                 if api_key:
+                    from langchain_openai import ChatOpenAI
+
                     self.llm = ChatOpenAI(model=default_model, temperature=0, openai_api_key=api_key)
                 self.model_name = default_model
                 self.model_provider = provider
@@ -185,10 +425,7 @@ class TraceAI:
         patterns = [pattern] if isinstance(pattern, str) else pattern
         
         # Collect all files
-        files = []
-        for pat in patterns:
-            files.extend(directory.glob(pat))
-        files = list(set(files))
+        files = _collect_files(directory, patterns)
         
         if not files:
             logger.warning(f"No files found matching patterns {patterns} in {directory}")
@@ -196,115 +433,299 @@ class TraceAI:
         
         logger.info(f"Loading {len(files)} documents from {directory}")
         
-        # Parse files concurrently using existing parsers module
-        parsed_docs = await parse_files_concurrently(
-            files,
-            parser_registry,
-            max_concurrent=self.max_concurrent_parsers
+        # Parse files concurrently using existing parsers module. Parsing is
+        # CPU-bound, so large corpora fan out across processes instead of threads.
+        use_processes = (
+            self.parser_executor is None
+            and self.process_pool_threshold is not None
+            and len(files) >= self.process_pool_threshold
         )
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(files))) as executor:
+                parsed_count = await self._ingest_documents(
+                    iter_parsed_files(
+                        files,
+                        parser_registry,
+                        max_concurrent=self.max_concurrent_parsers,
+                        executor=executor,
+                        parse_cache=self.parse_cache,
+                    )
+                )
+        else:
+            parsed_count = await self._ingest_documents(
+                iter_parsed_files(
+                    files,
+                    parser_registry,
+                    max_concurrent=self.max_concurrent_parsers,
+                    executor=self.parser_executor,
+                    parse_cache=self.parse_cache,
+                )
+            )
         
-        if not parsed_docs:
+        if not parsed_count:
             logger.warning("No documents parsed successfully")
             return
         
-        self.parsed_documents.extend(parsed_docs)
-        logger.info(f"Parsed {len(parsed_docs)} documents")
-        
-        # Build knowledge graph using existing graph.builder module
-        loop = asyncio.get_event_loop()
-        self.graph = await loop.run_in_executor(
-            None,
-            build_graph_from_documents,
-            self.parsed_documents
-        )
         logger.info(
-            f"Built knowledge graph: {self.graph.number_of_nodes()} nodes, "
-            f"{self.graph.number_of_edges()} edges"
+            f"Parsed {parsed_count} documents; knowledge graph has "
+            f"{self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges"
         )
         
-        # Index documents in vector store
-        await self._add_documents_to_vectorstore_async(parsed_docs)
-        
         # Create agent with tools (only if LLM available)
         if self.llm:
             await self._create_agent_async()
         else:
             logger.info("Skipping agent creation (no LLM available).")
     
-    async def _add_documents_to_vectorstore_async(self, parsed_docs: list[Any]) -> None:
-        """Add parsed documents to vector store concurrently."""
-        tasks = [self._add_parsed_document_to_vectorstore(doc) for doc in parsed_docs]
-        await asyncio.gather(*tasks)
-    
-    async def _add_parsed_document_to_vectorstore(self, parsed_doc) -> None:
-        """Add a single parsed document to vector store."""
-        texts = []
-        metadatas = []
-        
-        # Add document metadata
-        doc_text = f"{parsed_doc.metadata.name}: {parsed_doc.metadata.description or 'No description'}"
-        texts.append(doc_text)
-        metadatas.append({
-            "type": "document",
-            "doc_id": parsed_doc.metadata.document_id,
-            "name": parsed_doc.metadata.name,
-            "doc_type": str(parsed_doc.metadata.document_type),
-        })
-        
-        # Add components
-        for component in parsed_doc.components:
-            if component.source_code:
-                comp_text = f"{component.name}: {component.description or ''}\n{component.source_code}"
-                texts.append(comp_text)
-                metadatas.append({
-                    "type": "component",
-                    "doc_id": parsed_doc.metadata.document_id,
-                    "component_id": component.component_id,
-                    "name": component.name,
-                    "component_type": component.component_type,
-                })
-        
-        # Add to vector store
+    async def _ingest_documents(self, documents: AsyncIterator[Any]) -> int:
+        """
+        Stream parsed documents into the knowledge graph and vector store.
+
+        Documents are flushed in batches of about INGEST_BATCH_SIZE texts, so
+        only one batch of parsed source code is held in memory at a time.
+
+        Args:
+            documents: Parsed documents, e.g. from iter_parsed_files()
+
+        Returns:
+            Number of documents ingested
+        """
+        batch_docs: list[Any] = []
+        batch_texts: list[str] = []
+        batch_metadatas: list[dict[str, Any]] = []
+        count = 0
+        indexed_items = 0
+        unchanged_docs = 0
+
+        async for doc in documents:
+            doc_texts, doc_metadatas = self._collect_vectorstore_texts(doc)
+            batch_docs.append(doc)
+            batch_texts.extend(doc_texts)
+            batch_metadatas.extend(doc_metadatas)
+            count += 1
+            if len(batch_texts) >= INGEST_BATCH_SIZE:
+                items, unchanged = await self._flush_ingest_batch(batch_docs, batch_texts, batch_metadatas)
+                indexed_items += items
+                unchanged_docs += unchanged
+                batch_docs, batch_texts, batch_metadatas = [], [], []
+
+        if batch_docs:
+            items, unchanged = await self._flush_ingest_batch(batch_docs, batch_texts, batch_metadatas)
+            indexed_items += items
+            unchanged_docs += unchanged
+
+        logger.info(
+            f"Indexed {indexed_items} items from {count - unchanged_docs} documents "
+            f"({unchanged_docs} unchanged documents skipped)"
+        )
+        return count
+
+    async def _flush_ingest_batch(
+        self,
+        docs: list[Any],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> tuple[int, int]:
+        """Add a batch of documents to the graph and index their texts.
+
+        Returns:
+            Tuple of (items indexed, unchanged documents skipped)
+        """
+        self.graph = await asyncio.to_thread(self._add_to_graph, docs)
+        self._graph_stats_cache = None
+        self._indexed_content.update(
+            (m["doc_id"], m["content_hash"]) for m in metadatas if m["type"] == "document"
+        )
+        self._response_cache_scope_cache = None
+
+        indexed = (0, 0)
         if texts:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self.vector_store.add_texts,
-                texts,
-                metadatas
+            indexed = await asyncio.to_thread(self._index_texts, texts, metadatas)
+            self._search_cache.invalidate()
+
+        sources = [
+            (doc.metadata.document_id, c.component_id, c.source_code)
+            for doc in docs
+            for c in doc.components
+            if c.source_code
+        ]
+        if sources:
+            await asyncio.to_thread(self.source_store.put_many, sources)
+
+        if not self.keep_full_docs:
+            # The graph and source_store keep their own copies of the source
+            for doc in docs:
+                doc.components = [
+                    dataclasses.replace(c, source_code=None) if c.source_code else c
+                    for c in doc.components
+                ]
+        self.parsed_documents.extend(docs)
+        return indexed
+
+    def _index_texts(self, texts: list[str], metadatas: list[dict[str, Any]]) -> tuple[int, int]:
+        """Add texts to the vector store, skipping documents already indexed unchanged.
+
+        Returns:
+            Tuple of (items indexed, unchanged documents skipped)
+        """
+        expected: dict[str, tuple[int, str]] = {}
+        for metadata in metadatas:
+            count, _ = expected.get(metadata["doc_id"], (0, ""))
+            expected[metadata["doc_id"]] = (count + 1, metadata["content_hash"])
+
+        # Concurrent loads, from this or another agent on the same persist_dir,
+        # would otherwise interleave their lookup, delete and add calls
+        with self._index_lock:
+            # The store persists across runs; look up what each document already has
+            existing = self.vector_store.get(
+                where={"doc_id": {"$in": list(expected)}}, include=["metadatas"]
             )
-            logger.info(f"Indexed {len(texts)} items from '{parsed_doc.metadata.name}'")
+            stored: dict[str, list[tuple[str, str | None]]] = {}
+            for item_id, metadata in zip(existing["ids"], existing["metadatas"], strict=True):
+                metadata = metadata or {}
+                stored.setdefault(metadata.get("doc_id"), []).append(
+                    (item_id, metadata.get("content_hash"))
+                )
+
+            unchanged = {
+                doc_id
+                for doc_id, (count, content_hash) in expected.items()
+                if len(stored.get(doc_id, ())) == count
+                and all(h == content_hash for _, h in stored[doc_id])
+            }
+            stale_ids = [
+                item_id
+                for doc_id, items in stored.items()
+                if doc_id not in unchanged
+                for item_id, _ in items
+            ]
+            if stale_ids:
+                self.vector_store.delete(ids=stale_ids)
+
+            new_texts = [
+                t for t, m in zip(texts, metadatas, strict=True) if m["doc_id"] not in unchanged
+            ]
+            new_metadatas = [m for m in metadatas if m["doc_id"] not in unchanged]
+            # Ids are stable per document entry, so adding a document twice
+            # overwrites its entries instead of duplicating them
+            positions: dict[str, int] = {}
+            new_ids = []
+            for metadata in new_metadatas:
+                position = positions.get(metadata["doc_id"], 0)
+                positions[metadata["doc_id"]] = position + 1
+                new_ids.append(f"{metadata['doc_id']}:{position}")
+            if new_texts:
+                # One add_texts call embeds the whole batch instead of one small
+                # forward pass per document
+                self.vector_store.add_texts(new_texts, new_metadatas, ids=new_ids)
+        logger.debug(
+            f"Indexed batch of {len(new_texts)} items from {len(expected) - len(unchanged)} documents "
+            f"({len(unchanged)} unchanged documents skipped)"
+        )
+        return len(new_texts), len(unchanged)
+
+    def _add_to_graph(self, docs: list[Any]) -> nx.DiGraph:
+        """Add documents to the shared graph builder (serialized across loads)."""
+        with self._graph_lock:
+            return build_graph_from_documents(docs, builder=self._graph_builder)
+
+    def _collect_vectorstore_texts(self, parsed_doc) -> tuple[list[str], list[dict[str, Any]]]:
+        """Build the texts and metadatas to index for a single parsed document."""
+        doc_meta = parsed_doc.metadata
+        doc_id = doc_meta.document_id
+        indexed_components = [c for c in parsed_doc.components if c.source_code]
+
+        # Document entry followed by one entry per component with source code.
+        # Only the start of the source is indexed; the rest is in source_store.
+        texts = [f"{doc_meta.name}: {doc_meta.description or 'No description'}"] + [
+            f"{c.name}: {c.description or ''}\n{c.source_code[:VECTOR_TEXT_SOURCE_CHARS]}"
+            for c in indexed_components
+        ]
+        # Identifies unchanged documents on reload so they are not re-embedded
+        content_hash = hashlib.md5("\x00".join(texts).encode(), usedforsecurity=False).hexdigest()
+        metadatas = [
+            {
+                "type": "document",
+                "doc_id": doc_id,
+                "name": doc_meta.name,
+                "doc_type": str(doc_meta.document_type),
+                "content_hash": content_hash,
+            }
+        ] + [
+            {
+                "type": "component",
+                "doc_id": doc_id,
+                "component_id": c.component_id,
+                "name": c.name,
+                "component_type": c.component_type,
+                "content_hash": content_hash,
+            }
+            for c in indexed_components
+        ]
+
+        return texts, metadatas
+
+    def _semantic_search(self, query: str, max_results: int = 5, include_source: bool = False) -> str:
+        """Format the stored documents most similar to query, caching the result.
+
+        Agent loops often repeat a search, so results are cached by query
+        (whitespace-normalized) until the next load indexes new documents.
+        """
+        key = (" ".join(query.split()), max_results, include_source)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        results = self.vector_store.similarity_search(query, k=max_results)
+        if not results:
+            return "No relevant documents found."
+
+        output = []
+        for i, doc in enumerate(results, 1):
+            output.append(f"{i}. {doc.page_content}")
+            if doc.metadata:
+                output.append(f"   Metadata: {doc.metadata}")
+                if include_source and doc.metadata.get("component_id"):
+                    source = self.source_store.get(
+                        doc.metadata.get("doc_id"), doc.metadata["component_id"]
+                    )
+                    if source:
+                        output.append(f"   Full source:\n{source}")
+
+        result = "\n".join(output)
+        self._search_cache.put(key, result)
+        return result
 
     async def _create_agent_async(self) -> None:
         """Create the deep agent with all tools (async version)."""
         if not self.graph:
             raise ValueError("Knowledge graph not built. Load documents first.")
 
+        from deepagents import create_deep_agent
+        from langchain_core.tools import StructuredTool
+
+        from traceai.agents.middlewares import (
+            AuditMiddleware,
+            ConversationMemoryMiddleware,
+            ProgressTrackingMiddleware,
+        )
+        from traceai.tools import create_graph_tools, create_graph_visualization_tool
+
         # Create all tools using existing tools module
         graph_tools = create_graph_tools(self.graph)
         viz_tool = create_graph_visualization_tool(self.graph)
         
         # Create semantic search tool
-        def semantic_search(query: str, max_results: int = 5) -> str:
+        def semantic_search(query: str, max_results: int = 5, include_source: bool = False) -> str:
             """Search for documents and components semantically similar to the query."""
-            results = self.vector_store.similarity_search(query, k=max_results)
-            if not results:
-                return "No relevant documents found."
-            
-            output = []
-            for i, doc in enumerate(results, 1):
-                output.append(f"{i}. {doc.page_content}")
-                if doc.metadata:
-                    output.append(f"   Metadata: {doc.metadata}")
-            
-            return "\n".join(output)
+            return self._semantic_search(query, max_results, include_source)
         
-        from langchain_core.tools import StructuredTool
         semantic_tool = StructuredTool.from_function(
             func=semantic_search,
             name="semantic_search",
             description="Search for documents, components, and data sources using semantic similarity. "
-            "Use this to find relevant code, transformations, or data flows based on meaning."
+            "Use this to find relevant code, transformations, or data flows based on meaning. "
+            "Results show the start of each component's code; set include_source=True for the full text."
         )
         
         all_tools = graph_tools + [viz_tool, semantic_tool]
@@ -322,8 +743,14 @@ class TraceAI:
             middlewares.append(AuditMiddleware())
         if self.enable_progress:
             middlewares.append(ProgressTrackingMiddleware())
+        if self.model_provider == "anthropic":
+            prompt_caching = _anthropic_prompt_caching_middleware()
+            if prompt_caching is not None:
+                middlewares.append(prompt_caching)
 
-        # Build instructions dynamically based on enabled features
+        # Build instructions based on enabled features. Keep them free of
+        # per-request data: the identical prefix is what lets Anthropic
+        # (cache_control) and OpenAI (automatic prefix caching) reuse it.
         base_instructions = (
             "You are TraceAI, an expert AI assistant for analyzing ETL pipelines, data lineage, "
             "and enterprise transformations. You have access to a knowledge graph and semantic search "
@@ -415,11 +842,22 @@ class TraceAI:
                 return await self._offline_answer(question)
             raise ValueError("Agent not initialized. Load documents first.")
 
+        cache_scope = self._response_cache_scope()
+        question_embedding = None
+        if self.response_cache is not None:
+            # The semantic tier embeds the question; keep that off the event loop
+            cached, question_embedding = await asyncio.to_thread(
+                self.response_cache.lookup, question, cache_scope
+            )
+            if cached is not None:
+                logger.info("Answered from response cache")
+                return cached
+
         # Use ainvoke for async execution
         try:
             response = await self.agent.ainvoke(
                 {"messages": [{"role": "user", "content": question}]},
-                config={"recursion_limit": self.recursion_limit},
+                config=self._run_config(),
             )
         except Exception as e:
             if "recursion" in str(e).lower():
@@ -434,19 +872,58 @@ class TraceAI:
 
         # Extract final response
         if isinstance(response, dict) and "messages" in response:
-            return response["messages"][-1].content
+            answer = _last_content(response["messages"]) or ""
+        else:
+            answer = str(response)
 
-        return str(response)
+        if self.response_cache is not None and isinstance(answer, str) and answer:
+            await asyncio.to_thread(
+                self.response_cache.put, question, cache_scope, answer, question_embedding
+            )
+
+        return answer
+
+    async def query_many(
+        self, questions: list[str], max_concurrent: int = 3, return_exceptions: bool = False
+    ) -> list[str | BaseException]:
+        """
+        Answer independent questions concurrently.
+
+        LLM round-trips are I/O-bound, so running questions side by side cuts
+        wall-clock time to roughly that of the slowest one.
+
+        Args:
+            questions: User questions
+            max_concurrent: Maximum questions in flight (respects provider rate limits)
+            return_exceptions: Return a failed question's exception in its slot
+                instead of raising it
+
+        Returns:
+            Answers in the same order as the questions
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def query_with_semaphore(question: str) -> str:
+            async with semaphore:
+                return await self.query(question)
+
+        return await asyncio.gather(
+            *(query_with_semaphore(q) for q in questions), return_exceptions=return_exceptions
+        )
 
     async def query_stream(self, question: str) -> AsyncIterator[str]:
         """
         Query the agent with streaming response.
 
+        Model output is streamed token by token; tool calls and tool results
+        are not. Text the model writes before calling tools is separated from
+        the next turn by a blank line.
+
         Args:
             question: User question
 
         Yields:
-            Chunks of the response as they arrive
+            Chunks of the response text as they arrive
         """
         if not self.graph:
             raise ValueError("No knowledge graph available. Load documents first.")
@@ -457,20 +934,42 @@ class TraceAI:
                 return
             raise ValueError("Agent not initialized. Load documents first.")
 
-        # Use astream for streaming
+        cache_scope = self._response_cache_scope()
+        question_embedding = None
+        if self.response_cache is not None:
+            cached, question_embedding = await asyncio.to_thread(
+                self.response_cache.lookup, question, cache_scope
+            )
+            if cached is not None:
+                logger.info("Answered from response cache")
+                yield cached
+                return
+
+        from langchain_core.messages import AIMessage
+
+        # Only the last model turn is the answer; earlier turns precede tool calls
+        answer_parts: list[str] = []
+        turn_id = None
         try:
-            async for chunk in self.agent.astream(
+            async for message, _metadata in self.agent.astream(
                 {"messages": [{"role": "user", "content": question}]},
-                config={"recursion_limit": self.recursion_limit},
-                stream_mode="values",
+                config=self._run_config(),
+                stream_mode="messages",
             ):
-                # Extract the latest message content
-                if isinstance(chunk, dict) and "messages" in chunk:
-                    messages = chunk["messages"]
-                    if messages and len(messages) > 0:
-                        last_msg = messages[-1]
-                        if hasattr(last_msg, 'content') and last_msg.content:
-                            yield last_msg.content
+                # Skip tool results and other non-model messages
+                if not isinstance(message, AIMessage):
+                    continue
+                text = _text_content(message.content)
+                if not text:
+                    continue
+
+                if message.id != turn_id:
+                    if answer_parts:
+                        yield "\n\n"
+                    turn_id = message.id
+                    answer_parts = []
+                answer_parts.append(text)
+                yield text
         except Exception as e:
             if "recursion" in str(e).lower():
                 yield (
@@ -482,6 +981,57 @@ class TraceAI:
                 )
             else:
                 raise
+        else:
+            if self.response_cache is not None and answer_parts:
+                await asyncio.to_thread(
+                    self.response_cache.put,
+                    question,
+                    cache_scope,
+                    "".join(answer_parts),
+                    question_embedding,
+                )
+
+    def _run_config(self) -> dict[str, Any]:
+        """Build the LangGraph run config for an agent invocation."""
+        config: dict[str, Any] = {"recursion_limit": self.recursion_limit}
+        if self.tool_concurrency_limit:
+            # ToolNode runs the tool calls of one model turn in parallel; this bounds it
+            config["max_concurrency"] = self.tool_concurrency_limit
+        return config
+
+    def _response_cache_scope(self) -> str:
+        """Scope cached answers to the current provider, model, embedder, agent setup and content.
+
+        Graphs with equal node and edge counts can hold different documents, so the
+        fingerprint hashes the doc_id and content_hash of everything indexed.
+        """
+        if self._response_cache_scope_cache is None:
+            content = hashlib.md5(
+                "\x00".join(f"{d}:{h}" for d, h in sorted(self._indexed_content.items())).encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+            # Tools and instructions differ with these, and so do the answers
+            setup = (
+                f"memory={self.enable_memory}:filesystem={self.enable_filesystem}"
+                f":subagents={self.enable_subagents}"
+            )
+            # Semantic hits compare question embeddings, which only agree within one embedder
+            embedder = type(self.embeddings).__name__
+            embedder_model = getattr(self.embeddings, "model_name", None) or getattr(
+                self.embeddings, "model", None
+            )
+            fingerprint = (
+                f"{self.graph.number_of_nodes()}:{self.graph.number_of_edges()}:{content}:{setup}"
+                f":embeddings={embedder}/{embedder_model or ''}"
+            )
+            self._response_cache_scope_cache = ResponseCache.make_scope(
+                f"{self.model_provider}:{self.model_name}", fingerprint
+            )
+        return self._response_cache_scope_cache
+
+    def get_indexed_count(self) -> int:
+        """Get the number of items in the vector store (counted by Chroma, not fetched)."""
+        return self.vector_store._collection.count()
 
     def get_graph_stats(self) -> dict[str, Any]:
         """Get knowledge graph statistics."""
@@ -495,20 +1045,44 @@ class TraceAI:
 
             for node_type in NodeType:
                 stats[f"{node_type.value.lower()}_count"] = 0
+            stats["node_type_counts"] = {}
 
             for edge_type in EdgeType:
                 stats[f"{edge_type.value.lower()}_count"] = 0
 
             return stats
 
-        queries = GraphQueries(self.graph)
-        return queries.get_graph_stats()
+        # The graph only changes in load_documents, which clears this cache
+        if self._graph_stats_cache is None:
+            self._graph_stats_cache = GraphQueries(self.graph).get_graph_stats()
+        return dict(self._graph_stats_cache)
+
+    def close(self) -> None:
+        """
+        Release this agent's resources.
+
+        The vector store is shared by every agent using the same persist_dir and
+        stays open for the life of the process, so it is not reset here.
+        """
+        if self.parse_cache is not None:
+            self.parse_cache.close()
+            self.parse_cache = None
+        self.source_store.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        self.agent = None
+
+    async def __aenter__(self) -> "TraceAI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
 
     async def _offline_answer(self, question: str) -> str:
         """Generate a deterministic fallback answer when no LLM is configured."""
         question_lower = question.lower()
         queries = GraphQueries(self.graph)
-        stats = queries.get_graph_stats()
+        stats = self.get_graph_stats()
         packages = queries.find_nodes_by_type(NodeType.PACKAGE)
         package_names = [data.get("name") for _, data in packages if data.get("name")]
 
@@ -1,24 +1,42 @@
 """Interactive CLI for TraceAI using the async-first agent."""
 
 import asyncio
+import functools
+import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 from dotenv import load_dotenv
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.spinner import Spinner
 
-from traceai.agents import TraceAI
 from traceai.logger import logger
 
+if TYPE_CHECKING:
+    # Imported lazily at runtime: the agent stack (LangChain, Chroma, LLM clients)
+    # takes seconds to import and `version`/`--help` never need it
+    from traceai.agents import TraceAI
+
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
 
+def _new_runner() -> asyncio.Runner:
+    """Event loop runner for a command, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.Runner()
+    return asyncio.Runner(loop_factory=uvloop.new_event_loop)
+
+
 @click.group()
 def cli():
     """TraceAI - AI-powered ETL lineage and transformation analysis."""
@@ -31,7 +49,8 @@ def cli():
 @click.option(
     "--model-name", default="claude-3-5-sonnet-20241022", help="Model name (e.g., gpt-4, claude-3-5-sonnet-20241022)"
 )
-def analyze(documents_dir: Path, model: str, model_name: str):
+@click.option("--no-cache", is_flag=True, help="Always call the LLM instead of reusing cached answers")
+def analyze(documents_dir: Path, model: str, model_name: str, no_cache: bool):
     """
     Start interactive analysis session for documents in DOCUMENTS_DIR.
 
@@ -40,6 +59,16 @@ def analyze(documents_dir: Path, model: str, model_name: str):
     """
     console.print(Panel.fit("🔍 [bold cyan]TraceAI - ETL Lineage Analyzer[/bold cyan]", border_style="cyan"))
 
+    # One event loop for the whole session: the LLM clients' async connection
+    # pools stay bound to it instead of being torn down after every question
+    with _new_runner() as runner:
+        _analyze_session(runner, documents_dir, model, model_name, use_cache=not no_cache)
+
+
+def _analyze_session(
+    runner: asyncio.Runner, documents_dir: Path, model: str, model_name: str, use_cache: bool
+):
+    """Load documents and run the interactive question loop on a shared event loop."""
     # Load documents and create agent
     with Progress(
         SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console, transient=True
@@ -47,7 +76,7 @@ def analyze(documents_dir: Path, model: str, model_name: str):
         task = progress.add_task("Loading documents and initializing agent...", total=None)
 
         try:
-            agent = _create_traceai_agent(documents_dir, model, model_name)
+            agent = _create_traceai_agent(runner, documents_dir, model, model_name, use_cache)
 
             progress.update(task, description="[green]✓ Agent ready!")
 
@@ -94,13 +123,9 @@ def analyze(documents_dir: Path, model: str, model_name: str):
                     console.print(f"[yellow]Unknown command: {query}[/yellow]")
                     continue
 
-            # Process query with agent
-            with console.status("[bold green]Agent thinking...", spinner="dots"):
-                response = asyncio.run(agent.query(query))
-
-            # Display response
+            # Process query with agent, rendering the answer as it streams in
             console.print("\n[bold green]🤖 Agent:[/bold green]")
-            console.print(Panel(Markdown(response), border_style="green"))
+            runner.run(_stream_answer(agent, query))
 
         except KeyboardInterrupt:
             console.print("\n\n[dim]Session interrupted. Goodbye![/dim]")
@@ -113,33 +138,183 @@ def analyze(documents_dir: Path, model: str, model_name: str):
             logger.error(f"Error during analysis: {e}")
 
 
+class _StreamingAnswer:
+    """Live renderable for an answer that is still being streamed."""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+
+    def __rich__(self):
+        # Markdown is only re-parsed when Live refreshes, not once per token
+        if not self.chunks:
+            return Spinner("dots", text="[bold green]Agent thinking...")
+        return Panel(Markdown("".join(self.chunks)), border_style="green")
+
+
+async def _stream_answer(agent, query: str) -> None:
+    """Stream the agent's answer to a question into a live-updating panel."""
+    answer = _StreamingAnswer()
+    # The Live display refreshes on its own thread while chunks are awaited
+    with Live(answer, console=console, refresh_per_second=10):
+        async for chunk in agent.query_stream(query):
+            answer.chunks.append(chunk)
+
+
 @cli.command()
 @click.argument("documents_dir", type=click.Path(exists=True, path_type=Path))
-@click.argument("query")
+@click.argument("query", nargs=-1, required=True)
 @click.option("--model", default="anthropic", type=click.Choice(["anthropic", "openai"]))
 @click.option("--model-name", default="claude-3-5-sonnet-20241022")
-def ask(documents_dir: Path, query: str, model: str, model_name: str):
+@click.option("--max-concurrent", default=3, show_default=True, help="Questions sent to the LLM at once")
+@click.option("--no-cache", is_flag=True, help="Always call the LLM instead of reusing cached answers")
+@click.option(
+    "--split-lines", is_flag=True, help="Treat each line of a QUERY argument as a separate question"
+)
+def ask(
+    documents_dir: Path,
+    query: tuple[str, ...],
+    model: str,
+    model_name: str,
+    max_concurrent: int,
+    no_cache: bool,
+    split_lines: bool,
+):
     """
-    Ask a single question about documents.
+    Ask one or more questions about documents.
+
+    Each QUERY argument is a separate question (multi-line questions stay whole
+    unless --split-lines is given); they are answered concurrently, and a failed
+    question is reported without losing the other answers.
 
     Example:
-        trace-ai ask ./examples/sample_packages "What packages do we have?"
+        trace-ai ask ./examples/sample_packages "What packages do we have?" "Trace DimCustomer"
+    """
+    if split_lines:
+        questions = [line.strip() for q in query for line in q.splitlines() if line.strip()]
+    else:
+        questions = [q.strip() for q in query if q.strip()]
+    if not questions:
+        raise click.UsageError("QUERY must contain at least one question.")
+
+    with _new_runner() as runner:
+        with Progress(
+            SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
+        ) as progress:
+            task = progress.add_task("Initializing...", total=None)
+            agent = _create_traceai_agent(
+                runner, documents_dir, model, model_name, use_cache=not no_cache
+            )
+
+            progress.update(task, description=f"Analyzing {len(questions)} question(s)...")
+            responses = runner.run(
+                agent.query_many(questions, max_concurrent=max_concurrent, return_exceptions=True)
+            )
+
+    for question, response in zip(questions, responses, strict=True):
+        console.print("\n[bold cyan]Question:[/bold cyan]", question)
+        if isinstance(response, BaseException):
+            logger.error(f"Question failed: {question!r}: {response}")
+            console.print("\n[bold red]Failed:[/bold red]")
+            console.print(Panel(str(response), border_style="red"))
+            continue
+        console.print("\n[bold green]Answer:[/bold green]")
+        console.print(Panel(Markdown(response), border_style="green"))
+
+
+@cli.command()
+@click.argument("documents_dir", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--input-jsonl",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help='Requests, one per line: {"custom_id": ..., "body": {"query": ...}}',
+)
+@click.option(
+    "--output-jsonl",
+    required=True,
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Where to write one result line per request",
+)
+@click.option("--model", default="anthropic", type=click.Choice(["anthropic", "openai"]))
+@click.option("--model-name", default="claude-3-5-sonnet-20241022")
+@click.option("--max-concurrent", default=3, show_default=True, help="Questions sent to the LLM at once")
+@click.option("--no-cache", is_flag=True, help="Always call the LLM instead of reusing cached answers")
+def ask_batch(
+    documents_dir: Path,
+    input_jsonl: Path,
+    output_jsonl: Path,
+    model: str,
+    model_name: str,
+    max_concurrent: int,
+    no_cache: bool,
+):
     """
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
-        task = progress.add_task("Initializing...", total=None)
-        agent = _create_traceai_agent(documents_dir, model, model_name)
+    Answer a file of questions concurrently and write the results as JSON Lines.
 
-        progress.update(task, description="Analyzing...")
-        response = asyncio.run(agent.query(query))
+    The input uses the OpenAI Batch API request layout. Each output line is
+    {"custom_id": ..., "response": {"answer": ...}, "error": null}, or has
+    "response": null and an error message if that question failed.
 
-    console.print("\n[bold cyan]Question:[/bold cyan]", query)
-    console.print("\n[bold green]Answer:[/bold green]")
-    console.print(Panel(Markdown(response), border_style="green"))
+    Example:
+        trace-ai ask-batch ./examples/sample_packages --input-jsonl questions.jsonl --output-jsonl answers.jsonl
+    """
+    requests = _read_batch_requests(input_jsonl)
+    if not requests:
+        raise click.UsageError(f"{input_jsonl} contains no requests.")
+
+    with _new_runner() as runner:
+        with Progress(
+            SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
+        ) as progress:
+            task = progress.add_task("Initializing...", total=None)
+            agent = _create_traceai_agent(
+                runner, documents_dir, model, model_name, use_cache=not no_cache
+            )
+
+            progress.update(task, description=f"Analyzing {len(requests)} question(s)...")
+            results = runner.run(
+                agent.query_many(
+                    [query for _, query in requests],
+                    max_concurrent=max_concurrent,
+                    return_exceptions=True,
+                )
+            )
+
+    failed = 0
+    with output_jsonl.open("w", encoding="utf-8") as f:
+        for (custom_id, _), result in zip(requests, results, strict=True):
+            if isinstance(result, BaseException):
+                failed += 1
+                logger.error(f"Batch request {custom_id} failed: {result}")
+                record = {"custom_id": custom_id, "response": None, "error": str(result)}
+            else:
+                record = {"custom_id": custom_id, "response": {"answer": result}, "error": None}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    console.print(
+        f"[green]✓[/green] Wrote {len(requests) - failed} answer(s) to {output_jsonl}"
+        + (f" ([red]{failed} failed[/red])" if failed else "")
+    )
+
+
+def _read_batch_requests(path: Path) -> list[tuple[str, str]]:
+    """Read (custom_id, query) pairs from a Batch API style JSONL file."""
+    requests = []
+    with path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                requests.append((str(item["custom_id"]), item["body"]["query"]))
+            except (ValueError, KeyError, TypeError) as e:
+                raise click.UsageError(
+                    f"{path}:{line_no}: expected {{\"custom_id\": ..., \"body\": {{\"query\": ...}}}} ({e})"
+                ) from e
+    return requests
 
 
-def _show_help():
-    """Show help information."""
-    help_text = """
+_HELP_TEXT = """
 # Commands
 
 - `/help` - Show this help
@@ -165,8 +340,18 @@ def _show_help():
 **Dependencies:**
 - "What must run before the ETL task?"
 - "Show me the execution order for the CustomerETL package"
-    """
-    console.print(Panel(Markdown(help_text), title="Help", border_style="cyan"))
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _help_panel() -> Panel:
+    """Build the help panel once; the Markdown is parsed on first /help only."""
+    return Panel(Markdown(_HELP_TEXT), title="Help", border_style="cyan")
+
+
+def _show_help():
+    """Show help information."""
+    console.print(_help_panel())
 
 
 def _show_stats(agent):
@@ -175,10 +360,7 @@ def _show_stats(agent):
         console.print("[yellow]No graph available[/yellow]")
         return
 
-    from traceai.graph.queries import GraphQueries
-
-    queries = GraphQueries(agent.graph)
-    stats = queries.get_graph_stats()
+    stats = agent.get_graph_stats()
 
     stats_text = f"""
 # Knowledge Graph Statistics
@@ -188,22 +370,29 @@ def _show_stats(agent):
 
 ## Node Types
 """
-    for key, value in sorted(stats.items()):
-        if key.endswith("_nodes") and value > 0:
-            node_type = key.replace("_nodes", "").replace("_", " ").title()
-            stats_text += f"- **{node_type}:** {value}\n"
+    for node_type, count in stats["node_type_counts"].items():
+        stats_text += f"- **{node_type}:** {count}\n"
 
     # Vector store stats
-    vs_stats = agent.vector_store.get_stats()
-    stats_text += f"\n## Vector Store\n- **Indexed Items:** {vs_stats['total_items']}\n"
+    indexed_items = agent.get_indexed_count()
+    stats_text += f"\n## Vector Store\n- **Indexed Items:** {indexed_items}\n"
 
     console.print(Panel(Markdown(stats_text), title="Statistics", border_style="cyan"))
 
 
-def _create_traceai_agent(documents_dir: Path, model: str, model_name: str) -> TraceAI:
-    """Create and initialize a TraceAI agent synchronously."""
-    agent = TraceAI(model_provider=model, model_name=model_name, persist_dir=Path("./.traceai"))
-    asyncio.run(agent.load_documents(documents_dir))
+def _create_traceai_agent(
+    runner: asyncio.Runner, documents_dir: Path, model: str, model_name: str, use_cache: bool = True
+) -> "TraceAI":
+    """Create a TraceAI agent and load documents on the given event loop."""
+    from traceai.agents import TraceAI
+
+    agent = TraceAI(
+        model_provider=model,
+        model_name=model_name,
+        persist_dir=Path("./.traceai"),
+        enable_response_cache=use_cache,
+    )
+    runner.run(agent.load_documents(documents_dir))
     return agent
 
 
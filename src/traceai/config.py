@@ -1,7 +1,8 @@
 """Configuration management for Enterprise Assistant."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -62,5 +63,14 @@ class Settings(BaseSettings):
         return self.openai_api_key is not None and len(self.openai_api_key) > 0
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the application settings, reading the environment and .env on first use."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # Backward-compatible `from traceai.config import settings`, built on first access
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,6 +5,7 @@ This module is format-agnostic and works with any ParsedDocument from any parser
 """
 
 import re
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -127,7 +128,9 @@ class KnowledgeGraphBuilder:
 
         # Add data entities that were already extracted
         for entity in parsed_document.data_entities:
-            entity_id = self._get_or_create_entity_node(entity.name, entity.schema_name)
+            entity_id = self._get_or_create_entity_node(
+                entity.name, entity.schema_name, entity.database_name
+            )
             # Map entity name for dependency resolution
             id_map[entity.name] = entity_id
 
@@ -300,7 +303,9 @@ class KnowledgeGraphBuilder:
                 component_node_id, entity_id, EdgeType.WRITES_TO, f"Component writes to {entity_name}"
             )
 
-    def _get_or_create_entity_node(self, entity_name: str, schema_name: str = None) -> str:
+    def _get_or_create_entity_node(
+        self, entity_name: str, schema_name: str = None, database_name: str = None
+    ) -> str:
         """Get existing entity node or create new one (table, sheet, dataset, file, etc.)."""
         # Parse schema.entity or database.schema.entity format if schema not provided
         if not schema_name:
@@ -319,13 +324,22 @@ class KnowledgeGraphBuilder:
         else:
             actual_entity_name = entity_name
 
-        entity_id = create_node_id(NodeType.TABLE, entity_name)
+        # Same-named tables in different databases are different nodes
+        if database_name:
+            entity_id = create_node_id(
+                NodeType.TABLE, f"{database_name}.{schema_name}.{actual_entity_name}"
+            )
+        else:
+            entity_id = create_node_id(NodeType.TABLE, entity_name)
 
         if not self.graph.has_node(entity_id):
             from traceai.graph.schema import TableNode
 
             entity_attrs = TableNode(
-                id=entity_id, name=actual_entity_name, schema_name=schema_name
+                id=entity_id,
+                name=actual_entity_name,
+                schema_name=schema_name,
+                database_name=database_name,
             )
             self.graph.add_node(entity_id, **entity_attrs.__dict__)
 
@@ -465,19 +479,25 @@ class KnowledgeGraphBuilder:
         )
 
 
-def build_graph_from_documents(documents: list[ParsedDocument]) -> nx.DiGraph:
+def build_graph_from_documents(
+    documents: Iterable[ParsedDocument],
+    builder: KnowledgeGraphBuilder | None = None,
+) -> nx.DiGraph:
     """
     Build a knowledge graph from multiple parsed documents.
 
     Works with any document type: SSIS packages, Excel workbooks, Mainframe jobs, etc.
+    Documents are added one at a time, so a generator can stream them in without
+    holding the whole corpus in memory.
 
     Args:
-        documents: List of parsed documents
+        documents: Iterable of parsed documents
+        builder: Existing builder to extend (a new graph is started if None)
 
     Returns:
         NetworkX directed graph
     """
-    builder = KnowledgeGraphBuilder()
+    builder = builder or KnowledgeGraphBuilder()
 
     for document in documents:
         builder.add_document(document)
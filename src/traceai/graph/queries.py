@@ -1,5 +1,6 @@
 """Graph query functions for knowledge graph analysis."""
 
+from collections import Counter
 from typing import Any
 
 import networkx as nx
@@ -290,10 +291,9 @@ class GraphQueries:
         Returns:
             List of sets, each containing node IDs in a component
         """
-        # Convert to undirected for component analysis
-        undirected = self.graph.to_undirected()
-        components = list(nx.connected_components(undirected))
-        return components
+        # Weak components are the components of the undirected graph, without
+        # copying every node and edge into an undirected graph first
+        return list(nx.weakly_connected_components(self.graph))
 
     def calculate_node_importance(self, node_id: str) -> dict[str, float]:
         """
@@ -320,22 +320,26 @@ class GraphQueries:
             "is_connected": nx.is_weakly_connected(self.graph),
         }
 
-        # Count by node type
+        # Count node and edge types in a single pass each. Keys are normalized to
+        # the enum value so enum members and raw strings count the same.
+        node_counts = Counter(
+            getattr(node_type, "value", node_type)
+            for _, node_type in self.graph.nodes(data="node_type")
+        )
         for node_type in NodeType:
-            count = sum(
-                1
-                for _, data in self.graph.nodes(data=True)
-                if data.get("node_type") == node_type
-            )
-            stats[f"{node_type.value.lower()}_count"] = count
-
-        # Count by edge type
+            stats[f"{node_type.value.lower()}_count"] = node_counts.get(node_type.value, 0)
+        # Non-zero counts keyed by display name, sorted for presentation
+        stats["node_type_counts"] = {
+            node_type.value: node_counts[node_type.value]
+            for node_type in sorted(NodeType, key=lambda t: t.value)
+            if node_counts.get(node_type.value)
+        }
+
+        edge_counts = Counter(
+            getattr(edge_type, "value", edge_type)
+            for _, _, edge_type in self.graph.edges(data="edge_type")
+        )
         for edge_type in EdgeType:
-            count = sum(
-                1
-                for _, _, data in self.graph.edges(data=True)
-                if data.get("edge_type") == edge_type
-            )
-            stats[f"{edge_type.value.lower()}_count"] = count
+            stats[f"{edge_type.value.lower()}_count"] = edge_counts.get(edge_type.value, 0)
 
         return stats
@@ -8,7 +8,7 @@ from typing import Any
 import networkx as nx
 from networkx.readwrite import json_graph
 
-from traceai.config import settings
+from traceai.config import get_settings
 from traceai.logger import logger
 
 
@@ -22,7 +22,7 @@ class GraphStorage:
         Args:
             storage_path: Path to store graph (defaults to config setting)
         """
-        self.storage_path = storage_path or settings.graph_storage_path
+        self.storage_path = storage_path or get_settings().graph_storage_path
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
     def save_pickle(self, graph: nx.DiGraph, path: Path | None = None) -> None:
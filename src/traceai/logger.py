@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
-import logging.config
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
@@ -30,38 +31,57 @@ def _configure_logging() -> None:
 
     log_format = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
-
-    logging.config.dictConfig(
-        {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "formatters": {
-                "standard": {
-                    "format": log_format,
-                    "datefmt": date_format,
-                }
-            },
-            "handlers": {
-                "console": {
-                    "class": "logging.StreamHandler",
-                    "level": log_level,
-                    "formatter": "standard",
-                },
-                "file": {
-                    "class": "logging.handlers.RotatingFileHandler",
-                    "level": log_level,
-                    "formatter": "standard",
-                    "filename": str(logs_dir / "traceai.log"),
-                    "maxBytes": 5 * 1024 * 1024,
-                    "backupCount": 5,
-                    "encoding": "utf-8",
-                },
-            },
-            "root": {
-                "level": log_level,
-                "handlers": ["console", "file"],
-            },
-        }
+    formatter = logging.Formatter(log_format, datefmt=date_format)
+
+    console_handler = logging.StreamHandler()
+    file_handler = RotatingFileHandler(
+        logs_dir / "traceai.log",
+        maxBytes=5 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    for handler in (console_handler, file_handler):
+        handler.setLevel(log_level)
+        handler.setFormatter(formatter)
+
+    # Records are only enqueued on the calling thread (which may be running the
+    # event loop); formatting and console/disk writes happen on the listener thread.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    queue_handler = QueueHandler(log_queue)
+    root.addHandler(queue_handler)
+    root.setLevel(log_level)
+
+    # A forked child (e.g. a parse worker) inherits the queue but not the
+    # listener thread, so records it put on the queue would never be written;
+    # it logs through the handlers directly instead. The handler locks are held
+    # across the fork so the listener is never forked mid-write, which would
+    # leave the child's copy of the stream locked.
+    def _hold_handlers() -> None:
+        console_handler.acquire()
+        file_handler.acquire()
+
+    def _release_handlers() -> None:
+        file_handler.release()
+        console_handler.release()
+
+    def _log_directly_in_child() -> None:
+        # logging has already reset the handler locks in the child
+        if queue_handler in root.handlers:
+            root.removeHandler(queue_handler)
+            root.addHandler(console_handler)
+            root.addHandler(file_handler)
+
+    os.register_at_fork(
+        before=_hold_handlers,
+        after_in_parent=_release_handlers,
+        after_in_child=_log_directly_in_child,
     )
 
     # Suppress verbose third-party loggers
@@ -1,7 +1,23 @@
 """Memory storage backends for conversation and vector memory."""
 
+import importlib
+from typing import Any
+
 from traceai.memory.conversation_store import ConversationStore, SQLiteConversationStore
-from traceai.memory.vector_store import VectorMemoryStore, ChromaVectorStore, PineconeVectorStore
+from traceai.memory.query_cache import QueryCache
+from traceai.memory.response_cache import ResponseCache
+from traceai.memory.source_store import SourceStore
+
+# Vector stores import chromadb; load them on first access so the light
+# modules above can be used without it
+_LAZY_STORES = {"VectorMemoryStore", "ChromaVectorStore", "PineconeVectorStore"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_STORES:
+        return getattr(importlib.import_module("traceai.memory.vector_store"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ConversationStore",
@@ -9,4 +25,7 @@ __all__ = [
     "VectorMemoryStore",
     "ChromaVectorStore",
     "PineconeVectorStore",
+    "QueryCache",
+    "ResponseCache",
+    "SourceStore",
 ]
@@ -2,13 +2,64 @@
 
 import json
 import sqlite3
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from traceai.logger import logger
 
+try:
+    # C-backed decoder (already installed via chromadb/langsmith); stdlib fallback
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Porter stemming lets "customer" match "customers"; prefix indexes serve
+# "cust*"-style queries without scanning the whole term list
+_FTS_TABLE_SQL = """
+    CREATE VIRTUAL TABLE messages_fts USING fts5(
+        content, content='messages', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+"""
+
+
+# Keep the external-content FTS index in sync inside SQLite, so writers only
+# touch messages
+_FTS_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF content ON messages BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+)
+
+
+def _row_to_message(row: sqlite3.Row) -> dict[str, Any]:
+    """Convert a messages row to a dict, decoding its metadata JSON."""
+    message = dict(row)
+    if message["metadata"]:
+        message["metadata"] = _json_loads(message["metadata"])
+    return message
+
 
 class ConversationStore(ABC):
     """Abstract base class for conversation memory storage."""
@@ -18,6 +69,11 @@ class ConversationStore(ABC):
         """Add a message to conversation history."""
         pass
 
+    def add_messages(self, messages: Iterable[tuple[str, str, dict[str, Any] | None]]) -> None:
+        """Add several (role, content, metadata) messages to conversation history."""
+        for role, content, metadata in messages:
+            self.add_message(role, content, metadata)
+
     @abstractmethod
     def get_recent_messages(self, limit: int = 30) -> list[dict[str, Any]]:
         """Get recent messages from conversation history."""
@@ -65,25 +121,65 @@ class SQLiteConversationStore(ConversationStore):
         self._conn = None
         if ephemeral:
             self._conn = sqlite3.connect(":memory:")
+            self._conn.row_factory = sqlite3.Row
+
+        # Persistent mode keeps one connection per thread (sqlite3 connections
+        # can't be shared across threads without external locking)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
 
         if not ephemeral:
             Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
         self._init_db()
         logger.info(
-            f"Initialized {'ephemeral' if ephemeral else 'persistent'} SQLite conversation store "
-            f"at {self.db_path}"
+            "Initialized %s SQLite conversation store at %s",
+            "ephemeral" if ephemeral else "persistent",
+            self.db_path,
         )
 
-    def _get_conn(self):
-        """Get database connection."""
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get this thread's database connection, opening it on first use."""
         if self._conn:
             return self._conn
-        return sqlite3.connect(self.db_path)
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with per-connection performance pragmas applied."""
+        # check_same_thread=False only so close() can close other threads' connections
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL makes commits an append instead of a rollback-journal rewrite, so
+        # fsync on every checkpoint rather than every transaction is safe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def close(self) -> None:
+        """Close all open database connections."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
 
     def _init_db(self) -> None:
         """Initialize database schema."""
         conn = self._get_conn()
+        if not self.ephemeral:
+            # Persistent for the database file, so set once here
+            conn.execute("PRAGMA journal_mode=WAL")
         with conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS messages (
@@ -98,11 +194,28 @@ class SQLiteConversationStore(ConversationStore):
                 CREATE INDEX IF NOT EXISTS idx_timestamp ON messages(timestamp DESC)
             """)
             conn.execute("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts
-                USING fts5(content, content='messages', content_rowid='id')
+                CREATE INDEX IF NOT EXISTS idx_role ON messages(role)
             """)
+            self._ensure_fts(conn)
+            for trigger_sql in _FTS_TRIGGERS_SQL:
+                conn.execute(trigger_sql)
             conn.commit()
 
+    def _ensure_fts(self, conn: sqlite3.Connection) -> None:
+        """Create the FTS index, rebuilding one made with an older tokenizer config."""
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone()
+        if row is not None and "porter" in row[0]:
+            return
+
+        if row is not None:
+            logger.info("Rebuilding conversation full-text index with stemming and prefix indexes")
+            conn.execute("DROP TABLE messages_fts")
+        conn.execute(_FTS_TABLE_SQL)
+        # Index any messages already stored (external-content tables read them from messages)
+        conn.execute("INSERT INTO messages_fts(messages_fts) VALUES('rebuild')")
+
     def add_message(self, role: str, content: str, metadata: dict[str, Any] | None = None) -> None:
         """
         Add a message to conversation history.
@@ -112,23 +225,28 @@ class SQLiteConversationStore(ConversationStore):
             content: Message content
             metadata: Optional metadata dict
         """
-        metadata_json = json.dumps(metadata) if metadata else None
+        self.add_messages([(role, content, metadata)])
+
+    def add_messages(self, messages: Iterable[tuple[str, str, dict[str, Any] | None]]) -> None:
+        """
+        Add several messages in a single transaction.
+
+        Args:
+            messages: (role, content, metadata) tuples, oldest first
+        """
+        rows = [
+            (role, content, json.dumps(metadata) if metadata else None)
+            for role, content, metadata in messages
+        ]
+        if not rows:
+            return
 
         conn = self._get_conn()
+        # The FTS index is kept in sync by triggers on messages
         with conn:
-            cursor = conn.execute(
-                "INSERT INTO messages (role, content, metadata) VALUES (?, ?, ?)",
-                (role, content, metadata_json),
-            )
-            message_id = cursor.lastrowid
-
-            # Update FTS index
-            conn.execute(
-                "INSERT INTO messages_fts (rowid, content) VALUES (?, ?)", (message_id, content)
-            )
-            conn.commit()
+            conn.executemany("INSERT INTO messages (role, content, metadata) VALUES (?, ?, ?)", rows)
 
-        logger.debug(f"Added {role} message to conversation store (id={message_id})")
+        logger.debug("Added %d messages to conversation store", len(rows))
 
     def get_recent_messages(self, limit: int = 30) -> list[dict[str, Any]]:
         """
@@ -141,27 +259,22 @@ class SQLiteConversationStore(ConversationStore):
             List of message dicts with id, role, content, metadata, timestamp
         """
         conn = self._get_conn()
-        conn.row_factory = sqlite3.Row
+        # Take the newest rows, returned in chronological order (oldest first)
         cursor = conn.execute(
             """
-            SELECT id, role, content, metadata, timestamp
-            FROM messages
-            ORDER BY id DESC
-            LIMIT ?
+            SELECT id, role, content, metadata, timestamp FROM (
+                SELECT id, role, content, metadata, timestamp
+                FROM messages
+                ORDER BY id DESC
+                LIMIT ?
+            )
+            ORDER BY id ASC
         """,
             (limit,),
         )
-        messages = [dict(row) for row in cursor.fetchall()]
-
-        # Parse metadata JSON
-        for msg in messages:
-            if msg["metadata"]:
-                msg["metadata"] = json.loads(msg["metadata"])
+        messages = [_row_to_message(row) for row in cursor]
 
-        # Return in chronological order (oldest first)
-        messages.reverse()
-
-        logger.debug(f"Retrieved {len(messages)} recent messages")
+        logger.debug("Retrieved %d recent messages", len(messages))
         return messages
 
     def get_all_messages(self) -> list[dict[str, Any]]:
@@ -173,18 +286,12 @@ class SQLiteConversationStore(ConversationStore):
         """
         conn = self._get_conn()
         with conn as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 "SELECT id, role, content, metadata, timestamp FROM messages ORDER BY id ASC"
             )
-            messages = [dict(row) for row in cursor.fetchall()]
-
-        # Parse metadata JSON
-        for msg in messages:
-            if msg["metadata"]:
-                msg["metadata"] = json.loads(msg["metadata"])
+            messages = [_row_to_message(row) for row in cursor]
 
-        logger.debug(f"Retrieved {len(messages)} total messages")
+        logger.debug("Retrieved %d total messages", len(messages))
         return messages
 
     def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
@@ -200,7 +307,6 @@ class SQLiteConversationStore(ConversationStore):
         """
         conn = self._get_conn()
         with conn as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.execute(
                 """
                 SELECT m.id, m.role, m.content, m.metadata, m.timestamp,
@@ -213,14 +319,9 @@ class SQLiteConversationStore(ConversationStore):
             """,
                 (query, limit),
             )
-            messages = [dict(row) for row in cursor.fetchall()]
-
-        # Parse metadata JSON
-        for msg in messages:
-            if msg["metadata"]:
-                msg["metadata"] = json.loads(msg["metadata"])
+            messages = [_row_to_message(row) for row in cursor]
 
-        logger.debug(f"Found {len(messages)} messages matching '{query}'")
+        logger.debug("Found %d messages matching %r", len(messages), query)
         return messages
 
     def clear(self) -> None:
@@ -228,7 +329,6 @@ class SQLiteConversationStore(ConversationStore):
         conn = self._get_conn()
         with conn as conn:
             conn.execute("DELETE FROM messages")
-            conn.execute("DELETE FROM messages_fts")
             conn.commit()
 
         logger.info("Cleared all conversation history")
@@ -236,21 +336,10 @@ class SQLiteConversationStore(ConversationStore):
     def get_stats(self) -> dict[str, Any]:
         """Get conversation store statistics."""
         conn = self._get_conn()
-        with conn as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM messages")
-            total_messages = cursor.fetchone()[0]
-
-            cursor = conn.execute(
-                "SELECT COUNT(DISTINCT role) as role_count FROM messages"
-            )
-            role_count = cursor.fetchone()[0]
-
-            cursor = conn.execute(
-                "SELECT MIN(timestamp) as first, MAX(timestamp) as last FROM messages"
-            )
-            row = cursor.fetchone()
-            first_timestamp = row[0]
-            last_timestamp = row[1]
+        # One scan instead of one per aggregate
+        total_messages, role_count, first_timestamp, last_timestamp = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT role), MIN(timestamp), MAX(timestamp) FROM messages"
+        ).fetchone()
 
         return {
             "total_messages": total_messages,
@@ -0,0 +1,44 @@
+"""ONNX Runtime embeddings via fastembed (optional dependency)."""
+
+import os
+
+from langchain_core.embeddings import Embeddings
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """LangChain embeddings backed by fastembed's ONNX Runtime models.
+
+    Produces the same vectors as the sentence-transformers model of the same
+    name (e.g. 384-dim all-MiniLM-L6-v2), but runs the fused ONNX graph instead
+    of PyTorch, which is several times faster on CPU.
+
+    Requires ``pip install fastembed``.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threads: int | None = None,
+        batch_size: int = 256,
+    ):
+        """
+        Initialize fastembed embeddings.
+
+        Args:
+            model_name: fastembed model name
+            threads: ONNX Runtime intra-op threads (default: all CPUs)
+            batch_size: Texts per ONNX forward pass
+        """
+        from fastembed import TextEmbedding
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = TextEmbedding(model_name=model_name, threads=threads or os.cpu_count())
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of documents."""
+        return [vec.tolist() for vec in self._model.embed(texts, batch_size=self.batch_size)]
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a single query."""
+        return next(iter(self._model.query_embed(text))).tolist()
@@ -0,0 +1,82 @@
+"""LRU cache of vector search results.
+
+Kept free of vector-store dependencies so agents can cache searches without
+importing chromadb.
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class QueryCache:
+    """Thread-safe LRU cache of search results with a time-to-live.
+
+    Stores invalidate it whenever they are written to; the TTL bounds how stale
+    results can get when another process writes to the same collection.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        """
+        Initialize query cache.
+
+        Args:
+            max_entries: Maximum cached queries (least recently used evicted first)
+            ttl_seconds: Seconds before a cached result expires
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(
+        query: str, n_results: int, filter_metadata: dict[str, Any] | None
+    ) -> tuple[str, int, str]:
+        """Build a cache key; the filter is serialized so equal dicts hash equally."""
+        return query, n_results, json.dumps(filter_metadata, sort_keys=True, default=str)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return a copy of the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+        # Callers may mutate results, so never hand out the cached objects
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,266 @@
+"""Prompt/response cache for agent queries (exact + semantic)."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from traceai.logger import logger
+
+
+@dataclass
+class CachedResponse:
+    """A cached agent answer."""
+
+    question: str
+    answer: str
+    scope: str
+    created_at: float
+    embedding: np.ndarray | None = None
+
+
+class ResponseCache:
+    """Two-tier cache for agent responses.
+
+    Features:
+    - Exact-match lookup keyed by SHA256 of (question, model, graph fingerprint)
+    - Semantic lookup by cosine similarity of question embeddings
+    - TTL-based expiry
+    - Optional SQLite persistence across sessions (one row written per answer)
+
+    Safe to call from worker threads; embedding runs outside the lock.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        embed_fn: Callable[[str], list[float]] | None = None,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 512,
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            path: SQLite database for persistence (None keeps the cache in memory only)
+            embed_fn: Function embedding a query (enables the semantic tier)
+            ttl_seconds: Seconds before a cached answer expires
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of cached answers (oldest evicted first)
+        """
+        self.path = Path(path) if path else None
+        self.embed_fn = embed_fn
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._entries: dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._load()
+
+    @staticmethod
+    def make_scope(model_name: str | None, graph_fingerprint: str) -> str:
+        """Build the scope an answer is valid for (model + knowledge graph)."""
+        return f"{model_name or ''}|{graph_fingerprint}"
+
+    @staticmethod
+    def make_key(question: str, scope: str) -> str:
+        """Build the exact-match key for a question within a scope."""
+        # Whitespace-only differences should not miss the cache
+        normalized = " ".join(question.split())
+        return hashlib.sha256(f"{normalized}\x00{scope}".encode()).hexdigest()
+
+    def get(self, question: str, scope: str) -> str | None:
+        """
+        Look up a cached answer.
+
+        Args:
+            question: User question
+            scope: Scope from make_scope()
+
+        Returns:
+            Cached answer, or None on miss
+        """
+        return self.lookup(question, scope)[0]
+
+    def lookup(self, question: str, scope: str) -> tuple[str | None, np.ndarray | None]:
+        """
+        Look up a cached answer, also returning the question embedding.
+
+        Pass the embedding to put() after a miss so the question is not embedded twice.
+
+        Args:
+            question: User question
+            scope: Scope from make_scope()
+
+        Returns:
+            Tuple of (cached answer or None, question embedding or None if not computed)
+        """
+        key = self.make_key(question, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    logger.debug("Response cache exact hit")
+                    return entry.answer, None
+                del self._entries[key]
+
+        return self._semantic_lookup(question, scope)
+
+    def put(
+        self, question: str, scope: str, answer: str, embedding: np.ndarray | None = None
+    ) -> None:
+        """
+        Store an answer.
+
+        Args:
+            question: User question
+            scope: Scope from make_scope()
+            answer: Agent answer to cache
+            embedding: Question embedding from lookup() (computed here if None)
+        """
+        key = self.make_key(question, scope)
+        entry = CachedResponse(
+            question=question,
+            answer=answer,
+            scope=scope,
+            created_at=time.time(),
+            embedding=embedding if embedding is not None else self._embed(question),
+        )
+        blob = entry.embedding.tobytes() if entry.embedding is not None else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+
+            # Dicts keep insertion order, so the first keys are the oldest
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                del self._entries[oldest]
+                evicted.append((oldest,))
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache "
+                    "(key, question, answer, scope, created_at, embedding) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, question, answer, scope, entry.created_at, blob),
+                )
+                if evicted:
+                    self._conn.executemany("DELETE FROM response_cache WHERE key = ?", evicted)
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached answers."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM response_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection (the in-memory cache stays usable)."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.created_at > self.ttl_seconds
+
+    def _embed(self, text: str) -> np.ndarray | None:
+        """Embed and L2-normalize text (None if no embedder is configured)."""
+        if self.embed_fn is None:
+            return None
+        try:
+            vec = np.asarray(self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Response cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _semantic_lookup(
+        self, question: str, scope: str
+    ) -> tuple[str | None, np.ndarray | None]:
+        with self._lock:
+            candidates = [
+                entry
+                for entry in self._entries.values()
+                if entry.scope == scope and entry.embedding is not None and not self._expired(entry)
+            ]
+        if not candidates:
+            return None, None
+
+        query_vec = self._embed(question)
+        if query_vec is None:
+            return None, None
+
+        # Rows persisted by a different embedder have another dimension; never compare those
+        candidates = [entry for entry in candidates if entry.embedding.shape == query_vec.shape]
+        if not candidates:
+            return None, query_vec
+
+        try:
+            scores = np.stack([entry.embedding for entry in candidates]) @ query_vec
+        except Exception as e:
+            logger.warning(f"Response cache semantic lookup failed, treating as a miss: {e}")
+            return None, query_vec
+        best = int(np.argmax(scores))
+        if scores[best] >= self.similarity_threshold:
+            logger.debug(f"Response cache semantic hit (score={scores[best]:.3f})")
+            return candidates[best].answer, query_vec
+        return None, query_vec
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn: sqlite3.Connection | None = None
+        try:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    question TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    embedding BLOB
+                )
+                """
+            )
+            # Expired rows are never served; drop them instead of loading them
+            conn.execute(
+                "DELETE FROM response_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            conn.commit()
+            rows = conn.execute(
+                "SELECT key, question, answer, scope, created_at, embedding "
+                "FROM response_cache ORDER BY created_at"
+            ).fetchall()
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Response cache {self.path} is unusable, caching in memory only: {e}")
+            if conn is not None:
+                conn.close()
+            return
+
+        self._conn = conn
+        for key, question, answer, scope, created_at, embedding in rows:
+            self._entries[key] = CachedResponse(
+                question=question,
+                answer=answer,
+                scope=scope,
+                created_at=created_at,
+                embedding=np.frombuffer(embedding, dtype=np.float32) if embedding else None,
+            )
+        logger.debug(f"Loaded {len(self._entries)} cached responses from {self.path}")
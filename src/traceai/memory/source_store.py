@@ -0,0 +1,91 @@
+"""Full component source code storage using SQLite.
+
+The vector store only indexes a truncated window of each component's source;
+the complete text lives here and is fetched on demand.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from traceai.logger import logger
+
+
+class SourceStore:
+    """SQLite key-value store of component source code keyed by (doc_id, component_id)."""
+
+    def __init__(self, db_path: Path | str = "./data/sources.sqlite", ephemeral: bool = False):
+        """
+        Initialize source store.
+
+        Args:
+            db_path: Path to SQLite database file
+            ephemeral: If True, use in-memory database (non-persistent)
+        """
+        self.db_path = ":memory:" if ephemeral else str(Path(db_path))
+        if not ephemeral:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS component_sources (
+                doc_id TEXT NOT NULL,
+                component_id TEXT NOT NULL,
+                source_code TEXT NOT NULL,
+                PRIMARY KEY (doc_id, component_id)
+            )
+            """
+        )
+        self._conn.commit()
+        logger.debug(f"Initialized source store at {self.db_path}")
+
+    def put_many(self, sources: Iterable[tuple[str, str, str]]) -> None:
+        """
+        Store component sources, replacing existing entries.
+
+        Args:
+            sources: (doc_id, component_id, source_code) tuples
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO component_sources (doc_id, component_id, source_code) "
+                "VALUES (?, ?, ?)",
+                sources,
+            )
+            self._conn.commit()
+
+    def get(self, doc_id: str, component_id: str) -> str | None:
+        """
+        Get the full source code of a component.
+
+        Args:
+            doc_id: Document ID
+            component_id: Component ID within the document
+
+        Returns:
+            Source code, or None if not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_code FROM component_sources WHERE doc_id = ? AND component_id = ?",
+                (doc_id, component_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def clear(self) -> None:
+        """Remove all stored sources."""
+        with self._lock:
+            self._conn.execute("DELETE FROM component_sources")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM component_sources").fetchone()[0]
@@ -1,18 +1,41 @@
 """Vector memory storage with ChromaDB and Pinecone backends."""
 
+import functools
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from traceai.logger import logger
+from traceai.memory.query_cache import QueryCache
+
+# Vectors per Pinecone upsert request (Pinecone's recommended batch size)
+UPSERT_BATCH_SIZE = 100
+
+# Largest Chroma collection cleared by deleting its ids instead of recreating it
+CLEAR_IN_PLACE_MAX = 10_000
+
+
+@functools.lru_cache(maxsize=4)
+def _get_sentence_transformer(model_name: str, device: str, max_seq_length: int | None = None) -> Any:
+    """Load a SentenceTransformer once per (model, device, length) and share it between stores."""
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device=device)
+    if max_seq_length is not None:
+        model.max_seq_length = max_seq_length
+    return model
 
 
 class VectorMemoryStore(ABC):
     """Abstract base class for vector memory storage."""
 
+    query_cache: QueryCache | None = None
+
     @abstractmethod
     def add(
         self,
@@ -30,6 +53,39 @@ class VectorMemoryStore(ABC):
         """Search vector memory."""
         pass
 
+    def batch_search(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """Search vector memory for several queries; one result list per query, in order."""
+        return [self.search(query, n_results, filter_metadata) for query in queries]
+
+    def _get_cached_results(
+        self, queries: list[str], n_results: int, filter_metadata: dict[str, Any] | None
+    ) -> tuple[list[list[dict[str, Any]] | None], list[int]]:
+        """Look up queries in the query cache; returns results (None if missing) and missing indices."""
+        if self.query_cache is None:
+            return [None] * len(queries), list(range(len(queries)))
+
+        results = [
+            self.query_cache.get(QueryCache.make_key(query, n_results, filter_metadata))
+            for query in queries
+        ]
+        return results, [i for i, result in enumerate(results) if result is None]
+
+    def _cache_results(
+        self,
+        query: str,
+        n_results: int,
+        filter_metadata: dict[str, Any] | None,
+        results: list[dict[str, Any]],
+    ) -> None:
+        """Store a query's results in the query cache, if enabled."""
+        if self.query_cache is not None:
+            self.query_cache.put(QueryCache.make_key(query, n_results, filter_metadata), results)
+
     @abstractmethod
     def clear(self) -> None:
         """Clear all vectors."""
@@ -56,18 +112,45 @@ class ChromaVectorStore(VectorMemoryStore):
         persist_directory: Path | str = "./data/vector_memory",
         collection_name: str = "conversation_memory",
         ephemeral: bool = False,
+        batch_size: int = 256,
+        query_cache_size: int = 256,
+        query_cache_ttl: float = 300.0,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_search: int = 64,
     ):
         """
         Initialize ChromaDB vector store.
 
+        HNSW settings only take effect when the collection is created; an existing
+        collection keeps the parameters it was built with.
+
         Args:
             persist_directory: Directory for persistent storage
             collection_name: Name of the collection
             ephemeral: If True, use in-memory storage (non-persistent)
+            batch_size: Texts embedded and written per collection.add call
+            query_cache_size: Search results kept in the LRU query cache (0 disables it)
+            query_cache_ttl: Seconds before a cached search result expires
+            hnsw_m: HNSW links per node; higher improves recall at the cost of memory
+            hnsw_ef_construction: HNSW candidate list size while building the index;
+                higher builds a better graph more slowly
+            hnsw_ef_search: HNSW candidate list size at query time; higher improves
+                recall at the cost of latency
         """
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
         self.ephemeral = ephemeral
+        self.batch_size = batch_size
+        self.collection_metadata = {
+            "hnsw:space": "cosine",
+            "hnsw:M": hnsw_m,
+            "hnsw:construction_ef": hnsw_ef_construction,
+            "hnsw:search_ef": hnsw_ef_search,
+        }
+        self.query_cache = (
+            QueryCache(query_cache_size, query_cache_ttl) if query_cache_size > 0 else None
+        )
 
         if not ephemeral:
             self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -83,7 +166,7 @@ class ChromaVectorStore(VectorMemoryStore):
         # Get or create collection with default embedding function
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata=self.collection_metadata,
         )
 
         logger.info(
@@ -114,9 +197,20 @@ class ChromaVectorStore(VectorMemoryStore):
 
             ids = [str(uuid.uuid4()) for _ in texts]
 
-        # Add to collection (ChromaDB will auto-embed)
-        self.collection.add(documents=texts, metadatas=metadatas, ids=ids)
+        # Add to collection in fixed-size chunks (ChromaDB will auto-embed), so the
+        # embedder works on bounded batches and large adds stay under Chroma's
+        # per-call limit
+        batch_size = min(self.batch_size, self.client.get_max_batch_size())
+        for start in range(0, len(texts), batch_size):
+            end = start + batch_size
+            self.collection.add(
+                documents=texts[start:end],
+                metadatas=metadatas[start:end] if metadatas else None,
+                ids=ids[start:end],
+            )
 
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
         logger.debug(f"Added {len(texts)} vectors to memory")
 
     def search(
@@ -133,34 +227,77 @@ class ChromaVectorStore(VectorMemoryStore):
         Returns:
             List of result dicts with id, document, metadata, distance
         """
-        where = filter_metadata if filter_metadata else None
+        return self.batch_search([query], n_results, filter_metadata)[0]
 
-        results = self.collection.query(
-            query_texts=[query], n_results=n_results, where=where, include=["documents", "metadatas", "distances"]
-        )
+    def batch_search(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search vector memory for several queries at once.
 
-        # Format results
-        formatted_results = []
-        if results["ids"] and results["ids"][0]:
-            for i, doc_id in enumerate(results["ids"][0]):
-                formatted_results.append(
-                    {
-                        "id": doc_id,
-                        "document": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else None,
-                        "distance": results["distances"][0][i] if results.get("distances") else None,
-                    }
-                )
+        Uncached queries are embedded and searched in a single collection query.
 
-        logger.debug(f"Found {len(formatted_results)} similar vectors for query")
-        return formatted_results
+        Args:
+            queries: Query texts
+            n_results: Number of results to return per query
+            filter_metadata: Optional metadata filter applied to every query
+
+        Returns:
+            One list of result dicts (id, document, metadata, distance) per query, in order
+        """
+        all_results, pending = self._get_cached_results(queries, n_results, filter_metadata)
+        if pending:
+            where = filter_metadata if filter_metadata else None
+
+            results = self.collection.query(
+                query_texts=[queries[i] for i in pending],
+                n_results=n_results,
+                where=where,
+                include=["documents", "metadatas", "distances"],
+            )
+
+            # Format results
+            for row, query_pos in enumerate(pending):
+                formatted_results = []
+                for i, doc_id in enumerate(results["ids"][row] if results["ids"] else []):
+                    formatted_results.append(
+                        {
+                            "id": doc_id,
+                            "document": results["documents"][row][i],
+                            "metadata": results["metadatas"][row][i] if results["metadatas"] else None,
+                            "distance": results["distances"][row][i] if results.get("distances") else None,
+                        }
+                    )
+                all_results[query_pos] = formatted_results
+                self._cache_results(queries[query_pos], n_results, filter_metadata, formatted_results)
+
+        logger.debug(f"Searched {len(queries)} queries ({len(pending)} uncached)")
+        return all_results
 
     def clear(self) -> None:
-        """Clear all vectors from memory."""
-        self.client.delete_collection(self.collection_name)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name, metadata={"hnsw:space": "cosine"}
-        )
+        """Clear all vectors from memory.
+
+        Small collections are emptied in place; dropping and recreating the
+        collection (and its HNSW index files) is only worth it for large ones.
+        """
+        count = self.collection.count()
+        if count == 0:
+            pass
+        elif count <= CLEAR_IN_PLACE_MAX:
+            ids = self.collection.get(include=[])["ids"]
+            batch_size = self.client.get_max_batch_size()
+            for start in range(0, len(ids), batch_size):
+                self.collection.delete(ids=ids[start : start + batch_size])
+        else:
+            self.client.delete_collection(self.collection_name)
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name, metadata=self.collection_metadata
+            )
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
         logger.info("Cleared vector memory")
 
     def get_stats(self) -> dict[str, Any]:
@@ -171,6 +308,7 @@ class ChromaVectorStore(VectorMemoryStore):
             "collection_name": self.collection_name,
             "storage_type": "ephemeral" if self.ephemeral else "persistent",
             "persist_directory": str(self.persist_directory) if not self.ephemeral else "memory",
+            "query_cache": self.query_cache.stats() if self.query_cache is not None else None,
         }
 
 
@@ -192,6 +330,12 @@ class PineconeVectorStore(VectorMemoryStore):
         metric: str = "cosine",
         cloud: str = "aws",
         region: str = "us-east-1",
+        query_cache_size: int = 256,
+        query_cache_ttl: float = 300.0,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        device: str | None = None,
+        quantize: Literal["none", "int8", "round4"] = "none",
+        max_seq_length: int | None = None,
     ):
         """
         Initialize Pinecone vector store.
@@ -203,10 +347,24 @@ class PineconeVectorStore(VectorMemoryStore):
             metric: Distance metric (cosine, euclidean, dotproduct)
             cloud: Cloud provider (aws, gcp, azure)
             region: Cloud region
+            query_cache_size: Search results kept in the LRU query cache (0 disables it)
+            query_cache_ttl: Seconds before a cached search result expires
+            embedding_model: SentenceTransformer model used to embed texts
+            device: Torch device for the embedding model (default: cuda if available, else cpu)
+            quantize: Reduce the precision of upserted vectors to shrink request payloads
+                ("int8" levels, or "round4" for components rounded to four decimals);
+                requires the cosine metric
+            max_seq_length: Token limit for the embedding model (default: the model's own);
+                texts are truncated to it, bounding the batch shapes the encoder runs at
         """
+        if quantize not in ("none", "int8", "round4"):
+            raise ValueError(f"Unknown quantize mode: {quantize}")
+        if quantize != "none" and metric != "cosine":
+            raise ValueError("Quantized vectors require the cosine metric")
+
         try:
+            import sentence_transformers  # noqa: F401
             from pinecone import Pinecone, ServerlessSpec
-            from sentence_transformers import SentenceTransformer
         except ImportError:
             raise ImportError(
                 "Pinecone and sentence-transformers required. Install with: "
@@ -216,6 +374,10 @@ class PineconeVectorStore(VectorMemoryStore):
         self.api_key = api_key
         self.index_name = index_name
         self.dimension = dimension
+        self.quantize = quantize
+        self.query_cache = (
+            QueryCache(query_cache_size, query_cache_ttl) if query_cache_size > 0 else None
+        )
 
         # Initialize Pinecone
         self.pc = Pinecone(api_key=api_key)
@@ -233,8 +395,12 @@ class PineconeVectorStore(VectorMemoryStore):
 
         self.index = self.pc.Index(index_name)
 
-        # Initialize embedding model
-        self.embedder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        # Initialize embedding model (shared by stores with the same model, device and length)
+        if device is None:
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.embedder = _get_sentence_transformer(embedding_model, device, max_seq_length)
 
         logger.info(f"Initialized Pinecone vector store with index '{index_name}'")
 
@@ -261,21 +427,52 @@ class PineconeVectorStore(VectorMemoryStore):
 
             ids = [str(uuid.uuid4()) for _ in texts]
 
-        # Generate embeddings
-        embeddings = self.embedder.encode(texts).tolist()
+        # Generate embeddings as one float32 array; rows are converted to Python
+        # lists only as they are sent, one upsert batch at a time
+        embeddings = self.embedder.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=self.quantize != "none",
+        )
 
-        # Prepare vectors for Pinecone
-        vectors = []
-        for i, (id_, embedding, text) in enumerate(zip(ids, embeddings, texts)):
-            metadata = metadatas[i] if metadatas else {}
-            metadata["text"] = text  # Store text in metadata
-            vectors.append({"id": id_, "values": embedding, "metadata": metadata})
+        for start in range(0, len(texts), UPSERT_BATCH_SIZE):
+            # Prepare vectors for Pinecone
+            vectors = []
+            for i in range(start, min(start + UPSERT_BATCH_SIZE, len(texts))):
+                metadata = metadatas[i] if metadatas else {}
+                metadata["text"] = texts[i]  # Store text in metadata
+                vectors.append({"id": ids[i], "values": self._vector_values(embeddings[i]), "metadata": metadata})
 
-        # Upsert to Pinecone
-        self.index.upsert(vectors=vectors)
+            # Upsert to Pinecone
+            self.index.upsert(vectors=vectors)
 
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
         logger.debug(f"Added {len(texts)} vectors to Pinecone")
 
+    def _vector_values(self, embedding: np.ndarray) -> list[float]:
+        """
+        Convert one unit-normalized embedding to the values sent to Pinecone.
+
+        Pinecone only stores float32 dense vectors, so quantization happens on the
+        wire: int8 levels serialize as short integral floats (cosine similarity
+        ignores the dropped 1/127 scale), and round4 sends each component rounded
+        to four decimals, about the resolution of half precision for unit vectors.
+        Values stay float64 so they serialize as short decimals.
+
+        Args:
+            embedding: Embedding row from the encoder
+
+        Returns:
+            Vector values for an upsert request
+        """
+        if self.quantize == "int8":
+            return np.round(embedding * 127).astype(np.float64).tolist()
+        if self.quantize == "round4":
+            return np.round(embedding.astype(np.float64), 4).tolist()
+        return embedding.tolist()
+
     def search(
         self, query: str, n_results: int = 5, filter_metadata: dict[str, Any] | None = None
     ) -> list[dict[str, Any]]:
@@ -290,32 +487,74 @@ class PineconeVectorStore(VectorMemoryStore):
         Returns:
             List of result dicts with id, document, metadata, distance
         """
-        # Generate query embedding
-        query_embedding = self.embedder.encode([query])[0].tolist()
+        return self.batch_search([query], n_results, filter_metadata)[0]
 
-        # Query Pinecone
-        results = self.index.query(
-            vector=query_embedding, top_k=n_results, filter=filter_metadata, include_metadata=True
-        )
+    def batch_search(
+        self,
+        queries: list[str],
+        n_results: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        max_workers: int = 8,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search Pinecone vector memory for several queries at once.
+
+        Uncached queries are embedded in one batched forward pass; Pinecone takes
+        one vector per query request, so those requests are issued concurrently.
 
-        # Format results
-        formatted_results = []
-        for match in results.matches:
-            formatted_results.append(
-                {
-                    "id": match.id,
-                    "document": match.metadata.get("text", ""),
-                    "metadata": {k: v for k, v in match.metadata.items() if k != "text"},
-                    "distance": match.score,
-                }
+        Args:
+            queries: Query texts
+            n_results: Number of results to return per query
+            filter_metadata: Optional metadata filter applied to every query
+            max_workers: Maximum concurrent Pinecone query requests
+
+        Returns:
+            One list of result dicts (id, document, metadata, distance) per query, in order
+        """
+        all_results, pending = self._get_cached_results(queries, n_results, filter_metadata)
+        if pending:
+            # Generate query embeddings
+            query_embeddings = self.embedder.encode(
+                [queries[i] for i in pending], batch_size=32, convert_to_numpy=True
             )
 
-        logger.debug(f"Found {len(formatted_results)} similar vectors in Pinecone")
-        return formatted_results
+            def query_pinecone(query_embedding: Any) -> Any:
+                return self.index.query(
+                    vector=query_embedding.tolist(),
+                    top_k=n_results,
+                    filter=filter_metadata,
+                    include_metadata=True,
+                )
+
+            # Query Pinecone
+            if len(pending) == 1:
+                responses = [query_pinecone(query_embeddings[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+                    responses = list(executor.map(query_pinecone, query_embeddings))
+
+            # Format results
+            for query_pos, response in zip(pending, responses, strict=True):
+                formatted_results = [
+                    {
+                        "id": match.id,
+                        "document": match.metadata.get("text", ""),
+                        "metadata": {k: v for k, v in match.metadata.items() if k != "text"},
+                        "distance": match.score,
+                    }
+                    for match in response.matches
+                ]
+                all_results[query_pos] = formatted_results
+                self._cache_results(queries[query_pos], n_results, filter_metadata, formatted_results)
+
+        logger.debug(f"Searched {len(queries)} queries in Pinecone ({len(pending)} uncached)")
+        return all_results
 
     def clear(self) -> None:
         """Clear all vectors from Pinecone index."""
         self.index.delete(delete_all=True)
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
         logger.info("Cleared all vectors from Pinecone")
 
     def get_stats(self) -> dict[str, Any]:
@@ -327,4 +566,5 @@ class PineconeVectorStore(VectorMemoryStore):
             "dimension": self.dimension,
             "storage_type": "cloud (Pinecone)",
             "namespaces": list(stats.namespaces.keys()) if stats.namespaces else [],
+            "query_cache": self.query_cache.stats() if self.query_cache is not None else None,
         }
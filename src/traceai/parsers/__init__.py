@@ -4,6 +4,10 @@ This module provides parsers for different document types (SSIS, Excel, Mainfram
 that all implement the BaseParser interface and produce ParsedDocument outputs.
 """
 
+import functools
+import importlib
+from typing import Any
+
 from traceai.parsers.base import (
     BaseParser,
     Component,
@@ -20,17 +24,34 @@ from traceai.parsers.base import (
 from traceai.parsers.ssis_parser import SSISParser, parse_ssis
 from traceai.parsers.cobol_parser import COBOLParser
 from traceai.parsers.jcl_parser import JCLParser
-from traceai.parsers.json_parser import JSONParser
-from traceai.parsers.excel_parser import ExcelParser
-from traceai.parsers.csv_parser import CSVParser
+
+# Parsers imported on first use; Excel and CSV pull in openpyxl and pandas
+_LAZY_PARSERS = {
+    "JSONParser": ("traceai.parsers.json_parser", [".json", ".jsonc"]),
+    "ExcelParser": ("traceai.parsers.excel_parser", [".xlsx", ".xlsm"]),
+    "CSVParser": ("traceai.parsers.csv_parser", [".csv"]),
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Lazily registered parser classes are imported on first access
+    if name in _LAZY_PARSERS:
+        module_name, _ = _LAZY_PARSERS[name]
+        return getattr(importlib.import_module(module_name), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _load_parser(name: str) -> BaseParser:
+    """Import a lazily registered parser and create it."""
+    return __getattr__(name)()
+
 
 # Register parsers
 parser_registry.register(SSISParser())
 parser_registry.register(COBOLParser())
 parser_registry.register(JCLParser())
-parser_registry.register(JSONParser())
-parser_registry.register(ExcelParser())
-parser_registry.register(CSVParser())
+for _name, (_, _extensions) in _LAZY_PARSERS.items():
+    parser_registry.register_lazy(_extensions, functools.partial(_load_parser, _name))
 
 __all__ = [
     # Base classes
@@ -6,12 +6,16 @@ when processing multiple files concurrently.
 
 import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
 import aiofiles
 
+from traceai.logger import logger
 from traceai.parsers.base import ParsedDocument
+from traceai.parsers.parse_cache import ParseCache
 
 
 class AsyncBaseParser(ABC):
@@ -63,7 +67,7 @@ class AsyncBaseParser(ABC):
         """
         # For text files
         if file_path.suffix in ['.json', '.csv', '.jcl', '.cbl', '.CBL', '.sql', '.py']:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+            async with aiofiles.open(file_path, encoding='utf-8') as f:
                 return await f.read()
 
         # For binary files (Excel, etc.)
@@ -90,7 +94,9 @@ class AsyncBaseParser(ABC):
 async def parse_files_concurrently(
     file_paths: list[Path],
     parser_registry: Any,
-    max_concurrent: int = 10
+    max_concurrent: int = 10,
+    executor: Executor | None = None,
+    parse_cache: ParseCache | None = None,
 ) -> list[ParsedDocument]:
     """
     Parse multiple files concurrently using appropriate parsers.
@@ -99,32 +105,109 @@ async def parse_files_concurrently(
         file_paths: List of file paths to parse
         parser_registry: Parser registry to get parsers from
         max_concurrent: Maximum number of concurrent parse operations
+        executor: Executor for sync parsers (default thread pool). Pass a
+            ProcessPoolExecutor to parse CPU-bound formats outside the GIL.
+        parse_cache: Optional ParseCache; unchanged files are loaded from it
+            instead of being parsed again
 
     Returns:
         List of ParsedDocument objects
     """
     semaphore = asyncio.Semaphore(max_concurrent)
-
-    async def parse_with_semaphore(file_path: Path) -> ParsedDocument | None:
-        async with semaphore:
-            parser = parser_registry.get_parser_for_file(file_path)
-            if parser and hasattr(parser, 'parse_async'):
-                try:
-                    return await parser.parse_async(file_path)
-                except Exception as e:
-                    print(f"Error parsing {file_path}: {e}")
-                    return None
-            elif parser:
-                # Fallback to sync parser in executor
-                loop = asyncio.get_event_loop()
-                try:
-                    return await loop.run_in_executor(None, parser.parse, file_path)
-                except Exception as e:
-                    print(f"Error parsing {file_path}: {e}")
-                    return None
-            return None
-
-    tasks = [parse_with_semaphore(fp) for fp in file_paths]
+    tasks = [
+        _parse_with_semaphore(fp, parser_registry, semaphore, executor, parse_cache)
+        for fp in file_paths
+    ]
     results = await asyncio.gather(*tasks)
+    if parse_cache is not None:
+        await asyncio.to_thread(parse_cache.flush)
 
     return [r for r in results if r is not None]
+
+
+async def iter_parsed_files(
+    file_paths: list[Path],
+    parser_registry: Any,
+    max_concurrent: int = 10,
+    executor: Executor | None = None,
+    parse_cache: ParseCache | None = None,
+) -> AsyncIterator[ParsedDocument]:
+    """
+    Parse files concurrently, yielding each document as soon as it is ready.
+
+    Unlike parse_files_concurrently, callers can process and release documents
+    while the remaining files are still being parsed.
+
+    Args:
+        file_paths: List of file paths to parse
+        parser_registry: Parser registry to get parsers from
+        max_concurrent: Maximum number of concurrent parse operations
+        executor: Executor for sync parsers (default thread pool)
+        parse_cache: Optional ParseCache for unchanged files
+
+    Yields:
+        ParsedDocument objects in completion order
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    tasks = [
+        asyncio.ensure_future(
+            _parse_with_semaphore(fp, parser_registry, semaphore, executor, parse_cache)
+        )
+        for fp in file_paths
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result is not None:
+                yield result
+        if parse_cache is not None:
+            await asyncio.to_thread(parse_cache.flush)
+    finally:
+        # Consumer stopped early: don't leave parses running in the background
+        for task in tasks:
+            task.cancel()
+
+
+async def _parse_with_semaphore(
+    file_path: Path,
+    parser_registry: Any,
+    semaphore: asyncio.Semaphore,
+    executor: Executor | None,
+    parse_cache: ParseCache | None = None,
+) -> ParsedDocument | None:
+    # The cache stats, queries and (un)pickles; keep that off the event loop
+    if parse_cache is not None:
+        cached = await asyncio.to_thread(parse_cache.get, file_path)
+        if cached is not None:
+            return cached
+
+    document = await _parse_one(file_path, parser_registry, semaphore, executor)
+    if document is not None and parse_cache is not None:
+        # Committed in batches and once the whole load is done, not per file
+        await asyncio.to_thread(parse_cache.put, file_path, document, commit=False)
+    return document
+
+
+async def _parse_one(
+    file_path: Path,
+    parser_registry: Any,
+    semaphore: asyncio.Semaphore,
+    executor: Executor | None,
+) -> ParsedDocument | None:
+    async with semaphore:
+        parser = parser_registry.get_parser_for_file(file_path)
+        if parser and hasattr(parser, 'parse_async'):
+            try:
+                return await parser.parse_async(file_path)
+            except Exception as e:
+                logger.error(f"Error parsing {file_path}: {e}")
+                return None
+        elif parser:
+            # Fallback to sync parser in executor (a process pool can't use to_thread)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, parser.parse, file_path)
+            except Exception as e:
+                logger.error(f"Error parsing {file_path}: {e}")
+                return None
+        return None
@@ -4,7 +4,11 @@ This module provides the foundation for parsing different document formats
 (SSIS, Excel, Mainframe, JSON, etc.) into a common graph representation.
 """
 
+import os
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -41,7 +45,7 @@ class DocumentMetadata:
     custom_attributes: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Base class for document components (tasks, steps, formulas, etc.)."""
 
@@ -53,7 +57,7 @@ class Component:
     properties: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSource:
     """Base class for data sources (connections, files, datasets, etc.)."""
 
@@ -68,7 +72,7 @@ class DataSource:
     properties: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Parameter:
     """Base class for parameters (variables, named ranges, env vars, etc.)."""
 
@@ -80,7 +84,7 @@ class Parameter:
     properties: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataEntity:
     """Base class for data entities (tables, sheets, datasets, files)."""
 
@@ -93,7 +97,7 @@ class DataEntity:
     properties: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Dependency:
     """Represents a dependency/relationship between components."""
 
@@ -177,6 +181,33 @@ class BaseParser(ABC):
         """
         pass
 
+    def parse_many(
+        self, file_paths: Iterable[Path], max_workers: Optional[int] = None
+    ) -> list[ParsedDocument]:
+        """
+        Parse several files in parallel worker processes.
+
+        Parsing is CPU-bound regex/XML work, so processes scale with cores
+        where threads would serialize on the GIL. Each worker receives a
+        pickled copy of this parser.
+
+        Args:
+            file_paths: Files to parse
+            max_workers: Worker processes (default: CPU count)
+
+        Returns:
+            ParsedDocuments in the same order as file_paths
+        """
+        file_paths = list(file_paths)
+        workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        if workers <= 1:
+            return [self.parse(file_path) for file_path in file_paths]
+
+        # A few chunks per worker keeps IPC overhead low while balancing load
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.parse, file_paths, chunksize=chunksize))
+
     def extract_data_entities(self, component: Component) -> list[DataEntity]:
         """
         Extract data entities (tables, files, etc.) from component source code.
@@ -198,6 +229,9 @@ class ParserRegistry:
     def __init__(self) -> None:
         """Initialize parser registry."""
         self._parsers: dict[DocumentType, BaseParser] = {}
+        self._parsers_by_extension: dict[str, BaseParser] = {}
+        self._lazy_loaders: dict[str, Callable[[], BaseParser]] = {}
+        self._lazy_lock = threading.Lock()
 
     def register(self, parser: BaseParser) -> None:
         """
@@ -208,6 +242,41 @@ class ParserRegistry:
         """
         self._parsers[parser.document_type] = parser
 
+        # Rebuild the extension index; the first registered parser wins a shared extension.
+        # It is swapped in whole so lookups on other threads never see a partial index.
+        by_extension: dict[str, BaseParser] = {}
+        for registered in list(self._parsers.values()):
+            for extension in registered.supported_extensions:
+                by_extension.setdefault(extension, registered)
+        self._parsers_by_extension = by_extension
+
+    def register_lazy(self, extensions: list[str], loader: Callable[[], BaseParser]) -> None:
+        """
+        Register a parser that is only created when first needed.
+
+        Lets parsers with heavy dependencies (pandas, openpyxl) stay unimported
+        until a file they handle is looked up.
+
+        Args:
+            extensions: File extensions the parser handles
+            loader: Zero-argument callable that imports and returns the parser
+        """
+        for extension in extensions:
+            self._lazy_loaders.setdefault(extension, loader)
+
+    def _load_lazy(self, extensions: Iterable[str]) -> None:
+        """Create and register the lazily registered parsers for the given extensions."""
+        with self._lazy_lock:
+            for extension in extensions:
+                loader = self._lazy_loaders.get(extension)
+                if loader is None:
+                    continue  # Loaded by another thread, or shared with a parser loaded earlier
+                parser = loader()
+                self.register(parser)
+                for loaded_extension in parser.supported_extensions:
+                    if self._lazy_loaders.get(loaded_extension) is loader:
+                        del self._lazy_loaders[loaded_extension]
+
     def get_parser(self, document_type: DocumentType) -> BaseParser:
         """
         Get parser for a document type.
@@ -221,6 +290,8 @@ class ParserRegistry:
         Raises:
             ValueError: If no parser registered for type
         """
+        if document_type not in self._parsers and self._lazy_loaders:
+            self._load_lazy(list(self._lazy_loaders))
         if document_type not in self._parsers:
             raise ValueError(f"No parser registered for {document_type}")
         return self._parsers[document_type]
@@ -236,12 +307,9 @@ class ParserRegistry:
             Parser instance
         """
         extension = file_path.suffix.lower()
-
-        for parser in self._parsers.values():
-            if extension in parser.supported_extensions:
-                return parser
-
-        return None
+        if extension not in self._parsers_by_extension and extension in self._lazy_loaders:
+            self._load_lazy([extension])
+        return self._parsers_by_extension.get(extension)
 
     def list_supported_formats(self) -> dict[str, list[str]]:
         """
@@ -250,6 +318,8 @@ class ParserRegistry:
         Returns:
             Dict mapping document type to extensions
         """
+        if self._lazy_loaders:
+            self._load_lazy(list(self._lazy_loaders))
         return {
             parser.document_type.value: parser.supported_extensions
             for parser in self._parsers.values()
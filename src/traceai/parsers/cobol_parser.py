@@ -9,6 +9,8 @@ Parses COBOL programs (.cbl, .cob, .CBL) to extract:
 - Database operations (EXEC SQL)
 """
 
+import mmap
+import os
 import re
 from pathlib import Path
 from typing import Any
@@ -25,6 +27,87 @@ from traceai.parsers.base import (
     ParsedDocument,
 )
 
+# Patterns are compiled once at import instead of on every parse. They are
+# bytes patterns: sources are scanned undecoded and only captured text is decoded.
+_RE_PROGRAM_ID = re.compile(rb"PROGRAM-ID\.\s+([A-Z0-9\-]+)", re.IGNORECASE)
+_RE_AUTHOR = re.compile(rb"AUTHOR\.\s+(.+?)(?:\.|$)", re.IGNORECASE)
+_RE_FILE_CONTROL = re.compile(
+    rb"FILE-CONTROL\.(.*?)(?:WORKING-STORAGE|DATA DIVISION|PROCEDURE DIVISION|$)",
+    re.DOTALL | re.IGNORECASE,
+)
+_RE_SELECT = re.compile(
+    rb"SELECT\s+([A-Z0-9\-]+)\s+ASSIGN\s+TO\s+['\"]?([^'\"\s.]+)", re.IGNORECASE
+)
+_RE_WORKING_STORAGE = re.compile(
+    rb"WORKING-STORAGE SECTION\.(.*?)(?:PROCEDURE DIVISION|$)", re.DOTALL | re.IGNORECASE
+)
+# WORKING-STORAGE entries in one alternation: every 01-level entry (a group record
+# when rname matches, otherwise an elementary item), or a field with a PIC clause
+_RE_DATA_ITEM = re.compile(
+    rb"^\s*(?:(?P<record>01)\s+(?:(?P<rname>[A-Z0-9\-]+)\.?\s*$)?"
+    rb"|(?P<level>\d+)\s+(?P<fname>[A-Z0-9\-]+)\s+PIC\s+(?P<pic>[X9V\(\)]+))",
+    re.MULTILINE | re.IGNORECASE,
+)
+_RE_PROCEDURE_DIVISION = re.compile(rb"PROCEDURE DIVISION\.(.*?)$", re.DOTALL | re.IGNORECASE)
+# Paragraphs are identifiers followed by period at start of line
+_RE_PARAGRAPH = re.compile(rb"^\s*([A-Z][A-Z0-9\-]*)\.\s*$", re.MULTILINE | re.IGNORECASE)
+# Paragraph operations (PERFORM, CALL, READ, WRITE, EXEC SQL) in one alternation,
+# so each paragraph body is scanned once; lastgroup names the operation matched
+_RE_OPERATION = re.compile(
+    rb"PERFORM\s+(?P<PERFORM>[A-Z0-9\-]+)"
+    rb"|CALL\s+['\"](?P<CALL>[^'\"]+)['\"]"
+    rb"|READ\s+(?P<READ>[A-Z0-9\-]+)"
+    rb"|WRITE\s+(?P<WRITE>[A-Z0-9\-]+)"
+    rb"|EXEC\s+SQL\s+(?P<SQL>.*?)\s+END-EXEC",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_RE_NON_SPACE = re.compile(rb"\S")
+
+# Sources at least this large are memory-mapped rather than read into memory;
+# mapping trades some scan speed for not holding a copy of the whole file
+MMAP_THRESHOLD_BYTES = 16 << 20
+
+# Characters of each paragraph kept as Component.source_code
+SOURCE_SNIPPET_CHARS = 500
+
+# Dependency produced by each operation kind:
+# (to_id prefix, dependency type, description template, target must be a local paragraph)
+_DEP_SPECS = {
+    "PERFORM": ("para_", "PERFORMS", "{src} performs {dst}", True),
+    "CALL": ("prog_", "CALLS", "{src} calls external program {dst}", False),
+    "READ": ("file_", "READS_FROM", "{src} reads from {dst}", False),
+    "WRITE": ("file_", "WRITES_TO", "{src} writes to {dst}", False),
+}
+
+
+def _text(value: bytes) -> str:
+    """Decode captured source text, dropping undecodable bytes."""
+    return value.decode("utf-8", errors="ignore")
+
+
+def _snippet(source: bytes, start: int, end: int, limit: int = SOURCE_SNIPPET_CHARS) -> bytes:
+    """
+    Return ``source[start:end].strip()[:limit]`` without copying the whole span.
+
+    Args:
+        source: Buffer holding the span
+        start: Start offset of the span
+        end: End offset of the span
+        limit: Maximum snippet length
+
+    Returns:
+        The first ``limit`` bytes of the stripped span
+    """
+    first = _RE_NON_SPACE.search(source, start, end)
+    if first is None:
+        return b""
+    start = first.start()
+    # A non-space byte at or past the limit means the cut is not in trailing whitespace
+    if _RE_NON_SPACE.search(source, start + limit - 1, end):
+        return source[start : start + limit]
+    return source[start:end].rstrip()
+
 
 class COBOLParser(BaseParser):
     """Parser for COBOL programs."""
@@ -63,21 +146,32 @@ class COBOLParser(BaseParser):
         """
         logger.info(f"Parsing COBOL program: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-
-        # Extract program ID
-        program_id = self._extract_program_id(content)
-
-        # Extract author for metadata
-        author = self._extract_author(content)
-
-        # Parse divisions
-        data_division = self._parse_data_division(content)
-        procedure_division = self._parse_procedure_division(content)
-
-        # Extract dependencies (PERFORM, CALL)
-        dependencies = self._extract_dependencies(content, procedure_division)
+        # Large files are mapped instead of read: the bytes patterns scan the
+        # mapping directly and only captured text is copied out. Small files are
+        # cheaper to read than to map.
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and size >= MMAP_THRESHOLD_BYTES:
+                content: bytes | mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                content = f.read()
+
+        try:
+            # Extract program ID
+            program_id = self._extract_program_id(content)
+
+            # Extract author for metadata
+            author = self._extract_author(content)
+
+            # Parse divisions
+            data_division = self._parse_data_division(content)
+            procedure_division = self._parse_procedure_division(content)
+
+            # Extract dependencies (PERFORM, CALL)
+            dependencies = self._extract_dependencies(content, procedure_division)
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
 
         # Build metadata
         metadata = DocumentMetadata(
@@ -107,17 +201,17 @@ class COBOLParser(BaseParser):
             dependencies=dependencies,
         )
 
-    def _extract_program_id(self, content: str) -> str | None:
+    def _extract_program_id(self, content: bytes | mmap.mmap) -> str | None:
         """Extract PROGRAM-ID from IDENTIFICATION DIVISION."""
-        match = re.search(r"PROGRAM-ID\.\s+([A-Z0-9\-]+)", content, re.IGNORECASE)
-        return match.group(1) if match else None
+        match = _RE_PROGRAM_ID.search(content)
+        return _text(match.group(1)) if match else None
 
-    def _extract_author(self, content: str) -> str | None:
+    def _extract_author(self, content: bytes | mmap.mmap) -> str | None:
         """Extract AUTHOR from IDENTIFICATION DIVISION."""
-        match = re.search(r"AUTHOR\.\s+(.+?)(?:\.|$)", content, re.IGNORECASE)
-        return match.group(1).strip() if match else None
+        match = _RE_AUTHOR.search(content)
+        return _text(match.group(1)).strip() if match else None
 
-    def _parse_data_division(self, content: str) -> dict[str, Any]:
+    def _parse_data_division(self, content: bytes | mmap.mmap) -> dict[str, Any]:
         """
         Parse DATA DIVISION to extract files and data items.
 
@@ -128,23 +222,13 @@ class COBOLParser(BaseParser):
         data_items = []
 
         # Extract FILE-CONTROL section (files)
-        file_control_match = re.search(
-            r"FILE-CONTROL\.(.*?)(?:WORKING-STORAGE|DATA DIVISION|PROCEDURE DIVISION|$)",
-            content,
-            re.DOTALL | re.IGNORECASE,
-        )
+        file_control_match = _RE_FILE_CONTROL.search(content)
 
         if file_control_match:
-            file_section = file_control_match.group(1)
-
             # Find SELECT statements
-            for select_match in re.finditer(
-                r"SELECT\s+([A-Z0-9\-]+)\s+ASSIGN\s+TO\s+['\"]?([^'\"\s.]+)",
-                file_section,
-                re.IGNORECASE,
-            ):
-                file_name = select_match.group(1)
-                file_path = select_match.group(2)
+            for select_match in _RE_SELECT.finditer(content, *file_control_match.span(1)):
+                file_name = _text(select_match.group(1))
+                file_path = _text(select_match.group(2))
 
                 files.append(
                     DataSource(
@@ -157,53 +241,44 @@ class COBOLParser(BaseParser):
                 )
 
         # Extract WORKING-STORAGE section (data items)
-        ws_match = re.search(
-            r"WORKING-STORAGE SECTION\.(.*?)(?:PROCEDURE DIVISION|$)",
-            content,
-            re.DOTALL | re.IGNORECASE,
-        )
+        ws_match = _RE_WORKING_STORAGE.search(content)
 
         if ws_match:
-            ws_section = ws_match.group(1)
-
-            # Find 01-level data items (records)
-            for record_match in re.finditer(
-                r"^\s*01\s+([A-Z0-9\-]+)\.?\s*$", ws_section, re.MULTILINE | re.IGNORECASE
-            ):
-                record_name = record_match.group(1)
-
-                # Extract fields (05, 10, 15 levels) following this record
-                record_pos = record_match.end()
-                next_01 = re.search(r"^\s*01\s+", ws_section[record_pos:], re.MULTILINE)
-                record_end = record_pos + next_01.start() if next_01 else len(ws_section)
-
-                record_content = ws_section[record_pos:record_end]
-
-                # Find all field definitions
-                fields = []
-                for field_match in re.finditer(
-                    r"^\s*(\d+)\s+([A-Z0-9\-]+)\s+PIC\s+([X9V\(\)]+)",
-                    record_content,
-                    re.MULTILINE | re.IGNORECASE,
-                ):
-                    level = field_match.group(1)
-                    field_name = field_match.group(2)
-                    pic_clause = field_match.group(3)
-                    fields.append({"level": level, "name": field_name, "type": pic_clause})
+            # Single pass over the section; each 01-level entry closes the current
+            # record, and only group items (no PIC clause) open a new one
+            records: list[tuple[str, list[tuple[str, str, str]]]] = []
+            fields: list[tuple[str, str, str]] | None = None
+            for item in _RE_DATA_ITEM.finditer(content, *ws_match.span(1)):
+                if item.group("record"):
+                    if item.group("rname"):
+                        fields = []
+                        records.append((_text(item.group("rname")), fields))
+                    else:
+                        fields = None
+                elif fields is not None:
+                    # (level, name, PIC clause); tuples are far smaller than per-field dicts
+                    fields.append(
+                        (
+                            _text(item.group("level")),
+                            _text(item.group("fname")),
+                            _text(item.group("pic")),
+                        )
+                    )
 
+            for record_name, fields in records:
                 data_items.append(
                     DataEntity(
                         name=record_name,
                         entity_type="RECORD",
                         description=f"COBOL data record with {len(fields)} fields",
-                        columns=[f["name"] for f in fields] if fields else [],
-                        properties={"fields": fields} if fields else {},
+                        columns=[name for _, name, _ in fields],
+                        properties={"fields": tuple(fields)} if fields else {},
                     )
                 )
 
         return {"files": files, "data_items": data_items}
 
-    def _parse_procedure_division(self, content: str) -> list[Component]:
+    def _parse_procedure_division(self, content: bytes | mmap.mmap) -> list[Component]:
         """
         Parse PROCEDURE DIVISION to extract paragraphs and sections.
 
@@ -213,58 +288,36 @@ class COBOLParser(BaseParser):
         components = []
 
         # Find PROCEDURE DIVISION
-        proc_match = re.search(
-            r"PROCEDURE DIVISION\.(.*?)$", content, re.DOTALL | re.IGNORECASE
-        )
+        proc_match = _RE_PROCEDURE_DIVISION.search(content)
 
         if not proc_match:
             return components
 
-        proc_section = proc_match.group(1)
+        proc_start, proc_end = proc_match.span(1)
 
         # Find all paragraphs (labels at start of line followed by .)
-        # Paragraphs are identifiers followed by period at start of line
-        paragraph_pattern = r"^\s*([A-Z][A-Z0-9\-]*)\.\s*$"
-
-        matches = list(re.finditer(paragraph_pattern, proc_section, re.MULTILINE | re.IGNORECASE))
+        matches = list(_RE_PARAGRAPH.finditer(content, proc_start, proc_end))
 
         for i, match in enumerate(matches):
-            para_name = match.group(1)
+            para_name = _text(match.group(1))
 
             # Skip if this looks like a COBOL keyword
             if para_name.upper() in ["STOP", "EXIT", "GOBACK"]:
                 continue
 
-            # Get paragraph content (from this match to next paragraph or end)
+            # Paragraph span (from this match to next paragraph or end); scanned in place
+            # rather than sliced, so only the source_code snippet is copied
             start_pos = match.end()
-            end_pos = matches[i + 1].start() if i + 1 < len(matches) else len(proc_section)
-            para_content = proc_section[start_pos:end_pos]
+            end_pos = matches[i + 1].start() if i + 1 < len(matches) else proc_end
 
-            # Extract operations performed
+            # Extract operations performed, in source order, as (kind, target) tuples
             operations = []
-
-            # PERFORM statements
-            for perf in re.finditer(r"PERFORM\s+([A-Z0-9\-]+)", para_content, re.IGNORECASE):
-                operations.append(f"PERFORM {perf.group(1)}")
-
-            # CALL statements
-            for call in re.finditer(r"CALL\s+['\"]([^'\"]+)['\"]", para_content, re.IGNORECASE):
-                operations.append(f"CALL {call.group(1)}")
-
-            # READ statements
-            for read in re.finditer(r"READ\s+([A-Z0-9\-]+)", para_content, re.IGNORECASE):
-                operations.append(f"READ {read.group(1)}")
-
-            # WRITE statements
-            for write in re.finditer(r"WRITE\s+([A-Z0-9\-]+)", para_content, re.IGNORECASE):
-                operations.append(f"WRITE {write.group(1)}")
-
-            # EXEC SQL (database operations)
-            for sql in re.finditer(
-                r"EXEC\s+SQL\s+(.*?)\s+END-EXEC", para_content, re.IGNORECASE | re.DOTALL
-            ):
-                sql_stmt = sql.group(1).strip()[:50]  # First 50 chars
-                operations.append(f"SQL: {sql_stmt}")
+            for op in _RE_OPERATION.finditer(content, start_pos, end_pos):
+                kind = op.lastgroup
+                if kind == "SQL":
+                    operations.append((kind, _text(op.group(kind).strip()[:50])))  # First 50 chars
+                else:
+                    operations.append((kind, _text(op.group(kind))))
 
             components.append(
                 Component(
@@ -272,7 +325,7 @@ class COBOLParser(BaseParser):
                     name=para_name,
                     component_type="COBOL_PARAGRAPH",
                     description=f"COBOL paragraph with {len(operations)} operations",
-                    source_code=para_content.strip()[:500],  # First 500 chars
+                    source_code=_text(_snippet(content, start_pos, end_pos)),
                     properties={"operations": operations} if operations else None,
                 )
             )
@@ -280,7 +333,7 @@ class COBOLParser(BaseParser):
         return components
 
     def _extract_dependencies(
-        self, content: str, components: list[Component]
+        self, content: bytes | mmap.mmap, components: list[Component]
     ) -> list[Dependency]:
         """
         Extract dependencies between paragraphs and external programs.
@@ -300,53 +353,21 @@ class COBOLParser(BaseParser):
             if not component.properties or "operations" not in component.properties:
                 continue
 
-            for operation in component.properties["operations"]:
-                # PERFORM dependencies (internal)
-                if operation.startswith("PERFORM "):
-                    target = operation.split()[1]
-                    if target in component_names:
-                        dependencies.append(
-                            Dependency(
-                                from_id=component.component_id,
-                                to_id=f"para_{target}",
-                                dependency_type="PERFORMS",
-                                description=f"{component.name} performs {target}",
-                            )
-                        )
-
-                # CALL dependencies (external)
-                elif operation.startswith("CALL "):
-                    target = operation.split()[1]
-                    dependencies.append(
-                        Dependency(
-                            from_id=component.component_id,
-                            to_id=f"prog_{target}",
-                            dependency_type="CALLS",
-                            description=f"{component.name} calls external program {target}",
-                        )
-                    )
-
-                # READ/WRITE dependencies (file I/O)
-                elif operation.startswith("READ "):
-                    file_name = operation.split()[1]
-                    dependencies.append(
-                        Dependency(
-                            from_id=component.component_id,
-                            to_id=f"file_{file_name}",
-                            dependency_type="READS_FROM",
-                            description=f"{component.name} reads from {file_name}",
-                        )
-                    )
-
-                elif operation.startswith("WRITE "):
-                    file_name = operation.split()[1]
-                    dependencies.append(
-                        Dependency(
-                            from_id=component.component_id,
-                            to_id=f"file_{file_name}",
-                            dependency_type="WRITES_TO",
-                            description=f"{component.name} writes to {file_name}",
-                        )
+            for kind, target in component.properties["operations"]:
+                spec = _DEP_SPECS.get(kind)
+                if spec is None:
+                    continue  # SQL statements have no dependency target
+
+                prefix, dependency_type, template, need_internal = spec
+                if need_internal and target not in component_names:
+                    continue
+                dependencies.append(
+                    Dependency(
+                        from_id=component.component_id,
+                        to_id=prefix + target,
+                        dependency_type=dependency_type,
+                        description=template.format(src=component.name, dst=target),
                     )
+                )
 
         return dependencies
@@ -7,11 +7,15 @@ Parses CSV files that contain:
 - ETL metadata
 """
 
+import importlib.util
+import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 
+from traceai.logger import logger
 from traceai.parsers.base import (
     BaseParser,
     Component,
@@ -28,6 +32,24 @@ from traceai.parsers.base import (
 class CSVParser(BaseParser):
     """Parser for CSV files containing ETL metadata."""
 
+    # Rows read per chunk, bounding the DataFrame held while parsing large files
+    CHUNK_ROWS = 50_000
+
+    def __init__(self, fast: bool | None = None):
+        """
+        Initialize CSV parser.
+
+        Args:
+            fast: Read files with pandas' multi-threaded pyarrow engine when pyarrow
+                is installed (default: the TRACEAI_FAST_CSV env var)
+        """
+        if fast is None:
+            fast = os.getenv("TRACEAI_FAST_CSV", "").lower() in ("1", "true", "yes")
+        if fast and importlib.util.find_spec("pyarrow") is None:
+            logger.debug("TRACEAI_FAST_CSV is set but pyarrow is not installed; using the C engine")
+            fast = False
+        self.fast = fast
+
     @property
     def supported_extensions(self) -> list[str]:
         """Returns list of supported file extensions."""
@@ -42,7 +64,15 @@ class CSVParser(BaseParser):
         """Validates if the file is a valid CSV."""
         try:
             separator = "\t" if file_path.suffix == ".tsv" else ","
-            pd.read_csv(file_path, sep=separator, nrows=1)
+            if self.fast:
+                from pyarrow import csv as pa_csv
+
+                # Reads only the first block instead of building a DataFrame
+                pa_csv.open_csv(
+                    file_path, parse_options=pa_csv.ParseOptions(delimiter=separator)
+                ).read_next_batch()
+            else:
+                pd.read_csv(file_path, sep=separator, nrows=1)
             return True
         except Exception:
             return False
@@ -57,33 +87,58 @@ class CSVParser(BaseParser):
         4. Generic CSV (each row becomes a component)
         """
         separator = "\t" if file_path.suffix == ".tsv" else ","
-        df = pd.read_csv(file_path, sep=separator)
-
-        # Extract metadata
-        metadata = self._extract_metadata(file_path, df)
+        doc_id = f"csv_{file_path.stem}"
 
-        # Detect CSV type based on columns
         components: list[Component] = []
         dependencies: list[Dependency] = []
         data_entities: list[DataEntity] = []
+        seen_entities: set[str] = set()
 
-        columns_lower = [col.lower() for col in df.columns]
-
-        if self._is_lineage_mapping(columns_lower):
-            # Parse as lineage mapping
-            result = self._parse_lineage_mapping(df, metadata.document_id)
-            dependencies.extend(result["dependencies"])
-            data_entities.extend(result["entities"])
-        elif self._is_field_mapping(columns_lower):
-            # Parse as field mapping
-            result = self._parse_field_mapping(df, metadata.document_id)
-            components.extend(result["components"])
-        elif self._is_etl_metadata(columns_lower):
-            # Parse as ETL metadata
-            components.extend(self._parse_etl_metadata(df, metadata.document_id))
+        # Detect CSV type from a header-only read
+        columns = list(pd.read_csv(file_path, sep=separator, nrows=0).columns)
+        columns_by_lower = self._columns_by_lower(columns)
+        columns_lower = list(columns_by_lower)
+        is_lineage = self._is_lineage_mapping(columns_lower)
+        is_field = self._is_field_mapping(columns_lower)
+        is_etl = self._is_etl_metadata(columns_lower)
+
+        # Lineage mappings only use their endpoint and transformation columns: read
+        # just those, as plain strings, skipping type inference for the rest
+        usecols = None
+        dtype = None
+        if is_lineage:
+            usecols = [col for col in self._lineage_columns(columns_by_lower) if col] or columns[:1]
+            dtype = str
+
+        row_count = 0
+        if self.fast and not (is_lineage or is_field or is_etl):
+            # Generic rows need no column operations: go straight from Arrow to records
+            components, row_count = self._parse_generic_arrow(file_path, separator, doc_id)
+            chunks: Iterable[pd.DataFrame] = ()
         else:
-            # Generic CSV - each row is a component
-            components.extend(self._parse_generic(df, metadata.document_id))
+            chunks = self._read_chunks(file_path, separator, usecols, dtype)
+
+        for df in chunks:
+            row_count += len(df)
+
+            if is_lineage:
+                # Parse as lineage mapping
+                result = self._parse_lineage_mapping(df, doc_id, seen_entities)
+                dependencies.extend(result["dependencies"])
+                data_entities.extend(result["entities"])
+            elif is_field:
+                # Parse as field mapping
+                result = self._parse_field_mapping(df, doc_id)
+                components.extend(result["components"])
+            elif is_etl:
+                # Parse as ETL metadata
+                components.extend(self._parse_etl_metadata(df, doc_id))
+            else:
+                # Generic CSV - each row is a component
+                components.extend(self._parse_generic(df, doc_id))
+
+        # Extract metadata
+        metadata = self._extract_metadata(file_path, doc_id, row_count, columns)
 
         return ParsedDocument(
             metadata=metadata,
@@ -94,18 +149,40 @@ class CSVParser(BaseParser):
             dependencies=dependencies,
         )
 
-    def _extract_metadata(self, file_path: Path, df: pd.DataFrame) -> DocumentMetadata:
+    def _read_chunks(
+        self,
+        file_path: Path,
+        separator: str,
+        usecols: list[str] | None = None,
+        dtype: Any = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Reads a CSV file as DataFrames of at most CHUNK_ROWS rows.
+
+        The pyarrow engine cannot read in chunks, so fast mode yields the whole file.
+        Chunks keep the file's running row index. At least one (possibly empty)
+        DataFrame is always yielded.
+        """
+        options: dict[str, Any] = {"sep": separator, "usecols": usecols, "dtype": dtype}
+        if self.fast:
+            yield pd.read_csv(file_path, engine="pyarrow", **options)
+        else:
+            with pd.read_csv(file_path, chunksize=self.CHUNK_ROWS, **options) as reader:
+                yield from reader
+
+    def _extract_metadata(
+        self, file_path: Path, doc_id: str, row_count: int, columns: list[str]
+    ) -> DocumentMetadata:
         """Extracts metadata from CSV file."""
         return DocumentMetadata(
             name=file_path.stem,
-            document_id=f"csv_{file_path.stem}",
+            document_id=doc_id,
             document_type=self.document_type,
-            description=f"CSV file with {len(df)} rows",
+            description=f"CSV file with {row_count} rows",
             file_path=file_path,
             custom_attributes={
-                "row_count": len(df),
-                "column_count": len(df.columns),
-                "columns": list(df.columns),
+                "row_count": row_count,
+                "column_count": len(columns),
+                "columns": columns,
             },
         )
 
@@ -124,57 +201,64 @@ class CSVParser(BaseParser):
         etl_keywords = {"job_name", "etl_name", "pipeline", "schedule", "description"}
         return any(kw in col for col in columns for kw in etl_keywords)
 
-    def _parse_lineage_mapping(self, df: pd.DataFrame, doc_id: str) -> dict[str, Any]:
-        """Parses lineage mapping CSV."""
-        dependencies: list[Dependency] = []
-        entities: list[DataEntity] = []
-        seen_entities: set[str] = set()
+    def _parse_lineage_mapping(
+        self, df: pd.DataFrame, doc_id: str, seen_entities: set[str] | None = None
+    ) -> dict[str, Any]:
+        """Parses lineage mapping CSV.
 
+        Args:
+            df: Rows to parse
+            doc_id: Document ID
+            seen_entities: Entity names already emitted for earlier chunks of the
+                same file; updated in place
+        """
         # Find source and target columns
-        source_col = self._find_column(df, ["source_table", "source", "from_table"])
-        target_col = self._find_column(df, ["target_table", "target", "to_table"])
-        transform_col = self._find_column(df, ["transformation", "transform", "logic"])
+        source_col, target_col, transform_col = self._lineage_columns(
+            self._columns_by_lower(df.columns)
+        )
 
         if not source_col or not target_col:
             return {"dependencies": [], "entities": []}
 
-        for idx, row in df.iterrows():
-            source = row[source_col]
-            target = row[target_col]
-
-            if pd.notna(source) and pd.notna(target):
-                source_str = str(source)
-                target_str = str(target)
-
-                # Create entities
-                if source_str not in seen_entities:
-                    entities.append(
-                        DataEntity(
-                            name=source_str,
-                            entity_type="table",
-                        )
-                    )
-                    seen_entities.add(source_str)
-
-                if target_str not in seen_entities:
-                    entities.append(
-                        DataEntity(
-                            name=target_str,
-                            entity_type="table",
-                        )
-                    )
-                    seen_entities.add(target_str)
-
-                # Create dependency
-                transform = row[transform_col] if transform_col and pd.notna(row[transform_col]) else None
-                dependencies.append(
-                    Dependency(
-                        from_id=source_str,
-                        to_id=target_str,
-                        dependency_type="data_flow",
-                        properties={"transformation": str(transform)} if transform else {},
-                    )
-                )
+        # Drop incomplete rows and stringify the endpoints column-wise
+        mask = df[source_col].notna() & df[target_col].notna()
+        pairs = df.loc[mask, [source_col, target_col]].astype(str).to_numpy()
+
+        # Entities in first-seen order: the row-major ravel interleaves each
+        # row's source and target
+        if seen_entities is None:
+            seen_entities = set()
+        entities = []
+        for name in pd.unique(pairs.ravel()):
+            if name not in seen_entities:
+                seen_entities.add(name)
+                entities.append(DataEntity(name=name, entity_type="table"))
+
+        # Without a transformation column every dependency is a bare edge, so
+        # skip the per-row transformation check entirely
+        if not transform_col:
+            dependencies = [
+                Dependency(from_id=source, to_id=target, dependency_type="data_flow")
+                for source, target in pairs.tolist()
+            ]
+            return {"dependencies": dependencies, "entities": entities}
+
+        transform = df.loc[mask, transform_col]
+        present = (transform.notna() & (transform != "")).tolist()
+        transforms = [
+            text if keep else None
+            for text, keep in zip(transform.astype(str).tolist(), present, strict=True)
+        ]
+
+        dependencies = [
+            Dependency(
+                from_id=source,
+                to_id=target,
+                dependency_type="data_flow",
+                properties={"transformation": transform} if transform else {},
+            )
+            for (source, target), transform in zip(pairs.tolist(), transforms, strict=True)
+        ]
 
         return {"dependencies": dependencies, "entities": entities}
 
@@ -182,27 +266,43 @@ class CSVParser(BaseParser):
         """Parses field mapping CSV."""
         components: list[Component] = []
 
-        source_col = self._find_column(df, ["source_field", "source_column", "source"])
-        target_col = self._find_column(df, ["target_field", "target_column", "target"])
-        logic_col = self._find_column(df, ["mapping_logic", "transformation", "logic"])
+        columns_by_lower = self._columns_by_lower(df.columns)
+        source_col = self._find_column(
+            columns_by_lower, ["source_field", "source_column", "source"]
+        )
+        target_col = self._find_column(
+            columns_by_lower, ["target_field", "target_column", "target"]
+        )
+        logic_col = self._find_column(
+            columns_by_lower, ["mapping_logic", "transformation", "logic"]
+        )
 
         if not source_col or not target_col:
             return {"components": []}
 
-        for idx, row in df.iterrows():
-            source = row[source_col]
-            target = row[target_col]
-
-            if pd.notna(source) and pd.notna(target):
-                component = Component(
-                    name=f"{source} -> {target}",
-                    component_id=f"{doc_id}_mapping_{idx}",
-                    component_type="field_mapping",
-                    description=f"Maps {source} to {target}",
-                    source_code=str(row[logic_col]) if logic_col and pd.notna(row[logic_col]) else None,
-                    properties=row.to_dict(),
-                )
-                components.append(component)
+        # NaN checks are done column-wise up front; rows are zipped straight into
+        # property dicts, which is faster than df.to_dict(orient="records")
+        columns = list(df.columns)
+        source_pos = df.columns.get_loc(source_col)
+        target_pos = df.columns.get_loc(target_col)
+        logic_pos = df.columns.get_loc(logic_col) if logic_col else None
+        rows = df[df[source_col].notna() & df[target_col].notna()]
+        has_logic = rows[logic_col].notna().tolist() if logic_col else [False] * len(rows)
+
+        for (idx, *row), logic_present in zip(
+            rows.itertuples(index=True, name=None), has_logic, strict=True
+        ):
+            source = row[source_pos]
+            target = row[target_pos]
+            component = Component(
+                name=f"{source} -> {target}",
+                component_id=f"{doc_id}_mapping_{idx}",
+                component_type="field_mapping",
+                description=f"Maps {source} to {target}",
+                source_code=str(row[logic_pos]) if logic_present else None,
+                properties=dict(zip(columns, row, strict=True)),
+            )
+            components.append(component)
 
         return {"components": components}
 
@@ -210,24 +310,30 @@ class CSVParser(BaseParser):
         """Parses ETL metadata CSV."""
         components: list[Component] = []
 
-        name_col = self._find_column(df, ["job_name", "etl_name", "name", "pipeline"])
-        desc_col = self._find_column(df, ["description", "desc"])
+        columns_by_lower = self._columns_by_lower(df.columns)
+        name_col = self._find_column(columns_by_lower, ["job_name", "etl_name", "name", "pipeline"])
+        desc_col = self._find_column(columns_by_lower, ["description", "desc"])
 
         if not name_col:
             return []
 
-        for idx, row in df.iterrows():
-            name = row[name_col]
+        columns = list(df.columns)
+        name_pos = df.columns.get_loc(name_col)
+        desc_pos = df.columns.get_loc(desc_col) if desc_col else None
+        rows = df[df[name_col].notna()]
+        has_desc = rows[desc_col].notna().tolist() if desc_col else [False] * len(rows)
 
-            if pd.notna(name):
-                component = Component(
-                    name=str(name),
-                    component_id=f"{doc_id}_etl_{idx}",
-                    component_type="etl_job",
-                    description=str(row[desc_col]) if desc_col and pd.notna(row[desc_col]) else None,
-                    properties=row.to_dict(),
-                )
-                components.append(component)
+        for (idx, *row), desc_present in zip(
+            rows.itertuples(index=True, name=None), has_desc, strict=True
+        ):
+            component = Component(
+                name=str(row[name_pos]),
+                component_id=f"{doc_id}_etl_{idx}",
+                component_type="etl_job",
+                description=str(row[desc_pos]) if desc_present else None,
+                properties=dict(zip(columns, row, strict=True)),
+            )
+            components.append(component)
 
         return components
 
@@ -236,29 +342,106 @@ class CSVParser(BaseParser):
         components: list[Component] = []
 
         # Use first column as name if available
-        name_col = df.columns[0] if len(df.columns) > 0 else None
+        columns = list(df.columns)
+        has_name = df.iloc[:, 0].notna().tolist() if columns else [False] * len(df)
 
-        for idx, row in df.iterrows():
-            name = str(row[name_col]) if name_col and pd.notna(row[name_col]) else f"Row{idx}"
+        for (idx, *row), name_present in zip(
+            df.itertuples(index=True, name=None), has_name, strict=True
+        ):
+            name = str(row[0]) if name_present else f"Row{idx}"
 
             component = Component(
                 name=name,
                 component_id=f"{doc_id}_row_{idx}",
                 component_type="csv_row",
                 description=f"CSV row {idx}",
-                properties=row.to_dict(),
+                properties=dict(zip(columns, row, strict=True)),
             )
             components.append(component)
 
         return components
 
-    def _find_column(self, df: pd.DataFrame, candidates: list[str]) -> str | None:
-        """Finds a column matching one of the candidate names (case-insensitive)."""
-        columns_lower = {col.lower(): col for col in df.columns}
+    def _parse_generic_arrow(
+        self, file_path: Path, separator: str, doc_id: str
+    ) -> tuple[list[Component], int]:
+        """Parses a generic CSV with pyarrow directly, skipping the DataFrame.
+
+        Properties match the pandas path except that whole-number columns stay ints
+        and missing cells are None rather than NaN.
 
+        Args:
+            file_path: CSV file to read
+            separator: Field delimiter
+            doc_id: Document ID
+
+        Returns:
+            Tuple of (components, row count)
+        """
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+
+        parse_options = pa_csv.ParseOptions(delimiter=separator)
+        # Empty cells are missing values, as with pandas
+        table = pa_csv.read_csv(
+            file_path,
+            parse_options=parse_options,
+            convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+        )
+        # pandas keeps dates as the strings in the file; re-read those columns as text
+        temporal = {
+            field.name: pa.string() for field in table.schema if pa.types.is_temporal(field.type)
+        }
+        if temporal:
+            table = pa_csv.read_csv(
+                file_path,
+                parse_options=parse_options,
+                convert_options=pa_csv.ConvertOptions(
+                    strings_can_be_null=True, column_types=temporal
+                ),
+            )
+        columns = table.column_names
+        first_column = columns[0] if columns else None
+
+        components: list[Component] = []
+        for idx, record in enumerate(table.to_pylist()):
+            first = record.get(first_column) if first_column is not None else None
+            components.append(
+                Component(
+                    name=str(first) if first is not None else f"Row{idx}",
+                    component_id=f"{doc_id}_row_{idx}",
+                    component_type="csv_row",
+                    description=f"CSV row {idx}",
+                    properties=record,
+                )
+            )
+
+        return components, table.num_rows
+
+    def _lineage_columns(
+        self, columns_by_lower: dict[str, str]
+    ) -> tuple[str | None, str | None, str | None]:
+        """Finds the source, target and transformation columns of a lineage mapping."""
+        return (
+            self._find_column(columns_by_lower, ["source_table", "source", "from_table"]),
+            self._find_column(columns_by_lower, ["target_table", "target", "to_table"]),
+            self._find_column(columns_by_lower, ["transformation", "transform", "logic"]),
+        )
+
+    @staticmethod
+    def _columns_by_lower(columns: Iterable[str]) -> dict[str, str]:
+        """Maps lowercased column names to the original names."""
+        return {col.lower(): col for col in columns}
+
+    def _find_column(self, columns_by_lower: dict[str, str], candidates: list[str]) -> str | None:
+        """Finds a column matching one of the lowercase candidate names (case-insensitive).
+
+        Args:
+            columns_by_lower: Lowercased column name -> column name, from _columns_by_lower
+            candidates: Lowercase names to try, in order of preference
+        """
         for candidate in candidates:
-            if candidate.lower() in columns_lower:
-                return columns_lower[candidate.lower()]
+            if candidate in columns_by_lower:
+                return columns_by_lower[candidate]
 
         return None
 
@@ -0,0 +1,142 @@
+"""On-disk cache of parsed documents keyed by file path, mtime and size.
+
+Re-loading a directory only re-parses files that changed since the last run.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+
+from traceai.logger import logger
+from traceai.parsers.base import ParsedDocument
+
+# Bump whenever parser output or the ParsedDocument dataclasses change shape;
+# a cache written under another version is dropped when it is opened
+PARSE_CACHE_VERSION = 1
+
+
+class ParseCache:
+    """SQLite-backed cache of ParsedDocument objects.
+
+    An entry is valid while the file's modification time and size are unchanged
+    and it was written under the current PARSE_CACHE_VERSION.
+    """
+
+    def __init__(self, db_path: Path | str, batch_size: int = 64):
+        """
+        Initialize the parse cache.
+
+        Args:
+            db_path: Path to SQLite database file
+            batch_size: Uncommitted puts (commit=False) that trigger a commit
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # WAL turns each commit into an append, so fsync per checkpoint is enough
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != PARSE_CACHE_VERSION:
+            # Entries pickled by other parser versions may be stale or unreadable
+            self._conn.execute("DROP TABLE IF EXISTS parsed_documents")
+            self._conn.execute(f"PRAGMA user_version = {PARSE_CACHE_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parsed_documents (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                document BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, file_path: Path | str) -> ParsedDocument | None:
+        """
+        Look up the cached parse of a file.
+
+        Args:
+            file_path: File that would be parsed
+
+        Returns:
+            Cached ParsedDocument, or None if missing or the file changed
+        """
+        path = os.fspath(file_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document FROM parsed_documents WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache entry for {path}: {e}")
+            return None
+
+    def put(self, file_path: Path | str, document: ParsedDocument, commit: bool = True) -> None:
+        """
+        Store the parse of a file.
+
+        Args:
+            file_path: File that was parsed
+            document: Parser output for the file
+            commit: Commit now; otherwise the write is committed with the next
+                batch, flush() or close()
+        """
+        path = os.fspath(file_path)
+        try:
+            stat = os.stat(path)
+            blob = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Not caching parse of {path}: {e}")
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed_documents (path, mtime_ns, size, document) "
+                "VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, blob),
+            )
+            self._uncommitted += 1
+            if commit or self._uncommitted >= self.batch_size:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def flush(self) -> None:
+        """Commit writes stored with commit=False."""
+        with self._lock:
+            if self._uncommitted:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def clear(self) -> None:
+        """Remove all cached parses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM parsed_documents")
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connection."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parsed_documents").fetchone()[0]
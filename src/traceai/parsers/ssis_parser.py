@@ -5,6 +5,7 @@ ParsedDocument format for multi-format compatibility.
 """
 
 import re
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +24,45 @@ from traceai.parsers.base import (
     ParsedDocument,
 )
 
+# Bytes read from the start of a file when checking for the DTS namespace
+VALIDATE_HEAD_BYTES = 2048
+
+# Table references in SQL: FROM/JOIN/INTO/UPDATE/MERGE [INTO]/TRUNCATE TABLE
+# followed by a (schema.)table name, matched in one scan
+_TABLE_RE = re.compile(
+    r"(?:FROM|JOIN|INTO|UPDATE|MERGE(?:\s+INTO)?|TRUNCATE\s+TABLE)\s+([a-zA-Z_][\w\.]*)",
+    re.IGNORECASE,
+)
+
+# Connection string keys (case-insensitive) naming the server and the database
+_CONN_STRING_KEYS = {
+    "data source": "server",
+    "server": "server",
+    "initial catalog": "database",
+    "database": "database",
+}
+
+# DTS:PrecedenceConstraint Value codes other than 1 (success)
+_CONSTRAINT_CONDITIONS = {"2": "failure", "3": "completion"}
+
+# lxml parsers are neither thread-safe nor picklable, so each thread keeps its own
+# at module level rather than on the (shared, process-pool pickled) parser instance
+_XML_PARSERS = threading.local()
+
+
+def _xml_parser() -> etree.XMLParser:
+    """Returns this thread's lxml parser, creating it on first use.
+
+    DTSX files can embed large binary blobs, hence huge_tree; nothing looks
+    elements up by xml:id.
+    """
+    parser = getattr(_XML_PARSERS, "parser", None)
+    if parser is None:
+        parser = _XML_PARSERS.parser = etree.XMLParser(
+            remove_blank_text=True, collect_ids=False, huge_tree=True
+        )
+    return parser
+
 
 # DTSX XML Namespaces
 class DTSXNamespaces:
@@ -49,6 +89,28 @@ class DTSXNamespaces:
         }
 
 
+class DTSXAttributes:
+    """Namespaced DTS attribute names, built once rather than per element."""
+
+    _PREFIX = DTSXNamespaces.get_prefix(DTSXNamespaces.DTS)
+
+    OBJECT_NAME = f"{_PREFIX}ObjectName"
+    DTSID = f"{_PREFIX}DTSID"
+    DESCRIPTION = f"{_PREFIX}Description"
+    CREATOR_NAME = f"{_PREFIX}CreatorName"
+    CREATION_DATE = f"{_PREFIX}CreationDate"
+    VERSION_MAJOR = f"{_PREFIX}VersionMajor"
+    VERSION_MINOR = f"{_PREFIX}VersionMinor"
+    CREATION_NAME = f"{_PREFIX}CreationName"
+    NAMESPACE = f"{_PREFIX}Namespace"
+    DATA_TYPE = f"{_PREFIX}DataType"
+    EXECUTABLE_TYPE = f"{_PREFIX}ExecutableType"
+    FROM = f"{_PREFIX}From"
+    TO = f"{_PREFIX}To"
+    VALUE = f"{_PREFIX}Value"
+    EXPRESSION = f"{_PREFIX}Expression"
+
+
 class SSISParser(BaseParser):
     """Parser for SSIS DTSX files implementing the BaseParser interface."""
 
@@ -56,6 +118,15 @@ class SSISParser(BaseParser):
         """Initialize parser."""
         self.nsmap = DTSXNamespaces.get_nsmap()
         self.dts_prefix = DTSXNamespaces.get_prefix(DTSXNamespaces.DTS)
+        self._connection_managers_tag = f"{self.dts_prefix}ConnectionManagers"
+        self._connection_manager_tag = f"{self.dts_prefix}ConnectionManager"
+        self._variable_tag = f"{self.dts_prefix}Variable"
+        self._variable_value_tag = f"{self.dts_prefix}VariableValue"
+        self._executable_tag = f"{self.dts_prefix}Executable"
+        self._precedence_constraint_tag = f"{self.dts_prefix}PrecedenceConstraint"
+        sql_task_prefix = DTSXNamespaces.get_prefix(DTSXNamespaces.SQL_TASK)
+        self._sql_task_data_tag = f"{sql_task_prefix}SqlTaskData"
+        self._sql_statement_source_attr = f"{sql_task_prefix}SqlStatementSource"
 
     @property
     def supported_extensions(self) -> list[str]:
@@ -84,18 +155,15 @@ class SSISParser(BaseParser):
             return False
 
         try:
-            # Try to parse as XML and check for SSIS namespace
-            tree = etree.parse(str(file_path))
-            root = tree.getroot()
-
-            # Check if it has DTS namespace
-            if DTSXNamespaces.DTS in str(etree.tostring(root)[:500]):
-                return True
-
-            return False
-        except (etree.ParseError, OSError):
+            # The DTS namespace is declared on the root element, so sniffing the
+            # head of the file is enough; no XML parse is needed
+            with open(file_path, "rb") as f:
+                head = f.read(VALIDATE_HEAD_BYTES)
+        except OSError:
             return False
 
+        return DTSXNamespaces.DTS.encode() in head
+
     def parse(self, file_path: Path) -> ParsedDocument:
         """
         Parse a DTSX file into a ParsedDocument.
@@ -116,23 +184,28 @@ class SSISParser(BaseParser):
         logger.info(f"Parsing SSIS package: {file_path}")
 
         try:
-            tree = etree.parse(str(file_path))
+            tree = etree.parse(str(file_path), _xml_parser())
             root = tree.getroot()
 
             # Extract metadata
             metadata = self._extract_metadata(root, file_path)
 
+            # Collect the elements of interest in a single walk of the tree
+            elements = self._collect_elements(root)
+
             # Extract connections
-            data_sources = self._extract_connections(root)
+            data_sources = self._extract_connections(root, elements[self._connection_manager_tag])
 
             # Extract variables
-            parameters = self._extract_variables(root)
+            parameters = self._extract_variables(elements[self._variable_tag])
 
             # Extract tasks (components)
-            components = self._extract_tasks(root)
+            components = self._extract_tasks(
+                root, elements[self._executable_tag], elements[self._sql_task_data_tag]
+            )
 
             # Extract precedence constraints (dependencies)
-            dependencies = self._extract_precedence_constraints(root)
+            dependencies = self._extract_precedence_constraints(elements[self._precedence_constraint_tag])
 
             # Extract data entities (tables) from SQL statements
             data_entities = self._extract_data_entities_from_components(components)
@@ -161,18 +234,36 @@ class SSISParser(BaseParser):
             logger.error(f"Failed to parse DTSX file {file_path}: {e}")
             raise ValueError(f"Invalid DTSX XML format: {e}")
 
+    def _collect_elements(self, root: etree._Element) -> dict[str, list[etree._Element]]:
+        """Groups the elements the extractors need by tag, in document order.
+
+        One root.iter() pass replaces a separate descendant search per element
+        kind; the root itself is included when its tag matches.
+        """
+        tags = (
+            self._connection_manager_tag,
+            self._variable_tag,
+            self._executable_tag,
+            self._precedence_constraint_tag,
+            self._sql_task_data_tag,
+        )
+        elements: dict[str, list[etree._Element]] = {tag: [] for tag in tags}
+        for elem in root.iter(*tags):
+            elements[elem.tag].append(elem)
+        return elements
+
     def _extract_metadata(self, root: etree._Element, file_path: Path) -> DocumentMetadata:
         """Extract package-level metadata."""
         package_elem = root
 
-        name = package_elem.get(f"{self.dts_prefix}ObjectName", file_path.stem)
-        package_id = package_elem.get(f"{self.dts_prefix}DTSID", "")
-        description = package_elem.get(f"{self.dts_prefix}Description")
-        creator = package_elem.get(f"{self.dts_prefix}CreatorName")
-        created_date = package_elem.get(f"{self.dts_prefix}CreationDate")
+        name = package_elem.get(DTSXAttributes.OBJECT_NAME, file_path.stem)
+        package_id = package_elem.get(DTSXAttributes.DTSID, "")
+        description = package_elem.get(DTSXAttributes.DESCRIPTION)
+        creator = package_elem.get(DTSXAttributes.CREATOR_NAME)
+        created_date = package_elem.get(DTSXAttributes.CREATION_DATE)
 
-        version_major_str = package_elem.get(f"{self.dts_prefix}VersionMajor")
-        version_minor_str = package_elem.get(f"{self.dts_prefix}VersionMinor")
+        version_major_str = package_elem.get(DTSXAttributes.VERSION_MAJOR)
+        version_minor_str = package_elem.get(DTSXAttributes.VERSION_MINOR)
 
         version = None
         if version_major_str and version_minor_str:
@@ -189,18 +280,29 @@ class SSISParser(BaseParser):
             file_path=file_path,
         )
 
-    def _extract_connections(self, root: etree._Element) -> list[DataSource]:
-        """Extract connection managers as data sources."""
-        data_sources = []
+    def _extract_connections(
+        self, root: etree._Element, conn_elements: list[etree._Element]
+    ) -> list[DataSource]:
+        """Extract the package's connection managers as data sources.
 
-        # Find all DTS:ConnectionManager elements
-        conn_elements = root.xpath("./DTS:ConnectionManagers/DTS:ConnectionManager", namespaces=self.nsmap)
+        Args:
+            root: Package root element
+            conn_elements: All DTS:ConnectionManager elements in the package
+        """
+        data_sources = []
 
         for conn_elem in conn_elements:
-            name = conn_elem.get(f"{self.dts_prefix}ObjectName", "")
-            conn_id = conn_elem.get(f"{self.dts_prefix}DTSID", "")
-            conn_type = conn_elem.get(f"{self.dts_prefix}CreationName", "")
-            description = conn_elem.get(f"{self.dts_prefix}Description")
+            # Only DTS:ConnectionManagers/DTS:ConnectionManager directly under the root
+            container = conn_elem.getparent()
+            if container is None or container.tag != self._connection_managers_tag:
+                continue
+            if container.getparent() is not root:
+                continue
+
+            name = conn_elem.get(DTSXAttributes.OBJECT_NAME, "")
+            conn_id = conn_elem.get(DTSXAttributes.DTSID, "")
+            conn_type = conn_elem.get(DTSXAttributes.CREATION_NAME, "")
+            description = conn_elem.get(DTSXAttributes.DESCRIPTION)
 
             # Extract connection string from DTS:ObjectData
             conn_string = None
@@ -220,13 +322,13 @@ class SSISParser(BaseParser):
 
                 # Try to parse server and database from connection string
                 if conn_string:
-                    if "Data Source=" in conn_string or "Server=" in conn_string:
-                        parts = conn_string.split(";")
-                        for part in parts:
-                            if part.strip().startswith("Data Source=") or part.strip().startswith("Server="):
-                                server = part.split("=", 1)[1].strip()
-                            elif part.strip().startswith("Initial Catalog=") or part.strip().startswith("Database="):
-                                database = part.split("=", 1)[1].strip()
+                    for part in conn_string.split(";"):
+                        key, _, value = part.partition("=")
+                        field = _CONN_STRING_KEYS.get(key.strip().lower())
+                        if field == "server":
+                            server = value.strip()
+                        elif field == "database":
+                            database = value.strip()
 
             data_sources.append(
                 DataSource(
@@ -242,126 +344,106 @@ class SSISParser(BaseParser):
 
         return data_sources
 
-    def _extract_variables(self, root: etree._Element) -> list[Parameter]:
+    def _extract_variables(self, var_elements: list[etree._Element]) -> list[Parameter]:
         """Extract package variables as parameters."""
-        parameters = []
-
-        # Find all DTS:Variable elements using namespace-aware XPath
-        var_elements = root.xpath(".//DTS:Variable", namespaces=self.nsmap)
-
-        for var_elem in var_elements:
-            name = var_elem.get(f"{self.dts_prefix}ObjectName", "")
-            namespace = var_elem.get(f"{self.dts_prefix}Namespace", "User")
-            data_type = var_elem.get(f"{self.dts_prefix}DataType", "")
-            description = var_elem.get(f"{self.dts_prefix}Description")
-
-            # Extract variable value from DTS:VariableValue
-            value = None
-            var_value_elem = var_elem.find(f"{self.dts_prefix}VariableValue", namespaces=self.nsmap)
-            if var_value_elem is not None:
-                value = var_value_elem.text
-
-            parameters.append(
-                Parameter(
-                    name=name,
-                    namespace=namespace,
-                    data_type=data_type,
-                    value=value,
-                    description=description,
-                )
-            )
-
-        return parameters
-
-    def _extract_tasks(self, root: etree._Element) -> list[Component]:
-        """Extract executable tasks as components."""
-        components = []
-
-        # Find all DTS:Executable elements using namespace-aware XPath
-        exec_elements = root.xpath(".//DTS:Executable", namespaces=self.nsmap)
-
-        for exec_elem in exec_elements:
-            name = exec_elem.get(f"{self.dts_prefix}ObjectName", "")
-            task_id = exec_elem.get(f"{self.dts_prefix}DTSID", "")
-            task_type = exec_elem.get(f"{self.dts_prefix}ExecutableType", "")
-            description = exec_elem.get(f"{self.dts_prefix}Description")
-
-            # Extract SQL statement for SQL tasks
-            sql_statement = None
-            sql_task_data_list = exec_elem.xpath(
-                ".//SQLTask:SqlTaskData",
-                namespaces=self.nsmap,
-            )
-            if sql_task_data_list:
-                sql_task_data = sql_task_data_list[0]
-                sql_statement = (
-                    sql_task_data.get(f"{DTSXNamespaces.get_prefix(DTSXNamespaces.SQL_TASK)}SqlStatementSource")
-                    or sql_task_data.get("SqlStatementSource")
-                )
+        return [self._build_parameter(var_elem) for var_elem in var_elements]
+
+    def _build_parameter(self, var_elem: etree._Element) -> Parameter:
+        """Build a parameter from a DTS:Variable element."""
+        # Extract variable value from DTS:VariableValue
+        value = None
+        var_value_elem = var_elem.find(self._variable_value_tag)
+        if var_value_elem is not None:
+            value = var_value_elem.text
+
+        return Parameter(
+            name=var_elem.get(DTSXAttributes.OBJECT_NAME, ""),
+            namespace=var_elem.get(DTSXAttributes.NAMESPACE, "User"),
+            data_type=var_elem.get(DTSXAttributes.DATA_TYPE, ""),
+            value=value,
+            description=var_elem.get(DTSXAttributes.DESCRIPTION),
+        )
 
-            # Store additional properties
-            properties: dict[str, Any] = {}
-            if task_type:
-                properties["task_type"] = task_type
+    def _extract_tasks(
+        self,
+        root: etree._Element,
+        exec_elements: list[etree._Element],
+        sql_task_data_elements: list[etree._Element],
+    ) -> list[Component]:
+        """Extract executable tasks as components.
 
-            components.append(
-                Component(
-                    name=name,
-                    component_id=task_id,
-                    component_type=task_type or "Unknown",
-                    description=description,
-                    source_code=sql_statement,
-                    properties=properties,
-                )
+        Args:
+            root: Package root element, which is not itself a task
+            exec_elements: All DTS:Executable elements, in document order
+            sql_task_data_elements: All SQLTask:SqlTaskData elements, in document order
+        """
+        # Each executable takes the SQL of the first SqlTaskData below it, so
+        # containers pick up the statement of their first SQL task. Once an
+        # ancestor has a statement, so do all of its own ancestors.
+        sql_statements: dict[etree._Element, str | None] = {}
+        for sql_task_data in sql_task_data_elements:
+            statement = sql_task_data.get(self._sql_statement_source_attr) or sql_task_data.get(
+                "SqlStatementSource"
             )
+            for ancestor in sql_task_data.iterancestors(self._executable_tag):
+                if ancestor in sql_statements:
+                    break
+                sql_statements[ancestor] = statement
+
+        return [
+            self._build_component(exec_elem, sql_statements.get(exec_elem))
+            for exec_elem in exec_elements
+            if exec_elem is not root
+        ]
 
-        return components
+    def _build_component(self, exec_elem: etree._Element, sql_statement: str | None) -> Component:
+        """Build a component from a DTS:Executable element and its SQL statement."""
+        task_type = exec_elem.get(DTSXAttributes.EXECUTABLE_TYPE, "")
+
+        # Store additional properties
+        properties: dict[str, Any] = {}
+        if task_type:
+            properties["task_type"] = task_type
+
+        return Component(
+            name=exec_elem.get(DTSXAttributes.OBJECT_NAME, ""),
+            component_id=exec_elem.get(DTSXAttributes.DTSID, ""),
+            component_type=task_type or "Unknown",
+            description=exec_elem.get(DTSXAttributes.DESCRIPTION),
+            source_code=sql_statement,
+            properties=properties,
+        )
 
-    def _extract_precedence_constraints(self, root: etree._Element) -> list[Dependency]:
+    def _extract_precedence_constraints(self, pc_elements: list[etree._Element]) -> list[Dependency]:
         """Extract precedence constraints as dependencies."""
-        dependencies = []
-
-        # Find all DTS:PrecedenceConstraint elements using namespace-aware XPath
-        pc_elements = root.xpath(".//DTS:PrecedenceConstraint", namespaces=self.nsmap)
-
-        for pc_elem in pc_elements:
-            from_task = pc_elem.get(f"{self.dts_prefix}From", "")
-            to_task = pc_elem.get(f"{self.dts_prefix}To", "")
-            value = pc_elem.get(f"{self.dts_prefix}Value", "")
-            expression = pc_elem.get(f"{self.dts_prefix}Expression")
-
-            # Map constraint type
-            condition = "success"  # Default
-            if value == "1":
-                condition = "success"
-            elif value == "2":
-                condition = "failure"
-            elif value == "3":
-                condition = "completion"
-
-            dependencies.append(
-                Dependency(
-                    from_id=from_task,
-                    to_id=to_task,
-                    dependency_type="executes_before",
-                    condition=condition,
-                    expression=expression,
-                )
-            )
-
-        return dependencies
+        return [self._build_dependency(pc_elem) for pc_elem in pc_elements]
+
+    def _build_dependency(self, pc_elem: etree._Element) -> Dependency:
+        """Build a dependency from a DTS:PrecedenceConstraint element."""
+        # Map constraint type; anything other than failure/completion is success
+        value = pc_elem.get(DTSXAttributes.VALUE, "")
+        condition = _CONSTRAINT_CONDITIONS.get(value, "success")
+
+        return Dependency(
+            from_id=pc_elem.get(DTSXAttributes.FROM, ""),
+            to_id=pc_elem.get(DTSXAttributes.TO, ""),
+            dependency_type="executes_before",
+            condition=condition,
+            expression=pc_elem.get(DTSXAttributes.EXPRESSION),
+        )
 
     def _extract_data_entities_from_components(self, components: list[Component]) -> list[DataEntity]:
         """Extract data entities (tables) from all components."""
         all_entities = []
-        seen_tables = set()
+        seen_tables: set[tuple[str | None, str | None, str]] = set()
 
         for component in components:
             entities = self.extract_data_entities(component)
             for entity in entities:
-                # Avoid duplicates
-                if entity.name not in seen_tables:
-                    seen_tables.add(entity.name)
+                # Avoid duplicates; the same table name in two schemas or databases is two tables
+                key = (entity.database_name, entity.schema_name, entity.name)
+                if key not in seen_tables:
+                    seen_tables.add(key)
                     all_entities.append(entity)
 
         return all_entities
@@ -374,44 +456,43 @@ class SSISParser(BaseParser):
             component: Component to analyze
 
         Returns:
-            List of extracted data entities
+            List of extracted data entities, one per distinct (database, schema, table)
         """
         if not component.source_code:
             return []
 
         entities = []
+        seen: set[tuple[str | None, str | None, str]] = set()
         sql = component.source_code
 
-        # SQL table extraction patterns
-        patterns = [
-            r"FROM\s+([a-zA-Z_][\w\.]*)",  # FROM table
-            r"JOIN\s+([a-zA-Z_][\w\.]*)",  # JOIN table
-            r"INTO\s+([a-zA-Z_][\w\.]*)",  # INSERT INTO table
-            r"UPDATE\s+([a-zA-Z_][\w\.]*)",  # UPDATE table
-            r"MERGE\s+([a-zA-Z_][\w\.]*)",  # MERGE INTO table (target)
-            r"TRUNCATE\s+TABLE\s+([a-zA-Z_][\w\.]*)",  # TRUNCATE TABLE
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, sql, re.IGNORECASE)
-            for match in matches:
-                table_name = match.strip()
-
-                # Parse schema.table if present
-                schema_name = None
-                if "." in table_name:
-                    parts = table_name.split(".")
-                    schema_name = parts[0]
-                    table_name = parts[1]
-
-                entities.append(
-                    DataEntity(
-                        name=table_name,
-                        entity_type="table",
-                        schema_name=schema_name,
-                        description=f"Extracted from {component.name}",
-                    )
+        # One scan over the SQL for all table-reference keywords
+        for match in _TABLE_RE.finditer(sql):
+            table_name = match.group(1)
+
+            # Parse [database.]schema.table if present
+            database_name = None
+            schema_name = None
+            if "." in table_name:
+                parts = table_name.rsplit(".", 2)
+                if len(parts) == 3:
+                    database_name, schema_name, table_name = parts
+                else:
+                    schema_name, table_name = parts
+
+            key = (database_name, schema_name, table_name)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            entities.append(
+                DataEntity(
+                    name=table_name,
+                    entity_type="table",
+                    schema_name=schema_name,
+                    database_name=database_name,
+                    description=f"Extracted from {component.name}",
                 )
+            )
 
         return entities
 
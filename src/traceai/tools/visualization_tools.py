@@ -1,6 +1,7 @@
 """Tools for generating graph visualizations (SVG, PNG, PDF)."""
 
 import io
+import threading
 from pathlib import Path
 from typing import Any, Literal
 
@@ -15,6 +16,9 @@ from pydantic import BaseModel, Field
 from traceai.graph.schema import EdgeType, NodeType
 from traceai.logger import logger
 
+# pyplot keeps global figure state, so concurrent tool calls must not interleave
+_PLOT_LOCK = threading.Lock()
+
 
 class GraphVisualizationInput(BaseModel):
     """Input schema for graph visualization tool."""
@@ -102,16 +106,17 @@ Returns the file path to the generated visualization."""
                     out_path = vis_dir / filename
 
                 # Generate visualization
-                _create_visualization(
-                    viz_graph,
-                    out_path,
-                    title=title,
-                    layout=layout,
-                    show_labels=show_labels,
-                    show_edge_labels=show_edge_labels,
-                    node_size=node_size,
-                    font_size=font_size,
-                )
+                with _PLOT_LOCK:
+                    _create_visualization(
+                        viz_graph,
+                        out_path,
+                        title=title,
+                        layout=layout,
+                        show_labels=show_labels,
+                        show_edge_labels=show_edge_labels,
+                        node_size=node_size,
+                        font_size=font_size,
+                    )
 
                 logger.info(f"Generated {output_format.upper()} visualization: {out_path}")
 
@@ -2,14 +2,16 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from traceai.parsers import parser_registry
+from traceai.parsers import DocumentType, ParserRegistry, cobol_parser, parse_cache, parser_registry
 from traceai.parsers.json_parser import JSONParser
 from traceai.parsers.csv_parser import CSVParser
 from traceai.parsers.excel_parser import ExcelParser
 from traceai.parsers.cobol_parser import COBOLParser
 from traceai.parsers.jcl_parser import JCLParser
+from traceai.parsers.parse_cache import ParseCache
 
 
 @pytest.fixture
@@ -128,6 +130,55 @@ class TestCSVParser:
         # Should have dependencies or data entities
         assert len(parsed.dependencies) + len(parsed.data_entities) > 0
 
+    def test_fast_engine_matches_default(self, sample_csv_file):
+        """Test the pyarrow engine produces the same lineage as the default engine."""
+        pytest.importorskip("pyarrow")
+        if not sample_csv_file.exists():
+            pytest.skip(f"Sample file not found: {sample_csv_file}")
+
+        fast_parser = CSVParser(fast=True)
+        parsed = fast_parser.parse(sample_csv_file)
+        expected = CSVParser(fast=False).parse(sample_csv_file)
+
+        assert fast_parser.validate(sample_csv_file)
+        assert parsed.dependencies == expected.dependencies
+        assert parsed.data_entities == expected.data_entities
+
+    def test_generic_rows_keep_column_types(self, tmp_path):
+        """Test row values keep their column's type instead of being upcast per row."""
+        source = tmp_path / "numbers.csv"
+        source.write_text("id,score\n1,0.5\n2,1.5\n")
+
+        parsed = CSVParser().parse(source)
+
+        assert [c.name for c in parsed.components] == ["1", "2"]
+        assert parsed.components[0].properties == {"id": 1, "score": 0.5}
+        assert isinstance(parsed.components[0].properties["id"], (int, np.integer))
+
+    def test_fast_engine_generic_rows(self, tmp_path):
+        """Test the pyarrow engine builds generic rows like the default engine."""
+        pytest.importorskip("pyarrow")
+        source = tmp_path / "inventory.csv"
+        source.write_text(
+            "item,qty,note,received\nbolt,10,steel,2024-01-01\n,4,,\nnut,7,brass,2024-02-15\n"
+        )
+
+        parsed = CSVParser(fast=True).parse(source)
+        expected = CSVParser(fast=False).parse(source)
+
+        assert [c.name for c in parsed.components] == [c.name for c in expected.components]
+        assert [c.name for c in parsed.components] == ["bolt", "Row1", "nut"]
+        assert parsed.components[2].properties == {
+            "item": "nut",
+            "qty": 7,
+            "note": "brass",
+            "received": "2024-02-15",
+        }
+        assert parsed.components[0].properties["received"] == "2024-01-01"
+        assert expected.components[0].properties["received"] == "2024-01-01"
+        assert parsed.components[1].properties["received"] is None
+        assert parsed.metadata.custom_attributes == expected.metadata.custom_attributes
+
 
 class TestExcelParser:
     """Test Excel parser functionality."""
@@ -206,6 +257,99 @@ class TestCOBOLParser:
         # Should have some structure
         assert len(parsed.components) + len(parsed.data_sources) > 0
 
+    def test_parse_many_matches_parse(self, sample_cobol_file):
+        """Test parallel parsing returns the same documents in input order."""
+        if not sample_cobol_file.exists():
+            pytest.skip(f"Sample file not found: {sample_cobol_file}")
+
+        parser = COBOLParser()
+        files = sorted(sample_cobol_file.parent.glob("*.cbl"))[:6]
+
+        parsed = parser.parse_many(files, max_workers=2)
+
+        assert [doc.metadata.file_path for doc in parsed] == files
+        assert [doc.components for doc in parsed] == [parser.parse(f).components for f in files]
+
+    def test_parse_memory_mapped_source(self, sample_cobol_file, monkeypatch):
+        """Test memory-mapped sources parse the same as sources read into memory."""
+        if not sample_cobol_file.exists():
+            pytest.skip(f"Sample file not found: {sample_cobol_file}")
+
+        parser = COBOLParser()
+        expected = parser.parse(sample_cobol_file)
+
+        monkeypatch.setattr(cobol_parser, "MMAP_THRESHOLD_BYTES", 0)
+        parsed = parser.parse(sample_cobol_file)
+
+        assert parsed.components == expected.components
+        assert parsed.data_entities == expected.data_entities
+        assert parsed.dependencies == expected.dependencies
+
+    def test_cobol_records_and_fields(self, tmp_path):
+        """Test each 01-level record gets only the fields up to the next 01 entry."""
+        source = tmp_path / "RECS.cbl"
+        source.write_text(
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. RECS.\n"
+            "       DATA DIVISION.\n"
+            "       WORKING-STORAGE SECTION.\n"
+            "       01  CUSTOMER-REC.\n"
+            "           05  CUST-ID      PIC 9(5).\n"
+            "           05  CUST-NAME    PIC X(30).\n"
+            "       01  WS-FLAG          PIC X.\n"
+            "           05  NOT-A-FIELD  PIC X.\n"
+            "\n"
+            "       01  ORDER-REC.\n"
+            "           05  ORDER-ID     PIC 9(7).\n"
+            "       PROCEDURE DIVISION.\n"
+            "       MAIN-PARA.\n"
+            "           STOP RUN.\n"
+        )
+
+        parsed = COBOLParser().parse(source)
+
+        records = {entity.name: entity.columns for entity in parsed.data_entities}
+        assert records == {
+            "CUSTOMER-REC": ["CUST-ID", "CUST-NAME"],
+            "ORDER-REC": ["ORDER-ID"],
+        }
+        fields = parsed.data_entities[0].properties["fields"]
+        assert [(level, name) for level, name, _ in fields] == [("05", "CUST-ID"), ("05", "CUST-NAME")]
+
+    def test_cobol_operations_and_dependencies(self, tmp_path):
+        """Test paragraph operations are (kind, target) pairs that drive dependencies."""
+        source = tmp_path / "OPS.cbl"
+        source.write_text(
+            "       IDENTIFICATION DIVISION.\n"
+            "       PROGRAM-ID. OPS.\n"
+            "       PROCEDURE DIVISION.\n"
+            "       MAIN-PARA.\n"
+            "           PERFORM LOAD-PARA\n"
+            "           PERFORM MISSING-PARA\n"
+            "           CALL 'SUBPROG'\n"
+            "           EXEC SQL SELECT 1 FROM DUAL END-EXEC\n"
+            "           STOP RUN.\n"
+            "       LOAD-PARA.\n"
+            "           READ IN-FILE\n"
+            "           WRITE OUT-REC.\n"
+        )
+
+        parsed = COBOLParser().parse(source)
+
+        main = next(c for c in parsed.components if c.name == "MAIN-PARA")
+        assert main.properties["operations"] == [
+            ("PERFORM", "LOAD-PARA"),
+            ("PERFORM", "MISSING-PARA"),
+            ("CALL", "SUBPROG"),
+            ("SQL", "SELECT 1 FROM DUAL"),
+        ]
+        assert [(d.from_id, d.to_id, d.dependency_type) for d in parsed.dependencies] == [
+            ("para_MAIN-PARA", "para_LOAD-PARA", "PERFORMS"),
+            ("para_MAIN-PARA", "prog_SUBPROG", "CALLS"),
+            ("para_LOAD-PARA", "file_IN-FILE", "READS_FROM"),
+            ("para_LOAD-PARA", "file_OUT-REC", "WRITES_TO"),
+        ]
+
 
 class TestJCLParser:
     """Test JCL parser functionality."""
@@ -291,3 +435,63 @@ class TestParserRegistry:
             # Should return correct types
             assert isinstance(parser.supported_extensions, list)
             assert all(isinstance(ext, str) for ext in parser.supported_extensions)
+
+    def test_lazy_registration_loads_on_first_lookup(self):
+        """Test lazily registered parsers are created once, on first use."""
+        registry = ParserRegistry()
+        loads = []
+
+        def load_json_parser():
+            loads.append(1)
+            return JSONParser()
+
+        registry.register_lazy([".json", ".jsonc"], load_json_parser)
+        assert loads == []
+
+        assert isinstance(registry.get_parser_for_file(Path("a.json")), JSONParser)
+        assert isinstance(registry.get_parser_for_file(Path("b.jsonc")), JSONParser)
+        assert isinstance(registry.get_parser(DocumentType.JSON_CONFIG), JSONParser)
+        assert loads == [1]
+
+
+class TestParseCache:
+    """Test the on-disk parse cache."""
+
+    def test_cache_hit_and_invalidation(self, tmp_path, sample_json_file):
+        """Test cached parses are reused until the file changes."""
+        source = tmp_path / "config.json"
+        source.write_bytes(sample_json_file.read_bytes())
+
+        cache = ParseCache(tmp_path / "parse_cache.db")
+        assert cache.get(source) is None
+
+        parsed = JSONParser().parse(source)
+        cache.put(source, parsed)
+
+        cached = ParseCache(tmp_path / "parse_cache.db").get(source)
+        assert cached is not None
+        assert cached.metadata.name == parsed.metadata.name
+        assert len(cached.components) == len(parsed.components)
+
+        source.write_text(source.read_text() + "\n")
+        assert cache.get(source) is None
+
+    def test_uncommitted_puts_are_flushed(self, tmp_path, sample_json_file):
+        """Test puts without commit become visible to other connections on flush."""
+        cache = ParseCache(tmp_path / "parse_cache.db")
+        cache.put(sample_json_file, JSONParser().parse(sample_json_file), commit=False)
+        assert cache.get(sample_json_file) is not None
+
+        cache.flush()
+        assert ParseCache(tmp_path / "parse_cache.db").get(sample_json_file) is not None
+
+    def test_cache_dropped_when_version_changes(self, tmp_path, sample_json_file, monkeypatch):
+        """Test parses cached by another parser version are not returned."""
+        cache = ParseCache(tmp_path / "parse_cache.db")
+        cache.put(sample_json_file, JSONParser().parse(sample_json_file))
+        cache.close()
+
+        monkeypatch.setattr(parse_cache, "PARSE_CACHE_VERSION", parse_cache.PARSE_CACHE_VERSION + 1)
+        reopened = ParseCache(tmp_path / "parse_cache.db")
+        assert reopened.get(sample_json_file) is None
+        assert len(reopened) == 0
@@ -117,6 +117,15 @@ class TestTraceAIAPI:
 
         assert agent.max_concurrent_parsers == 5
 
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_agent(self, temp_persist_dir):
+        """Test leaving `async with` releases the agent's stores."""
+        async with TraceAI(persist_dir=temp_persist_dir) as agent:
+            assert agent.parse_cache is not None
+
+        assert agent.parse_cache is None
+        assert agent.agent is None
+
     @pytest.mark.asyncio
     async def test_graph_statistics_async(self, temp_persist_dir, sample_ssis_dir):
         """Test getting graph statistics from async agent."""
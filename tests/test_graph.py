@@ -9,6 +9,7 @@ from traceai.graph.builder import KnowledgeGraphBuilder, build_graph_from_docume
 from traceai.graph.queries import GraphQueries
 from traceai.graph.schema import EdgeType, NodeType
 from traceai.graph.storage import GraphStorage
+from traceai.parsers.base import DataEntity, DocumentMetadata, DocumentType, ParsedDocument
 from traceai.parsers.ssis_parser import parse_ssis
 
 
@@ -33,6 +34,23 @@ def test_graph_builder_initialization() -> None:
     assert builder.graph.number_of_nodes() == 0
 
 
+def test_build_graph_incrementally() -> None:
+    """Test extending one builder from a generator matches a single batch build."""
+    package_paths = sorted(Path("examples/inputs/ssis").glob("*.dtsx"))
+    if len(package_paths) < 2:
+        pytest.skip("Sample packages not found")
+
+    batch_graph = build_graph_from_documents([parse_ssis(p) for p in package_paths])
+
+    builder = KnowledgeGraphBuilder()
+    for path in package_paths:
+        graph = build_graph_from_documents((parse_ssis(p) for p in [path]), builder=builder)
+
+    assert graph is builder.get_graph()
+    assert set(graph.nodes) == set(batch_graph.nodes)
+    assert set(graph.edges) == set(batch_graph.edges)
+
+
 def test_build_graph_from_package(sample_graph: nx.DiGraph) -> None:
     """Test building graph from parsed package."""
     assert sample_graph.number_of_nodes() > 0
@@ -172,6 +190,9 @@ def test_graph_stats(sample_graph: nx.DiGraph) -> None:
     assert stats["is_directed"] is True
     assert "package_count" in stats
     assert "task_count" in stats
+    assert stats["node_type_counts"]["Package"] == stats["package_count"]
+    assert list(stats["node_type_counts"]) == sorted(stats["node_type_counts"])
+    assert all(count > 0 for count in stats["node_type_counts"].values())
 
 
 def test_graph_storage_pickle(tmp_path: Path, sample_graph: nx.DiGraph) -> None:
@@ -249,3 +270,34 @@ def test_node_importance(sample_graph: nx.DiGraph) -> None:
         assert "out_degree" in importance
         assert "total_degree" in importance
         assert importance["total_degree"] >= 0
+
+
+def test_find_connected_components_ignores_edge_direction() -> None:
+    """Test that components join nodes linked in either direction."""
+    graph = nx.DiGraph()
+    graph.add_edges_from([("a", "b"), ("c", "b"), ("d", "e")])
+    graph.add_node("f")
+
+    components = GraphQueries(graph).find_connected_components()
+
+    assert sorted(map(sorted, components)) == [["a", "b", "c"], ["d", "e"], ["f"]]
+
+
+def test_tables_in_different_databases_are_separate_nodes() -> None:
+    """Test that the same schema.table in two databases becomes two table nodes."""
+    builder = KnowledgeGraphBuilder()
+    builder.add_document(
+        ParsedDocument(
+            metadata=DocumentMetadata(
+                name="CrossDb", document_id="cross-db", document_type=DocumentType.SSIS_PACKAGE
+            ),
+            data_entities=[
+                DataEntity(name="T", entity_type="table", schema_name="dbo", database_name="db1"),
+                DataEntity(name="T", entity_type="table", schema_name="dbo", database_name="db2"),
+            ],
+        )
+    )
+    graph = builder.get_graph()
+    tables = [attrs for _, attrs in graph.nodes(data=True) if attrs["node_type"] == NodeType.TABLE]
+
+    assert sorted((t["database_name"], t["name"]) for t in tables) == [("db1", "T"), ("db2", "T")]
@@ -0,0 +1,35 @@
+"""Tests for the central logging configuration."""
+
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import pytest
+
+from traceai.logger import logger
+
+
+def _log_warning(message: str) -> str | None:
+    """Log from a worker and return the log file its root logger writes to."""
+    logger.warning(message)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, RotatingFileHandler):
+            handler.flush()
+            return handler.baseFilename
+    return None
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="fork start method unavailable"
+)
+def test_forked_pool_worker_logs_are_written():
+    """Test records logged in a forked worker reach the log file."""
+    message = f"warning from a forked parse worker {uuid.uuid4()}"
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as pool:
+        log_file = pool.submit(_log_warning, message).result()
+
+    assert log_file is not None
+    assert message in Path(log_file).read_text(encoding="utf-8")
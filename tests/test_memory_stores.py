@@ -1,12 +1,17 @@
 """Tests for memory storage backends."""
 
+import sqlite3
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
 
 from traceai.memory.conversation_store import SQLiteConversationStore
-from traceai.memory.vector_store import ChromaVectorStore
+from traceai.memory.response_cache import ResponseCache
+from traceai.memory.source_store import SourceStore
+from traceai.memory.vector_store import ChromaVectorStore, PineconeVectorStore, QueryCache
 
 
 class TestSQLiteConversationStore:
@@ -43,6 +48,50 @@ class TestSQLiteConversationStore:
             assert len(messages) == 2
             assert messages[0]["content"] == "Test message 1"
 
+    def test_add_messages_batch(self):
+        """Test batched inserts are stored in order and indexed for search."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteConversationStore(db_path=Path(tmpdir) / "test.db")
+            store.add_message("user", "First question")
+            store.add_messages(
+                [
+                    ("assistant", "Lineage of DimCustomer starts at Customers", {"tool": "trace"}),
+                    ("user", "Thanks", None),
+                ]
+            )
+
+            messages = store.get_all_messages()
+            assert [m["content"] for m in messages] == [
+                "First question",
+                "Lineage of DimCustomer starts at Customers",
+                "Thanks",
+            ]
+            assert messages[1]["metadata"] == {"tool": "trace"}
+
+            results = store.search("DimCustomer")
+            assert [r["id"] for r in results] == [messages[1]["id"]]
+
+    def test_connection_reused_per_thread(self):
+        """Test persistent stores keep one connection per thread."""
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SQLiteConversationStore(db_path=Path(tmpdir) / "test.db")
+            main_conn = store._get_conn()
+            assert store._get_conn() is main_conn
+
+            other = []
+            thread = threading.Thread(target=lambda: other.append(store._get_conn()))
+            thread.start()
+            thread.join()
+            assert other[0] is not main_conn
+
+            store.add_message("user", "Hello")
+            store.close()
+            assert SQLiteConversationStore(db_path=Path(tmpdir) / "test.db").get_stats()[
+                "total_messages"
+            ] == 1
+
     def test_search(self):
         """Test full-text search."""
         store = SQLiteConversationStore(ephemeral=True)
@@ -57,6 +106,41 @@ class TestSQLiteConversationStore:
         assert len(results) >= 1
         assert any("machine learning" in r["content"].lower() for r in results)
 
+    def test_search_stemming_and_prefix(self):
+        """Test that search matches word variants and prefixes."""
+        store = SQLiteConversationStore(ephemeral=True)
+
+        store.add_message("user", "Which packages load customers?")
+        store.add_message("assistant", "The CustomerETL package loads DimCustomer")
+
+        assert len(store.search("customer")) == 1
+        assert len(store.search("load")) == 2
+        assert len(store.search("pack*")) == 2
+
+    def test_fts_migration(self):
+        """Test that an index from an older schema is rebuilt with existing messages."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "test.db"
+
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE messages (id INTEGER PRIMARY KEY AUTOINCREMENT, role TEXT NOT NULL, "
+                "content TEXT NOT NULL, metadata TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE messages_fts USING fts5(content, content='messages', content_rowid='id')"
+            )
+            conn.execute("INSERT INTO messages (role, content) VALUES ('user', 'Trace the customers table')")
+            conn.execute("INSERT INTO messages_fts (rowid, content) VALUES (1, 'Trace the customers table')")
+            conn.commit()
+            conn.close()
+
+            store = SQLiteConversationStore(db_path=db_path, ephemeral=False)
+            results = store.search("customer")
+            assert len(results) == 1
+            assert results[0]["content"] == "Trace the customers table"
+            store.close()
+
     def test_metadata(self):
         """Test message metadata storage."""
         store = SQLiteConversationStore(ephemeral=True)
@@ -166,6 +250,118 @@ class TestChromaVectorStore:
         assert stats["storage_type"] == "ephemeral"
 
 
+class TestResponseCache:
+    """Tests for the agent response cache."""
+
+    def test_exact_hit(self):
+        """Test exact-match lookup within the same scope."""
+        cache = ResponseCache()
+        scope = ResponseCache.make_scope("gpt-4o-mini", "10:12")
+
+        cache.put("List packages", scope, "CustomerETL, SalesETL")
+
+        assert cache.get("List packages", scope) == "CustomerETL, SalesETL"
+        assert cache.get("List packages", ResponseCache.make_scope("gpt-4o-mini", "11:12")) is None
+
+    def test_semantic_hit(self):
+        """Test near-identical questions hit via embedding similarity."""
+        vectors = {"What packages exist?": [1.0, 0.0], "Which packages exist?": [0.99, 0.05]}
+        cache = ResponseCache(embed_fn=lambda text: vectors.get(text, [0.0, 1.0]))
+        scope = ResponseCache.make_scope("model", "1:1")
+
+        cache.put("What packages exist?", scope, "Two packages")
+
+        assert cache.get("Which packages exist?", scope) == "Two packages"
+        assert cache.get("Trace lineage", scope) is None
+
+    def test_lookup_embedding_is_reused_by_put(self):
+        """Test a semantic miss returns the question embedding so put does not embed again."""
+        vectors = {"What packages exist?": [1.0, 0.0], "Trace lineage": [0.0, 1.0]}
+        calls = []
+
+        def embed(text):
+            calls.append(text)
+            return vectors[text]
+
+        cache = ResponseCache(embed_fn=embed)
+        scope = ResponseCache.make_scope("model", "1:1")
+        cache.put("What packages exist?", scope, "Two packages")
+        calls.clear()
+
+        answer, embedding = cache.lookup("Trace lineage", scope)
+        assert answer is None
+        cache.put("Trace lineage", scope, "Lineage", embedding)
+
+        assert calls == ["Trace lineage"]
+        assert cache.get("Trace lineage", scope) == "Lineage"
+
+    def test_ttl_expiry(self):
+        """Test expired answers are not returned."""
+        cache = ResponseCache(ttl_seconds=-1)
+        scope = ResponseCache.make_scope("model", "1:1")
+
+        cache.put("Question", scope, "Answer")
+
+        assert cache.get("Question", scope) is None
+
+    def test_persistence(self):
+        """Test cached answers survive a new cache instance."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "response_cache.db"
+            scope = ResponseCache.make_scope("model", "1:1")
+
+            ResponseCache(path=path).put("Question", scope, "Answer")
+
+            assert ResponseCache(path=path).get("Question", scope) == "Answer"
+
+    def test_persistence_with_embeddings(self):
+        """Test semantic lookups work after reloading from disk."""
+        vectors = {"What packages exist?": [1.0, 0.0], "Which packages exist?": [0.99, 0.05]}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "response_cache.db"
+            scope = ResponseCache.make_scope("model", "1:1")
+
+            cache = ResponseCache(path=path, embed_fn=lambda text: vectors[text])
+            cache.put("What packages exist?", scope, "Two packages")
+            cache.close()
+
+            reloaded = ResponseCache(path=path, embed_fn=lambda text: vectors[text])
+            assert reloaded.get("Which packages exist?", scope) == "Two packages"
+            assert reloaded.get("  What packages   exist? ", scope) == "Two packages"
+
+    def test_reopen_with_different_embedder(self):
+        """Test rows from another embedder's dimension are a miss, not an error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "response_cache.db"
+            scope = ResponseCache.make_scope("model", "1:1")
+
+            cache = ResponseCache(path=path, embed_fn=lambda text: [1.0] * 384)
+            cache.put("What packages exist?", scope, "Two packages")
+            cache.close()
+
+            reloaded = ResponseCache(path=path, embed_fn=lambda text: [1.0] * 768)
+            assert reloaded.get("Which packages exist?", scope) is None
+            assert reloaded.get("What packages exist?", scope) == "Two packages"
+
+
+class TestPineconeVectorValues:
+    """Test the wire format of quantized Pinecone vectors (no Pinecone client needed)."""
+
+    @staticmethod
+    def _values(quantize: str, embedding: np.ndarray) -> list[float]:
+        return PineconeVectorStore._vector_values(SimpleNamespace(quantize=quantize), embedding)
+
+    def test_round4_rounds_to_four_decimals(self):
+        """Test round4 sends floats rounded to four decimals."""
+        embedding = np.array([0.123456, -0.654321, 0.5], dtype=np.float32)
+        assert self._values("round4", embedding) == [0.1235, -0.6543, 0.5]
+
+    def test_int8_sends_integral_levels(self):
+        """Test int8 sends integral quantization levels as floats."""
+        embedding = np.array([1.0, -0.5, 0.0], dtype=np.float32)
+        assert self._values("int8", embedding) == [127.0, -64.0, 0.0]
+
+
 # Note: Pinecone tests are skipped as they require API key and actual cloud instance
 # To test Pinecone, add:
 #
@@ -173,3 +369,66 @@ class TestChromaVectorStore:
 # class TestPineconeVectorStore:
 #     def test_pinecone_operations(self):
 #         ...
+
+
+class TestQueryCache:
+    """Tests for the vector search result cache."""
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = QueryCache(max_entries=2)
+
+        cache.put("a", [1])
+        cache.put("b", [2])
+        assert cache.get("a") == [1]
+        cache.put("c", [3])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1]
+        assert cache.get("c") == [3]
+
+    def test_ttl_and_invalidate(self):
+        """Test expired and invalidated entries are not returned."""
+        assert QueryCache(ttl_seconds=-1).get("a") is None
+
+        cache = QueryCache()
+        cache.put("a", [1])
+        cache.invalidate()
+        assert cache.get("a") is None
+
+    def test_results_are_copied(self):
+        """Test mutating returned results does not change the cache."""
+        cache = QueryCache()
+        key = QueryCache.make_key("query", 5, {"b": 2, "a": 1})
+        cache.put(key, [{"document": "text"}])
+
+        cache.get(key)[0]["document"] = "changed"
+
+        assert cache.get(QueryCache.make_key("query", 5, {"a": 1, "b": 2})) == [{"document": "text"}]
+        assert cache.stats()["hits"] == 2
+
+
+class TestSourceStore:
+    """Tests for full component source storage."""
+
+    def test_put_and_get(self):
+        """Test sources are stored per document and component."""
+        store = SourceStore(ephemeral=True)
+
+        store.put_many([("doc1", "task1", "SELECT 1"), ("doc2", "task1", "SELECT 2")])
+        store.put_many([("doc1", "task1", "SELECT 3")])
+
+        assert store.get("doc1", "task1") == "SELECT 3"
+        assert store.get("doc2", "task1") == "SELECT 2"
+        assert store.get("doc1", "missing") is None
+        assert len(store) == 2
+
+    def test_persistence(self):
+        """Test sources survive reopening the database."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "sources.sqlite"
+            store = SourceStore(db_path=db_path)
+            store.put_many([("doc1", "task1", "SELECT * FROM Customers")])
+            store.close()
+
+            assert SourceStore(db_path=db_path).get("doc1", "task1") == "SELECT * FROM Customers"
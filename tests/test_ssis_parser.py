@@ -45,6 +45,13 @@ def test_ssis_parser_validation(ssis_parser: SSISParser, tmp_path: Path):
     assert ssis_parser.validate(invalid_xml) is False
 
 
+def test_ssis_parser_validation_rejects_xml_without_dts_namespace(ssis_parser: SSISParser, tmp_path: Path):
+    """Test that well-formed XML without the DTS namespace is rejected."""
+    other_xml = tmp_path / "other.dtsx"
+    other_xml.write_text('<?xml version="1.0"?>\n<Package xmlns="urn:example"><Task /></Package>')
+    assert ssis_parser.validate(other_xml) is False
+
+
 def test_parse_ssis_returns_parsed_document(ssis_parser: SSISParser, tmp_path: Path):
     """Test that SSIS parser returns a ParsedDocument."""
     dtsx_file = tmp_path / "test.dtsx"
@@ -104,6 +111,45 @@ def test_parse_ssis_with_components(ssis_parser: SSISParser, tmp_path: Path):
     assert component.source_code == "SELECT * FROM Customers"
 
 
+def test_parse_ssis_with_nested_containers(ssis_parser: SSISParser, tmp_path: Path):
+    """Test that nested tasks are extracted in document order with their SQL."""
+    dtsx_file = tmp_path / "nested.dtsx"
+    dtsx_file.write_text(
+        """<?xml version="1.0"?>
+<Executable xmlns:DTS="www.microsoft.com/SqlServer/Dts"
+  xmlns:SQLTask="www.microsoft.com/sqlserver/dts/tasks/sqltask"
+  DTS:ExecutableType="Package"
+  DTS:ObjectName="NestedPackage"
+  DTS:DTSID="{PKG-1}">
+  <DTS:Executables>
+    <DTS:Executable DTS:ObjectName="Container" DTS:DTSID="{SEQ-1}" DTS:ExecutableType="STOCK:SEQUENCE">
+      <DTS:Executables>
+        <DTS:Executable DTS:ObjectName="Load" DTS:DTSID="{TASK-1}" DTS:ExecutableType="SQLTask">
+          <DTS:ObjectData>
+            <SQLTask:SqlTaskData SQLTask:SqlStatementSource="INSERT INTO Staging SELECT * FROM Source" />
+          </DTS:ObjectData>
+        </DTS:Executable>
+        <DTS:Executable DTS:ObjectName="Clean" DTS:DTSID="{TASK-2}" DTS:ExecutableType="SQLTask">
+          <DTS:ObjectData>
+            <SQLTask:SqlTaskData SQLTask:SqlStatementSource="TRUNCATE TABLE Staging" />
+          </DTS:ObjectData>
+        </DTS:Executable>
+      </DTS:Executables>
+    </DTS:Executable>
+  </DTS:Executables>
+</Executable>"""
+    )
+
+    result = ssis_parser.parse(dtsx_file)
+
+    assert [c.name for c in result.components] == ["Container", "Load", "Clean"]
+    assert [c.source_code for c in result.components] == [
+        "INSERT INTO Staging SELECT * FROM Source",
+        "INSERT INTO Staging SELECT * FROM Source",
+        "TRUNCATE TABLE Staging",
+    ]
+
+
 def test_parse_ssis_with_data_sources(ssis_parser: SSISParser, tmp_path: Path):
     """Test parsing SSIS file with data sources (connections)."""
     dtsx_file = tmp_path / "with_connections.dtsx"
@@ -139,6 +185,33 @@ def test_parse_ssis_with_data_sources(ssis_parser: SSISParser, tmp_path: Path):
     assert source.database == "SourceDB"
 
 
+def test_parse_ssis_connection_string_keys_are_case_insensitive(ssis_parser: SSISParser, tmp_path: Path):
+    """Test that server and database are read regardless of key case and spacing."""
+    dtsx_file = tmp_path / "conn_keys.dtsx"
+    dtsx_file.write_text(
+        """<?xml version="1.0"?>
+<Executable xmlns:DTS="www.microsoft.com/SqlServer/Dts"
+  DTS:ExecutableType="Package"
+  DTS:ObjectName="ConnPackage"
+  DTS:DTSID="{PKG-1}">
+
+  <DTS:ConnectionManagers>
+    <DTS:ConnectionManager DTS:ObjectName="Warehouse" DTS:DTSID="{CONN-1}" DTS:CreationName="OLEDB">
+      <DTS:ObjectData>
+        <DTS:ConnectionManager
+          ConnectionString="Provider=SQLNCLI11.1;SERVER = dw01;database=Warehouse;Integrated Security=SSPI;" />
+      </DTS:ObjectData>
+    </DTS:ConnectionManager>
+  </DTS:ConnectionManagers>
+</Executable>"""
+    )
+
+    source = ssis_parser.parse(dtsx_file).data_sources[0]
+
+    assert source.server == "dw01"
+    assert source.database == "Warehouse"
+
+
 def test_parse_ssis_with_parameters(ssis_parser: SSISParser, tmp_path: Path):
     """Test parsing SSIS file with parameters (variables)."""
     dtsx_file = tmp_path / "with_vars.dtsx"
@@ -237,6 +310,79 @@ def test_extract_data_entities_from_sql(ssis_parser: SSISParser):
             assert entity.schema_name == "dbo"
 
 
+def test_extract_data_entities_from_merge(ssis_parser: SSISParser):
+    """Test that MERGE INTO yields the target table, not the INTO keyword."""
+    from traceai.parsers.base import Component
+
+    component = Component(
+        name="Upsert Task",
+        component_id="task-2",
+        component_type="SQLTask",
+        source_code="MERGE INTO dbo.Customers AS t USING (SELECT * FROM stg.Customers) AS s ON t.ID = s.ID",
+    )
+
+    entities = ssis_parser.extract_data_entities(component)
+
+    assert [(e.schema_name, e.name) for e in entities] == [("dbo", "Customers"), ("stg", "Customers")]
+
+
+def test_extract_data_entities_dedupes_by_schema_and_name(ssis_parser: SSISParser):
+    """Test that repeated tables are reported once, keeping same-named tables in other schemas."""
+    from traceai.parsers.base import Component
+
+    component = Component(
+        name="Sync Task",
+        component_id="task-3",
+        component_type="SQLTask",
+        source_code="""
+            INSERT INTO dim.Customer SELECT * FROM dbo.Customer;
+            UPDATE dim.Customer SET Active = 1 FROM dbo.Customer c JOIN dbo.Customer p ON c.ParentID = p.ID
+        """,
+    )
+
+    entities = ssis_parser.extract_data_entities(component)
+
+    assert [(e.schema_name, e.name) for e in entities] == [("dim", "Customer"), ("dbo", "Customer")]
+
+
+def test_extract_data_entities_three_part_names(ssis_parser: SSISParser):
+    """Test that database.schema.table names keep the table as the entity name."""
+    from traceai.parsers.base import Component
+
+    component = Component(
+        name="Copy Task",
+        component_id="task-4",
+        component_type="SQLTask",
+        source_code="INSERT INTO Warehouse.dbo.FactSales SELECT * FROM stg.Sales",
+    )
+
+    entities = ssis_parser.extract_data_entities(component)
+
+    assert [(e.database_name, e.schema_name, e.name) for e in entities] == [
+        ("Warehouse", "dbo", "FactSales"),
+        (None, "stg", "Sales"),
+    ]
+
+
+def test_extract_data_entities_keeps_tables_in_different_databases(ssis_parser: SSISParser):
+    """Test that the same schema.table in two databases is reported as two tables."""
+    from traceai.parsers.base import Component
+
+    component = Component(
+        name="Cross DB Task",
+        component_id="task-5",
+        component_type="SQLTask",
+        source_code="INSERT INTO db1.dbo.T SELECT * FROM db2.dbo.T JOIN db1.dbo.T x ON 1 = 1",
+    )
+
+    entities = ssis_parser._extract_data_entities_from_components([component, component])
+
+    assert [(e.database_name, e.schema_name, e.name) for e in entities] == [
+        ("db1", "dbo", "T"),
+        ("db2", "dbo", "T"),
+    ]
+
+
 def test_parse_ssis_convenience_function(tmp_path: Path):
     """Test the convenience parse_ssis function."""
     dtsx_file = tmp_path / "convenience.dtsx"
@@ -293,3 +439,20 @@ def test_parse_ssis_error_handling(ssis_parser: SSISParser, tmp_path: Path):
     invalid_file.write_text("not xml")
     with pytest.raises(ValueError, match="Invalid DTSX XML format"):
         ssis_parser.parse(invalid_file)
+
+
+def test_ssis_parser_is_picklable(ssis_parser: SSISParser, tmp_path: Path):
+    """Test the parser survives pickling, as done when parsing in worker processes."""
+    import pickle
+
+    dtsx_file = tmp_path / "pickled.dtsx"
+    dtsx_file.write_text(
+        """<?xml version="1.0"?>
+<Executable xmlns:DTS="www.microsoft.com/SqlServer/Dts" DTS:ObjectName="Pickled" DTS:DTSID="{P}">
+</Executable>"""
+    )
+    ssis_parser.parse(dtsx_file)
+
+    restored = pickle.loads(pickle.dumps(ssis_parser))
+
+    assert restored.parse(dtsx_file).metadata.name == "Pickled"
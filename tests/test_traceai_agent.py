@@ -5,8 +5,10 @@ import os
 from pathlib import Path
 import tempfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
 
 from traceai.agents import TraceAI
 from traceai.graph.queries import GraphQueries
@@ -218,6 +220,24 @@ class TestTraceAIAgentAPI:
             if old_openai:
                 os.environ["OPENAI_API_KEY"] = old_openai
 
+    async def test_query_many_without_llm(self, temp_persist_dir, sample_ssis_dir):
+        old_anthropic = os.environ.pop("ANTHROPIC_API_KEY", None)
+        old_openai = os.environ.pop("OPENAI_API_KEY", None)
+
+        try:
+            agent = TraceAI(persist_dir=temp_persist_dir)
+            await agent.load_documents(sample_ssis_dir)
+
+            questions = ["List documents", "Give me a summary"]
+            responses = await agent.query_many(questions, max_concurrent=2)
+
+            assert responses == [await agent.query(q) for q in questions]
+        finally:
+            if old_anthropic:
+                os.environ["ANTHROPIC_API_KEY"] = old_anthropic
+            if old_openai:
+                os.environ["OPENAI_API_KEY"] = old_openai
+
     async def test_multiple_loads_accumulate_documents(self, temp_persist_dir, sample_ssis_dir, sample_json_dir):
         agent = TraceAI(persist_dir=temp_persist_dir)
 
@@ -249,6 +269,96 @@ class TestTraceAIAgentAPI:
         results = agent.vector_store.similarity_search("Customer", k=1)
         assert results
 
+    async def test_semantic_search_cached_until_next_load(
+        self, temp_persist_dir, sample_ssis_dir, sample_json_dir, monkeypatch
+    ):
+        agent = TraceAI(
+            persist_dir=temp_persist_dir,
+            model_provider=None,
+            llm=None,
+            embeddings=DeterministicFakeEmbedding(size=16),
+        )
+        await agent.load_documents(sample_ssis_dir)
+
+        searches = []
+        similarity_search = agent.vector_store.similarity_search
+        monkeypatch.setattr(
+            agent.vector_store,
+            "similarity_search",
+            lambda *args, **kwargs: searches.append(args) or similarity_search(*args, **kwargs),
+        )
+
+        first = agent._semantic_search("customer  data", max_results=2)
+        assert agent._semantic_search(" customer data ", max_results=2) == first
+        assert len(searches) == 1
+
+        await agent.load_documents(sample_json_dir, pattern="*.json")
+        agent._semantic_search("customer data", max_results=2)
+        assert len(searches) == 2
+
+    async def test_concurrent_loads_share_store_without_duplicates(
+        self, temp_persist_dir, sample_ssis_dir
+    ):
+        def make_agent(persist_dir):
+            return TraceAI(
+                persist_dir=persist_dir,
+                model_provider=None,
+                llm=None,
+                embeddings=DeterministicFakeEmbedding(size=16),
+                enable_parse_cache=False,
+            )
+
+        single = make_agent(temp_persist_dir / "single")
+        await single.load_documents(sample_ssis_dir)
+        expected = single.vector_store._collection.count()
+
+        agents = [make_agent(temp_persist_dir / "shared") for _ in range(3)]
+        await asyncio.gather(*(agent.load_documents(sample_ssis_dir) for agent in agents))
+
+        assert agents[0].get_indexed_count() == expected
+
+    async def test_response_cache_scope_tracks_content(self, temp_persist_dir, sample_ssis_dir):
+        package = sample_ssis_dir / "CustomerETL.dtsx"
+        edited_dir = temp_persist_dir / "edited"
+        edited_dir.mkdir()
+        # Same structure, different SQL text
+        (edited_dir / package.name).write_text(
+            package.read_text(encoding="utf-8").replace("SELECT", "select"), encoding="utf-8"
+        )
+
+        scopes = []
+        for directory in (sample_ssis_dir, edited_dir):
+            agent = TraceAI(
+                persist_dir=temp_persist_dir / directory.name,
+                model_provider=None,
+                llm=None,
+                embeddings=DeterministicFakeEmbedding(size=16),
+            )
+            await agent.load_documents(directory, pattern=package.name)
+            scopes.append((agent.get_graph_stats()["total_nodes"], agent._response_cache_scope()))
+
+        assert scopes[0][0] == scopes[1][0]
+        assert scopes[0][1] != scopes[1][1]
+
+    async def test_parser_executor_reused_across_loads(
+        self, temp_persist_dir, sample_ssis_dir, sample_json_dir
+    ):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            agent = TraceAI(
+                persist_dir=temp_persist_dir,
+                model_provider=None,
+                llm=None,
+                embeddings=DeterministicFakeEmbedding(size=16),
+                enable_parse_cache=False,
+                parser_executor=executor,
+            )
+            await agent.load_documents(sample_ssis_dir)
+            ssis_count = len(agent.parsed_documents)
+            await agent.load_documents(sample_json_dir, pattern="*.json")
+
+        assert ssis_count >= 1
+        assert len(agent.parsed_documents) > ssis_count
+
     async def test_load_documents_handles_missing_directory(self, temp_persist_dir):
         agent = TraceAI(persist_dir=temp_persist_dir)
         missing_dir = temp_persist_dir / "missing"